@@ -0,0 +1,153 @@
+"""
+Publishes the annotations for Pupil Core in a background thread, so the GUI never waits for Pupil Capture.
+"""
+import queue
+import threading
+from time import sleep
+
+import msgpack as serializer
+import zmq
+
+QUEUE_SIZE = 256  # annotations waiting to be sent, further ones are dropped
+TIMEOUT = 1000  # ms to wait for Pupil Remote's answer
+BACKOFF = (0.1, 5)  # first and maximum delay in seconds between two connection attempts
+SETTLE = 0.5  # seconds for the subscription of Pupil's backbone to arrive, earlier messages would be lost
+
+
+class AnnotationSender:
+    """
+    Annotations are queued by the GUI thread and published on the PUB socket of Pupil's IPC backbone
+    by a sender thread, which owns its own sockets.\n
+    If Pupil Capture can't be reached, the thread retries with exponential back-off, keeping the queued annotations.
+    """
+
+    def __init__(self, ctx, ip, port, queue_size=QUEUE_SIZE):
+        """
+        Parameters
+        ----------
+        ctx : zmq.Context
+            ZMQ context to create the sockets in
+        ip : str
+            IP address of Pupil Capture
+        port : int or str
+            port of Pupil Remote
+        queue_size : int, default=QUEUE_SIZE
+            maximum number of annotations waiting to be sent
+        """
+        self.ctx = ctx
+        self.address = f'tcp://{ip}:{port}'
+        self.ip = ip
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.sent = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """Start the sender thread."""
+        self.thread.start()
+
+    def send(self, trigger):
+        """Queue an annotation, never blocks.
+
+        Parameters
+        ----------
+        trigger : dict
+            the annotation, should include topic, label, timestamp, and duration
+
+        Returns
+        -------
+        bool
+            False if the queue is full and the annotation was dropped
+        """
+        try:
+            self.queue.put_nowait(trigger)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            print("Too many annotations waiting for Pupil Capture, annotation dropped!")
+            return False
+
+    def connect(self):
+        """Ask Pupil Remote for the port of the backbone and connect a PUB socket to it.
+
+        Returns
+        -------
+        zmq.Socket or None
+            the PUB socket, None if Pupil Capture didn't answer
+        """
+        remote = self.ctx.socket(zmq.REQ)
+        remote.setsockopt(zmq.LINGER, 0)
+        try:
+            remote.connect(self.address)
+            remote.send_string("PUB_PORT")
+            if (remote.poll(TIMEOUT) & zmq.POLLIN) == 0:
+                return None
+            pub_port = remote.recv_string()
+            pub_socket = self.ctx.socket(zmq.PUB)
+            pub_socket.setsockopt(zmq.LINGER, 0)
+            pub_socket.connect(f'tcp://{self.ip}:{pub_port}')
+            sleep(SETTLE)
+            return pub_socket
+        except zmq.ZMQError:
+            return None
+        finally:
+            remote.close()
+
+    def run(self):
+        """Publish the queued annotations until closed."""
+        pub_socket = None
+        delay = BACKOFF[0]
+        while True:
+            if pub_socket is None:
+                if self.stop_event.is_set():
+                    break
+                pub_socket = self.connect()
+                if pub_socket is None:
+                    print("Couldn't connect with Pupil Capture!")
+                    self.stop_event.wait(delay)
+                    delay = min(delay * 2, BACKOFF[1])
+                    continue
+                delay = BACKOFF[0]
+            trigger = self.queue.get()
+            if trigger is None:
+                self.queue.task_done()
+                break
+            try:
+                pub_socket.send_string(trigger["topic"], flags=zmq.SNDMORE)
+                pub_socket.send(serializer.dumps(trigger, use_bin_type=True))
+                self.sent += 1
+                print("Trigger", trigger, "published")
+            except zmq.ZMQError:
+                print("Couldn't connect with Pupil Capture!")
+                pub_socket.close()
+                pub_socket = None
+            self.queue.task_done()
+        if pub_socket is not None:
+            pub_socket.close()
+
+    def flush(self, timeout):
+        """Wait until the queued annotations are sent, e.g. before the recording is stopped.
+
+        Parameters
+        ----------
+        timeout : float
+            time in seconds to wait at most
+
+        Returns
+        -------
+        bool
+            True if all annotations were sent
+        """
+        with self.queue.all_tasks_done:
+            return self.queue.all_tasks_done.wait_for(lambda: self.queue.unfinished_tasks == 0, timeout)
+
+    def close(self):
+        """Send the remaining annotations and stop the sender thread, unless Pupil Capture isn't connected."""
+        self.stop_event.set()
+        if self.thread.is_alive():
+            try:
+                self.queue.put(None, timeout=TIMEOUT / 1000)
+            except queue.Full:
+                pass
+            self.thread.join(TIMEOUT / 1000 + SETTLE)
@@ -0,0 +1,111 @@
+"""
+OSC client which can combine several messages into one bundle.
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+
+from pythonosc import udp_client
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+
+
+class BundleClient(udp_client.SimpleUDPClient):
+    """
+    Messages sent inside a ``with client.bundle():`` block are collected and sent as one timetagged OSC bundle
+    when the outermost block is left, so the receiver (e.g. REAPER) applies them at once.
+    """
+
+    def __init__(self, address, port, bundles=True, allow_broadcast=False):
+        """
+        Parameters
+        ----------
+        address : str
+            IP address of the receiver
+        port : int
+            port of the receiver
+        bundles : bool, default=True
+            if False, bundle() has no effect and every message is sent on its own
+        allow_broadcast : bool, default=False
+            allow sending to a broadcast address
+        """
+        super().__init__(address, port, allow_broadcast)
+        self.bundles = bundles
+        self.pending = None
+        self.depth = 0
+        self.bundle_thread = None
+        self.on_sent = None  # called without arguments after a datagram was sent, e.g. to measure latency
+
+    @contextmanager
+    def bundle(self):
+        """Collect all messages sent by the current thread in this context and send them as one bundle."""
+        if not self.bundles:
+            yield
+            return
+        if self.depth == 0:
+            self.pending = []
+            self.bundle_thread = threading.get_ident()
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                contents, self.pending, self.bundle_thread = self.pending, None, None
+                self.send_bundle(contents)
+
+    def send(self, content):
+        """Send a message or bundle, or keep it for the current bundle.
+
+        Parameters
+        ----------
+        content : OscMessage or OscBundle
+            the content to send
+        """
+        if self.pending is not None and self.bundle_thread == threading.get_ident():
+            self.pending.append(content)
+        else:
+            self.transmit(content)
+
+    def send_bundle(self, contents):
+        """Send the contents as one datagram, to be executed immediately.
+
+        Parameters
+        ----------
+        contents : list of OscMessage or OscBundle
+            the contents of the bundle
+        """
+        if len(contents) == 1:
+            self.transmit(contents[0])
+        elif len(contents) > 1:
+            builder = OscBundleBuilder(IMMEDIATELY)
+            for content in contents:
+                builder.add_content(content)
+            self.transmit(builder.build())
+
+    def transmit(self, content):
+        """Write a message or bundle to the socket.
+
+        Parameters
+        ----------
+        content : OscMessage or OscBundle
+            the content to send
+        """
+        super().send(content)
+        if self.on_sent is not None:
+            self.on_sent()
+
+
+def bundle(client):
+    """Context to send all messages of a client as one bundle, if it supports this.
+
+    Parameters
+    ----------
+    client : SimpleUDPClient or None
+        the client the messages are sent with
+
+    Returns
+    -------
+    contextmanager
+    """
+    if isinstance(client, BundleClient):
+        return client.bundle()
+    return nullcontext()
@@ -0,0 +1,179 @@
+"""
+Monitors the connection to the external devices (REAPER, video player, Pupil Capture) in a background thread.
+"""
+import threading
+from time import monotonic
+
+import zmq
+from PySide6.QtCore import QObject, Signal
+from ping3 import ping
+
+INTERVAL = 2  # seconds between two heartbeats of an endpoint
+
+
+def icmp_probe(host, timeout):
+    """Create a probe pinging a host, for devices which don't answer on application level.
+
+    Parameters
+    ----------
+    host : str
+        IP address of the host
+    timeout : float
+        time in seconds to wait for an answer
+
+    Returns
+    -------
+    function
+        the probe, returns True if the host answered, False if not and None if it can't be pinged
+    """
+    def probe():
+        try:
+            return ping(host, timeout=timeout) not in [None, False]
+        except (OSError, RuntimeError):  # e.g. no permission to open a raw socket
+            return None
+    return probe
+
+
+def zmq_probe(context, address, timeout):
+    """Create a probe asking Pupil Capture for its version on a separate socket.
+
+    Parameters
+    ----------
+    context : zmq.Context
+        ZMQ context to create the socket in
+    address : str
+        address of Pupil Remote, e.g. 'tcp://127.0.0.1:50020'
+    timeout : float
+        time in seconds to wait for an answer
+
+    Returns
+    -------
+    function
+        the probe, returns True if Pupil Capture answered
+    """
+    def probe():
+        sock = context.socket(zmq.REQ)
+        sock.setsockopt(zmq.LINGER, 0)
+        try:
+            sock.connect(address)
+            sock.send_string("v")
+            if (sock.poll(int(timeout * 1000)) & zmq.POLLIN) != 0:
+                sock.recv_string()
+                return True
+            return False
+        except zmq.ZMQError:
+            return False
+        finally:
+            sock.close()
+    return probe
+
+
+class ConnectionMonitor(QObject):
+    """
+    Heartbeats the registered endpoints periodically and caches their state.\n
+    An endpoint from which a message was received recently (see seen()) counts as connected without being probed.
+    If a probe can't tell (None), e.g. without permission to ping, the cached state is kept.
+    """
+    connection_changed = Signal(str, bool)
+
+    def __init__(self, interval=INTERVAL):
+        """
+        Parameters
+        ----------
+        interval : float, default=INTERVAL
+            time in seconds between two heartbeats
+        """
+        super().__init__()
+        self.interval = interval
+        self.probes = {}
+        self.states = {}
+        self.last_seen = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def add_endpoint(self, name, probe):
+        """Register an endpoint to monitor.
+
+        Parameters
+        ----------
+        name : str
+            name of the endpoint, e.g. 'audio'
+        probe : function
+            called without arguments, returns True if the endpoint is reachable, None if this can't be determined
+        """
+        with self.lock:
+            self.probes[name] = probe
+            self.states[name] = None  # unknown until the first heartbeat
+            self.last_seen[name] = None
+
+    def start(self):
+        """Start the heartbeats."""
+        if len(self.probes) > 0:
+            self.thread.start()
+
+    def stop(self):
+        """Stop the heartbeats."""
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def run(self):
+        """Probe all endpoints until stopped."""
+        while not self.stop_event.is_set():
+            self.heartbeat()
+            self.stop_event.wait(self.interval)
+
+    def heartbeat(self):
+        """Probe every endpoint which wasn't seen during the last interval."""
+        for name, probe in list(self.probes.items()):
+            last = self.last_seen[name]
+            if last is not None and monotonic() - last < self.interval:
+                self.update(name, True)
+            else:
+                up = probe()
+                if up is not None:
+                    self.update(name, up)
+
+    def seen(self, name):
+        """Note that a message of an endpoint was received, so it is connected.
+
+        Parameters
+        ----------
+        name : str
+            name of the endpoint
+        """
+        if name in self.probes:
+            self.update(name, True)
+
+    def update(self, name, up):
+        """Store the state of an endpoint and signal if it changed.
+
+        Parameters
+        ----------
+        name : str
+            name of the endpoint
+        up : bool
+            True if the endpoint is reachable
+        """
+        with self.lock:
+            if up:
+                self.last_seen[name] = monotonic()
+            changed = self.states[name] != up
+            self.states[name] = up
+        if changed:
+            self.connection_changed.emit(name, up)
+
+    def is_up(self, name):
+        """
+        Parameters
+        ----------
+        name : str
+            name of the endpoint
+
+        Returns
+        -------
+        bool or None
+            cached state of the endpoint, None if it wasn't probed yet
+        """
+        return self.states.get(name)
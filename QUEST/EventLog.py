@@ -0,0 +1,194 @@
+"""
+Append-only log of the events of a session, streamed to disk in a background thread.
+"""
+import datetime
+import json
+import os
+import queue
+import re
+import threading
+
+# text of the events in the rendered log
+TEMPLATES = {
+    "started": "Started GUI",
+    "resumed": "Resumed session from {value}",
+    "page": "Changed to Page {value}",
+    "finished": "Finished Questionnaire",
+    "osc": "Received {value} from global OSC",
+    "connection_lost": "Lost connection to {value}",
+    "connection_restored": "Restored connection to {value}",
+    "diverged": "Reaper did not confirm {value}",
+    "changed": "Changed {element} to {value}",
+    "toggled": "Toggled {element} to {value}",
+    "pressed": "Pressed Button {element}",
+    "pressed_osc": "Pressed OSC-Button {element}",
+    "player_started": "(Re-)Started Player {element}",
+    "player_paused": "Paused Player {element}",
+    "player_unpaused": "Unpaused Player {element}",
+    "player_stopped": "Stopped Player {element}",
+    "mushra_started": "(Re-)Started MUSHRA-player for cue {value} {element}",
+    "mushra_paused": "Paused MUSHRA-player {element}",
+    "mushra_unpaused": "Unpaused MUSHRA-player {element}",
+    "mushra_stopped": "Stopped MUSHRA playback {element}",
+    "loop_on": "Loop on {element}",
+    "loop_off": "Loop off {element}",
+}
+
+
+def render_event(record):
+    """Format an event like a line of the text log.
+
+    Parameters
+    ----------
+    record : dict
+        the event with the keys time, page, element, kind and value
+
+    Returns
+    -------
+    str
+        the line, events of an element are indented by a tab
+    """
+    text = TEMPLATES.get(record["kind"], "{kind} {element} {value}").format(**record)
+    indent = "\t" if record["element"] is not None else ""
+    return f'{indent}{str(datetime.datetime.fromisoformat(record["time"]).replace(microsecond=0))} - {text}'
+
+
+class EventLog:
+    """
+    Events are queued and appended as JSON lines to the event file by a writer thread,
+    so neither the GUI thread nor the memory is burdened by a growing log.\n
+    If there is no event file (e.g. in the preview), the events are kept in memory.
+    """
+
+    def __init__(self):
+        self.filepath = None
+        self.records = []
+        self.count = 0
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def open(self, filepath):
+        """Start streaming the events to a file, events logged so far are written first.
+
+        Parameters
+        ----------
+        filepath : str
+            file/path of the event file
+        """
+        with self.lock:
+            self.filepath = filepath
+            for record in self.records:
+                self.queue.put(record)
+            self.records = []
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def log(self, kind, element=None, value=None, page=None, time=None):
+        """Append an event.
+
+        Parameters
+        ----------
+        kind : str
+            type of the event, see TEMPLATES
+        element : str, optional
+            id of the element which raised the event, None for events of the questionnaire itself
+        value : optional
+            value of the event, e.g. the new answer
+        page : str, optional
+            name of the page the event happened on
+        time : datetime.datetime, optional
+            time of the event, default is now
+        """
+        record = {"time": (time if time is not None else datetime.datetime.now()).isoformat(),
+                  "page": page, "element": element, "kind": kind, "value": value}
+        with self.lock:
+            self.count += 1
+            if self.thread is None:
+                self.records.append(record)
+            else:
+                self.queue.put(record)
+
+    def __len__(self):
+        return self.count
+
+    def run(self):
+        """Write the queued events until the log is closed."""
+        try:
+            os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+            event_file = open(self.filepath, 'w', encoding='utf_8')
+        except OSError:
+            print("Could not write the event log!")
+            event_file = None
+        while True:
+            records = [self.queue.get()]
+            while not self.queue.empty():  # write everything that piled up at once
+                records.append(self.queue.get_nowait())
+            closed = None in records
+            if event_file is not None:
+                event_file.writelines(json.dumps(record, default=str) + "\n" for record in records if record is not None)
+                event_file.flush()
+            else:
+                self.records.extend(record for record in records if record is not None)
+            for _ in records:
+                self.queue.task_done()
+            if closed:
+                break
+        if event_file is not None:
+            event_file.close()
+
+    def flush(self):
+        """Block until all queued events are written."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """Write the remaining events and stop the writer thread."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def events(self, count=None):
+        """Iterate over the logged events.
+
+        Parameters
+        ----------
+        count : int, optional
+            only the first count events, e.g. to get a snapshot while events are still logged
+
+        Yields
+        ------
+        dict
+            the event with the keys time, page, element, kind and value
+        """
+        count = self.count if count is None else count
+        self.flush()
+        if self.thread is None or not os.path.isfile(self.filepath):
+            yield from self.records[:count]
+            return
+        with open(self.filepath, 'r', encoding='utf_8') as event_file:
+            for index, line in enumerate(event_file):
+                if index >= count:
+                    break
+                yield json.loads(line)
+
+    def render(self, count=None, pattern=None):
+        """Render the events in the format of the text log.
+
+        Parameters
+        ----------
+        count : int, optional
+            only the first count events
+        pattern : re.Pattern, optional
+            characters matching the pattern (e.g. emojis) are removed
+
+        Yields
+        ------
+        str
+            the log, one line after another
+        """
+        for index, record in enumerate(self.events(count)):
+            line = render_event(record)
+            if pattern is not None:
+                line = re.sub(pattern, '', line)
+            yield line if index == 0 else f'\n{line}'
@@ -3,43 +3,80 @@ GUI application, main entry point.
 """
 import argparse
 # -*- coding: utf-8 -*-
+import copy
 import csv
 import datetime
 import os
 import re
-import socket
 import sys
-import threading
-import time
+from time import time
 
 import zmq
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, QEvent, QTimer, Signal
 from PySide6.QtGui import QDoubleValidator, QGuiApplication
 from PySide6.QtWidgets import QWidget, QPushButton, QLabel, QHBoxLayout, QVBoxLayout, QStackedWidget, QApplication, \
     QMessageBox, QScrollArea, QButtonGroup, QCheckBox, QLineEdit, QPlainTextEdit, QSlider, QSizePolicy
 from configobj import ConfigObj
-from ping3 import ping
-from pythonosc import udp_client, osc_server
+from pythonosc import udp_client
 from pythonosc.dispatcher import Dispatcher
 
+from AnnotationSender import AnnotationSender
 from AnswerCheckBox import CheckBox
+from BundleClient import BundleClient
+from ConnectionMonitor import ConnectionMonitor, icmp_probe, zmq_probe
 from LabeledSlider import LabeledSlider
 from MUSHRA import MUSHRA
 from MessageBox import ResizeMessageBox
-from Page import Page
+from Page import Page, PagePlaceholder
 from PasswordEntry import PasswordEntry
 from Player import Player
+from ProbeCache import ProbeCache
+from ResultsDatabase import DatabaseWriter, database_path, participant_number as database_participant_number, \
+    reserve_participant as database_reserve_participant
+from ResultsWriter import ResultsWriter, participant_number, reserve_participant
+from PupilClock import PupilClock
 from PupilCoreButton import Button
 from RadioMatrix import RadioMatrix
 from Slider import Slider
 from Validator import listify, validate_questionnaire
 from Video import madmapper, vlc
 from ABX import ABX
+from cache import load_compiled, save_compiled
+from highlight import compatible_stylesheet
+from EventLog import EventLog
+from Journal import Journal, latest_journal, load_journal
+from LatencyTracker import LatencyTracker
 from OSCButton import OSCButton
-from randomization import balanced_latin_squares, order_from_file
+from OSCReceiver import OSCReceiver
+from ReaperState import ReaperState, ACK_TIMEOUT
+from randomization import participant_orders
+from schema import page_defaults, results_schema, migrate as migrate_results
 
 TIMEOUT = 1  # TODO timeout in seconds, change this to your liking (has to be int)
+SAVE_TIMEOUT = 5  # seconds until saving the results is reported as taking too long
+ANNOTATION_TIMEOUT = 2  # seconds to wait for queued annotations before the recording is stopped
 VERSION = "1.1.1"
+# feedback of Reaper handled by play_state(), everything else (e.g. /time, /beat, VU meters) is dropped unparsed
+REAPER_FEEDBACK = ["/play", "/pause", "/stop", "/track/*/number/str", "/track/*/mute", "/track/*/solo", "/track/*/select"]
+# emojis are removed from the answers and the log
+EMOJI_PATTERN = re.compile("["
+                           u"\U0001F600-\U0001F64F"  # emoticons
+                           u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+                           u"\U0001F680-\U0001F6FF"  # transport & map symbols
+                           u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+                           u"\U00002500-\U000027B0"
+                           u"\U000024C2-\U0001F251"
+                           u"\U0001f926-\U0001f937"
+                           u"\U00010000-\U0010ffff"
+                           u"\u2640-\u2642"
+                           u"\u2600-\u2B55"
+                           u"\u200d"
+                           u"\u23cf"
+                           u"\u23e9"
+                           u"\u231a"
+                           u"\ufe0f"
+                           u"\u3030"
+                           "]+", flags=re.UNICODE)
 
 
 class StackedWindowGui(QWidget):
@@ -47,7 +84,7 @@ class StackedWindowGui(QWidget):
     Main frame of GUI, consisting of multiple pages.
     """
 
-    def __init__(self, file, popup=True, preview=False):
+    def __init__(self, file, popup=True, preview=False, resume=None, show_latency=False, migrate=False):
         """
         Parameters
         ----------
@@ -57,6 +94,12 @@ class StackedWindowGui(QWidget):
             if True, opens a new window for the questionnaire
         preview : bool, default=False
             if True, some features like timer and randomization are invalidated
+        resume : str or bool, optional
+            journal of a crashed session to continue, if True the last unsaved session next to the results file
+        show_latency : bool, default=False
+            if True, the latency of every started playback is printed to the console
+        migrate : bool, default=False
+            if True, the columns of changed questions are added to an existing results file
 
         Raises
         ------
@@ -76,43 +119,78 @@ class StackedWindowGui(QWidget):
         self.save_message = "Sind Sie bereit den Fragebogen zu beenden und somit Ihre Angaben zu speichern?"
         self.pagecount_text = "Seite {} von {}"
         self.filepath_results = './results/results.csv'
-        self.filepath_log = f'./results/log_{self.get_participant_number()}_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.txt'
-        self.log = ''
+        self.results_backend = "CSV"
+        self.participant_number = None  # (results file, number) once resolved
+        self.filepath_log = None  # named after the participant once the results file is known
+        self.events = EventLog()
+        self.latency = LatencyTracker(echo=show_latency)
+        self.filepath_latency = None
         self.delimiter = ';'
         self.audio_ip = None
         self.audio_port = None
         self.audio_recv_port = None
+        self.osc_bundles = False
         self.audio_tracks = 0
         self.video_ip = None
         self.video_port = None
         self.video_player = None
         self.pupil_ip = None
         self.pupil_port = None
+        self.annotations = None
+        self.pupil_clock = None
+        self.filepath_clock = None
         self.help_ip = None
         self.help_port = None
         self.help_text = None  # "Hilfe"
+        self.answer_index = {}  # question id -> (page, answer accessor) of all built pages
+        self.answer_keys = {}  # id() of an answer accessor -> question id
+        self.question_pages = {}  # question id -> name of its page, also for pages which aren't built yet
+        self.page_positions = {}  # name of a page -> its position in the order the pages are shown
+        self.required_block = False  # forward button disabled until the required questions are answered
         self.rand = None
+        self.rand_file = None
+        self.page_order = []  # order of each random group for this participant, also saved as 'Order'
         stylesheet = './stylesheets/minimal.qss'
         self.button_fade = 100
         self.saved = False
+        self.results_writer = None
+        self.schema = None  # columns of the results file, see schema.results_schema
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.timeout.connect(self.save_timed_out)
         self.tooltip_not_all_answered = 'Bitte beantworten Sie alle Fragen.'
         self.connection_lost_title = "Internet Verbindung verloren"
         self.connection_lost_text = "Bitte melden Sie sich beim betreuenden Mitarbeiter."
         self.global_play_state = None
+        self.reaper = ReaperState()
+        self.reaper.diverged.connect(lambda address: self.events.log("diverged", value=address))
         self.global_osc_message = None
         self.global_osc_ip = None
         self.global_osc_send_port = None
         self.global_osc_recv_port = None
         self.stop_initiated = False
-        self.reaper_server = None
-        self.osc_server = None
+        self.connection_monitor = None
+        self.connections_lost = {}  # endpoint -> participant was warned
+        self.audio_receiver = None
+        self.global_osc_receiver = None
+        self.lazy_loading = False
+        self.probe_cache = ProbeCache(TIMEOUT)
+        self.journal = None
+        self.page_answers = {}  # page index -> answers when the page was left last
 
         if not os.path.isfile(file):
             raise FileNotFoundError(f"File {file} does not exist.")
         print(f"Loading {file}")
 
-        structure = ConfigObj(file)  # reads the config file into a nested dict, this is all the magic
-        error_found, warning_found, warning_det = validate_questionnaire(listify(structure), True)
+        compiled = load_compiled(file, VERSION)
+        if compiled is not None:  # unchanged since the last start, skip parsing and validation
+            structure, warning_found, warning_det = compiled
+            error_found = False
+        else:
+            structure = ConfigObj(file)  # reads the config file into a nested dict, this is all the magic
+            error_found, warning_found, warning_det = validate_questionnaire(listify(structure), True)
+            if not error_found:
+                save_compiled(file, structure, warning_found, warning_det, VERSION)
         if not error_found:
             ans_continue = QMessageBox.StandardButton.Yes
             if warning_found and popup:
@@ -161,6 +239,8 @@ class StackedWindowGui(QWidget):
                         self.filepath_results = structure[key]
                     elif key == "delimiter":
                         self.delimiter = structure[key]
+                    elif key == "results_backend":
+                        self.results_backend = structure[key]
                     #  audio, video, biofeedback
                     elif key == "audio_ip" and structure[key] != "":
                         self.audio_ip = structure[key]
@@ -195,6 +275,10 @@ class StackedWindowGui(QWidget):
                         self.global_osc_send_port = structure.as_int(key)
                     elif key == "global_osc_recv_port" and structure[key] != "":
                         self.global_osc_recv_port = structure.as_int(key)
+                    elif key == "lazy_loading":
+                        self.lazy_loading = structure.as_bool(key) and self.popup and not self.preview
+                    elif key == "osc_bundles":
+                        self.osc_bundles = structure.as_bool(key)
 
                 #  Set up client/server connections
                 if self.popup and not self.preview and self.video_ip is not None and self.video_port is not None and self.video_player is not None:
@@ -208,17 +292,25 @@ class StackedWindowGui(QWidget):
                 else:
                     self.video_client = None
                     self.video_player_commands = None
+                #  Start the independent handshakes in parallel, they are joined before the first page is built
+                help_reachable = None
+                pupil_handshake = None
+                if self.popup and not self.preview:
+                    if self.help_ip is not None and self.help_port is not None:
+                        help_reachable = self.probe_cache.ping(self.help_ip)
+                    if self.pupil_ip is not None and self.pupil_port is not None:
+                        self.ctx = zmq.Context()
+                        pupil_handshake = self.probe_cache.submit(("pupil", self.pupil_ip, self.pupil_port), self.pupil_handshake)
+                    if self.audio_recv_port is not None or (self.global_osc_ip is not None and self.global_osc_recv_port is not None):
+                        self.probe_cache.local_ip()
+                for page in structure.sections:
+                    for quest in structure[page].sections:
+                        if "id" in structure[page][quest].keys():
+                            self.question_pages[structure[page][quest]["id"]] = page
+                        if structure[page][quest]["type"] == "OSCButton":
+                            self.probe_cache.ping(structure[page][quest]["receiver"][0])
                 if self.popup and not self.preview and self.help_ip is not None and self.help_port is not None:
                     self.help_client = udp_client.SimpleUDPClient(self.help_ip, self.help_port)
-                    response = ping(self.help_ip, timeout=TIMEOUT)
-                    if response is None:
-                        msg = QMessageBox()
-                        msg.setWindowTitle(self.connection_lost_title)
-                        msg.setSizeGripEnabled(True)
-                        msg.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-                        msg.setIcon(QMessageBox.Icon.Information)
-                        msg.setText(f"No connection to {self.help_ip}.")
-                        msg.exec()
                 else:
                     self.help_client = None
                 if self.popup and not self.preview and self.global_osc_ip is not None and self.global_osc_send_port is not None:
@@ -226,137 +318,158 @@ class StackedWindowGui(QWidget):
                 else:
                     self.global_osc_client = None
                 if self.popup and not self.preview and self.global_osc_ip is not None and self.global_osc_recv_port is not None:
-                    self.global_osc_server_thread = threading.Thread(target=self.osc_listener_default, args=[self.global_osc_recv_port])
-                    self.global_osc_server_thread.daemon = True
-                    self.global_osc_server_thread.start()
+                    self.global_osc_receiver = self.osc_listener_default(self.global_osc_recv_port)
+                self.schema = results_schema(structure, osc=self.global_osc_receiver is not None,
+                                             order=self.rand in ["balanced latin square", "from file"])
+                if migrate and self.popup and not self.preview and self.results_backend == "CSV":
+                    migrate_results(self.filepath_results, self.schema, self.delimiter)
+                if self.popup and not self.preview and self.audio_ip is not None and self.audio_port is not None:
+                    self.audio_client = BundleClient(self.audio_ip, self.audio_port, bundles=self.osc_bundles)
+                    self.audio_client.on_sent = self.latency.sent
+                    with self.audio_client.bundle():
+                        self.audio_client.send_message("/action", MUSHRA.unsolo_all)
+                        self.audio_client.send_message("/action", MUSHRA.loop_off_command)
+                        self.audio_client.send_message("/action", 40341)  # mute all
+                        self.audio_client.send_message("/action", 40297)  # unselect all
                 else:
-                    self.global_osc_server_thread = None
+                    self.audio_client = None
+                if help_reachable is not None and not help_reachable.result():
+                    msg = QMessageBox()
+                    msg.setWindowTitle(self.connection_lost_title)
+                    msg.setSizeGripEnabled(True)
+                    msg.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+                    msg.setIcon(QMessageBox.Icon.Information)
+                    msg.setText(f"No connection to {self.help_ip}.")
+                    msg.exec()
                 no_zmq_connection = False
-                if popup and not self.preview and self.pupil_ip is not None and self.pupil_port is not None:
-                    self.ctx = zmq.Context()
-                    self.pupil_remote = zmq.Socket(self.ctx, zmq.REQ)
-                    self.pupil_remote.setsockopt(zmq.RCVTIMEO, 2000)
-                    self.pupil_remote.connect('tcp://' + self.pupil_ip + ':' + self.pupil_port)
-                    print("Connect to pupil " + 'tcp://' + self.pupil_ip + ':' + self.pupil_port)
-                    self.pupil_remote.send_string("v")
-                    retries_left = 3
-                    success = False
-                    while retries_left > 0 and not success:
-                        if (self.pupil_remote.poll(2500) & zmq.POLLIN) != 0:
-                            _ = self.pupil_remote.recv_string()
-                            success = True
-                        if not success:
-                            retries_left -= 1
-                            print("No response from pupil capture...")
-                            self.pupil_remote.setsockopt(zmq.LINGER, 0)
-                            self.pupil_remote.close()
-                            if retries_left == 0 and self.popup:
-                                msg = QMessageBox()
-                                msg.setWindowTitle("Error")
-                                msg.setIcon(QMessageBox.Icon.Critical)
-                                msg.setText("No connection with Pupil Capture possible!")
-                                msg.exec()
-                                no_zmq_connection = True
-                            if not no_zmq_connection:
-                                self.pupil_remote = zmq.Socket(self.ctx, zmq.REQ)
+                if pupil_handshake is not None:
+                    self.pupil_remote = pupil_handshake.result()
+                    if self.pupil_remote is not None:
+                        try:  # set Pupil Capture's time base once, before the recording, drift is tracked by the clock
+                            self.pupil_remote.send_string(f'T {time()}')
+                            print("Annotate...", self.pupil_remote.recv_string())
+                        except zmq.ZMQError:
+                            print("Couldn't connect with Pupil Capture!")
+                        self.pupil_clock = PupilClock(self.ctx, self.pupil_ip, self.pupil_port)
+                        self.pupil_clock.start()
+                        self.annotations = AnnotationSender(self.ctx, self.pupil_ip, self.pupil_port)
+                        self.annotations.start()
+                    else:
+                        msg = QMessageBox()
+                        msg.setWindowTitle("Error")
+                        msg.setIcon(QMessageBox.Icon.Critical)
+                        msg.setText("No connection with Pupil Capture possible!")
+                        msg.exec()
+                        no_zmq_connection = True
                 else:
                     self.pupil_remote = None
                 if not no_zmq_connection:
-                    if self.popup and not self.preview and self.audio_ip is not None and self.audio_port is not None:
-                        self.audio_client = udp_client.SimpleUDPClient(self.audio_ip, self.audio_port)
-                        self.audio_client.send_message("/action", MUSHRA.unsolo_all)
-                        self.audio_client.send_message("/action", MUSHRA.loop_off_command)
-                        self.audio_client.send_message("/action", 40341)  # mute all
-                        self.audio_client.send_message("/action", 40297)  # unselect all
-                        if self.audio_recv_port is not None:
-                            self.audio_server_thread = threading.Thread(target=self.osc_listener_reaper, args=[self.audio_recv_port])
-                            self.audio_server_thread.daemon = True
-                            self.audio_server_thread.start()
+                    if self.audio_client is not None and self.audio_recv_port is not None:
+                        self.audio_receiver = self.osc_listener_reaper(self.audio_recv_port)
+                    if self.popup and not self.preview:
+                        self.connection_monitor = ConnectionMonitor()
+                        if self.audio_ip is not None:
+                            self.connection_monitor.add_endpoint("audio", icmp_probe(self.audio_ip, TIMEOUT))
+                            if self.audio_receiver is not None:  # any feedback, even if dropped, shows that Reaper is up
+                                self.audio_receiver.activity.connect(lambda: self.connection_monitor.seen("audio"))
+                        if self.video_ip is not None:
+                            self.connection_monitor.add_endpoint("video", icmp_probe(self.video_ip, TIMEOUT))
+                        if self.pupil_remote is not None:
+                            self.connection_monitor.add_endpoint("pupil", zmq_probe(self.ctx, f'tcp://{self.pupil_ip}:{self.pupil_port}', TIMEOUT))
+                        self.connection_monitor.connection_changed.connect(self.connection_changed)
+                        self.connection_monitor.start()
+                    session = None
+                    if resume is not None and popup and not self.preview:
+                        journal_file = latest_journal(self.filepath_results.rsplit("/", 1)[0]) if resume is True else resume
+                        if journal_file is not None and os.path.isfile(journal_file):
+                            session = load_journal(journal_file)
+                        if session is None or session["saved"]:
+                            print("No unsaved session to resume, starting a new one.")
+                            session = None
                         else:
-                            self.audio_server_thread = None
-                    else:
-                        self.audio_client = None
-                        self.audio_server_thread = None
+                            print(f"Resuming {journal_file}")
+                            self.participant_number = (self.filepath_results, session["participant"])
+                    if session is None and popup and not self.preview:
+                        self.reserve_participant_number()
                     self.filepath_log = f'{self.filepath_results.rsplit("/", 1)[0]}/log_{self.get_participant_number()}_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.txt'
                     if popup and not self.preview:
                         print(self.filepath_log)
+                        self.events.open(f'{os.path.splitext(self.filepath_log)[0]}.jsonl')
+                        self.filepath_latency = "/latency_".join(os.path.splitext(self.filepath_log)[0].rsplit("/log_", 1)) + ".json"
+                        self.filepath_clock = "/pupil_clock_".join(os.path.splitext(self.filepath_log)[0].rsplit("/log_", 1)) + ".json"
+                        self.journal = Journal(journal_file if session is not None else
+                                               f'{self.filepath_results.rsplit("/", 1)[0]}/journal_{self.get_participant_number()}_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.jsonl')
 
                     if not os.path.isfile(stylesheet):
                         raise FileNotFoundError(f"File {stylesheet} does not exist.")
                     with open(stylesheet, 'r') as css_file:
-                        self.css_data = css_file.read().replace('\n', '')
+                        self.css_data = compatible_stylesheet(css_file.read().replace('\n', ''))
                     self.setStyleSheet(self.css_data)  # no need to catch errors as if nonesense is set a default fallback is used internally
 
                     self.prev_index = 0
                     self.saved = False
 
-                    self.start = datetime.datetime.now()
-                    self.log = f"{str(self.start.replace(microsecond=0))} - Started GUI"
+                    self.start = datetime.datetime.now() if session is None else datetime.datetime.fromisoformat(session["start"])
+                    self.events.log("started", time=self.start)
+                    if session is not None:
+                        self.events.log("resumed", value=journal_file)
 
                     self.Stack = QStackedWidget(self)
-                    self.random_groups = []
+                    self.random_groups = []  # number of pages of each random group
+                    last_group = None
+                    for page in structure.sections:
+                        if "randomgroup" in structure[page].keys() and not self.preview:
+                            if structure[page]["randomgroup"] != last_group:
+                                self.random_groups.append(0)
+                            last_group = structure[page]["randomgroup"]
+                            self.random_groups[-1] += 1
+                        else:
+                            last_group = None
+                    if popup:
+                        self.page_order = participant_orders(self.rand, self.random_groups, self.get_participant_number(), self.rand_file)
+                    self.page_positions = {pid: position for position, pid in enumerate(self.page_sequence(structure))}
+                    orders = iter(self.page_order)
                     random_pages = []
                     last_group = 0
                     for page in structure.sections:
                         if "randomgroup" in structure[page].keys() and not self.preview:
                             if (structure[page]["randomgroup"] != last_group) and (len(random_pages) > 0):
-                                if self.rand == "balanced latin square":
-                                    squares = balanced_latin_squares(len(random_pages))
-                                    self.random_groups.append(len(random_pages))
-                                elif self.rand == "from file":
-                                    squares = order_from_file(self.rand_file)
-                                if (self.get_participant_number() - 1) >= len(squares):
-                                    order = squares[(self.get_participant_number() - 1) % len(squares)]
-                                else:
-                                    order = squares[self.get_participant_number() - 1]
-                                # print(order)
                                 if popup:
-                                    for o in order:
+                                    for o in next(orders):
                                         self.Stack.addWidget(random_pages[o - 1])
                                 else:
-                                    self.Stack.addWidget(Page(structure[page], page, parent=self))
+                                    self.Stack.addWidget(self.create_page(structure[page], page))
                                 random_pages = []
                             last_group = structure[page]["randomgroup"]
-                            random_pages.append(Page(structure[page], page, parent=self))
+                            random_pages.append(self.create_page(structure[page], page))
                         else:
                             if len(random_pages) > 0:
-                                if self.rand == "balanced latin square":
-                                    squares = balanced_latin_squares(len(random_pages))
-                                    self.random_groups.append(len(random_pages))
-                                elif self.rand == "from file":
-                                    squares = order_from_file(self.rand_file)
-                                if not popup:
-                                    order = squares[0]
-                                else:
-                                    if (self.get_participant_number() - 1) >= len(squares):
-                                        order = squares[(self.get_participant_number() - 1) % len(squares)]
-                                    else:
-                                        order = squares[self.get_participant_number() - 1]
-                                # print(order)
                                 if popup:
-                                    for o in order:
+                                    for o in next(orders):
                                         self.Stack.addWidget(random_pages[o - 1])
                                 else:
-                                    self.Stack.addWidget(Page(structure[page], page, parent=self))
-                            self.Stack.addWidget(Page(structure[page], page, parent=self))
+                                    self.Stack.addWidget(self.create_page(structure[page], page))
+                            self.Stack.addWidget(self.create_page(structure[page], page))
                             random_pages = []
                     if len(random_pages) > 0 and popup:
-                        if self.rand == "balanced latin square":
-                            squares = balanced_latin_squares(len(random_pages))
-                            self.random_groups.append(len(random_pages))
-                        elif self.rand == "from file":
-                            squares = order_from_file(self.rand_file)
-                        if (self.get_participant_number() - 1) >= len(squares):
-                            order = squares[(self.get_participant_number() - 1) % len(squares)]
-                        else:
-                            order = squares[self.get_participant_number() - 1]
-                        # print(order)
-                        if popup:
-                            for o in order:
-                                self.Stack.addWidget(random_pages[o - 1])
+                        for o in next(orders):
+                            self.Stack.addWidget(random_pages[o - 1])
                     elif len(random_pages) > 0 and not popup:
                         for _, page in enumerate(random_pages):
                             self.Stack.addWidget(page)
+                    if session is not None:  # same order of pages and answers as before the crash
+                        pages = {self.Stack.widget(index).id: self.Stack.widget(index) for index in range(self.Stack.count())}
+                        for index, pid in enumerate(session["order"]):
+                            if pid in pages and self.Stack.widget(index) is not pages[pid]:
+                                self.Stack.removeWidget(pages[pid])
+                                self.Stack.insertWidget(index, pages[pid])
+                        for index, answers in session["pages"].items():
+                            self.restore_page(index, answers)
+                    elif self.journal is not None:
+                        self.journal.record("session", participant=self.get_participant_number(), start=self.start.isoformat(), file=file,
+                                            order=[self.Stack.widget(index).id for index in range(self.Stack.count())])
+                    if self.Stack.count() > 0:
+                        self.load_page(0)
 
                     self.Stack.currentChanged[int].connect(self.on_current_changed)
 
@@ -407,6 +520,8 @@ class StackedWindowGui(QWidget):
                     self.Stack.currentChanged[int].connect(lambda: scroll.verticalScrollBar().setValue(0))
                     self.Stack.currentChanged[int].connect(lambda: scroll.horizontalScrollBar().setValue(0))
                     self.setLayout(outerlayout)
+                    if session is not None and session["current"] > 0:
+                        self.resume_page(session["current"])
                     if self.popup and not self.preview:
                         self.showFullScreen()
                         if self.width() <= QGuiApplication.primaryScreen().availableGeometry().width():
@@ -414,7 +529,7 @@ class StackedWindowGui(QWidget):
                         if self.height() <= QGuiApplication.primaryScreen().availableGeometry().height():
                             scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
                         self.show()
-                        self.on_current_changed(0)
+                        self.on_current_changed(self.Stack.currentIndex())
                     else:
                         self.disconnect_nav()
                         for page in range(self.Stack.count()):
@@ -429,6 +544,149 @@ class StackedWindowGui(QWidget):
                                 scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
                             self.show()
 
+    def register_answers(self, page):
+        """Add the answers of a built page to the id index.
+
+        Parameters
+        ----------
+        page : Page
+            the page, its answers are in evaluationvars
+        """
+        for qid, accessor in page.evaluationvars.items():
+            self.answer_index[qid] = (page, accessor)
+            self.answer_keys[id(accessor)] = qid
+
+    def answer_of(self, reference, page):
+        """Resolve an "id:" reference to the answer of a question shown before or on the same page.
+
+        Parameters
+        ----------
+        reference : str
+            the reference, e.g. 'id:name'
+        page : Page
+            page of the element with the reference, may still be under construction
+
+        Returns
+        -------
+        object or None
+            the answer accessor, e.g. a QLineEdit, None if the reference can't be resolved
+        """
+        qid = reference[2:].strip(' :')
+        if qid in page.evaluationvars:
+            return page.evaluationvars[qid]
+        if qid in self.answer_index:
+            owner, accessor = self.answer_index[qid]
+            if self.page_positions[owner.id] < self.page_positions[page.id]:  # the stack is incomplete while pages are built
+                return accessor
+        if qid in self.question_pages or qid in self.answer_index:
+            later = self.answer_index[qid][0].id if qid in self.answer_index else self.question_pages[qid]
+            print(f'"{reference}" on page "{page.id}" refers to a question on page "{later}", '
+                  f'which is shown later. Only questions shown before can be referenced.')
+        else:
+            print(f'"{reference}" on page "{page.id}" refers to an unknown question.')
+        return None
+
+    def page_sequence(self, structure):
+        """Get the names of the pages in the order they are shown, the random groups in the order of this participant.
+
+        Parameters
+        ----------
+        structure : ConfigObj
+            the compiled questionnaire structure
+
+        Returns
+        -------
+        list[str]
+            names of the pages
+        """
+        if not self.popup or self.preview:
+            return list(structure.sections)
+        sequence = []
+        orders = iter(self.page_order)
+        group = []
+        last_group = None
+        for page in structure.sections:
+            current = structure[page]["randomgroup"] if "randomgroup" in structure[page].keys() else None
+            if len(group) > 0 and current != last_group:
+                sequence += [group[o - 1] for o in next(orders)]
+                group = []
+            if current is None:
+                sequence.append(page)
+            else:
+                group.append(page)
+            last_group = current
+        if len(group) > 0:
+            sequence += [group[o - 1] for o in next(orders)]
+        return sequence
+
+    def create_page(self, structure, pid):
+        """Create a page, or only a placeholder for it if pages are loaded lazily.
+
+        Parameters
+        ----------
+        structure : ConfigObj
+            questionnaire structure of the page
+        pid : str
+            name of the page
+
+        Returns
+        -------
+        Page or PagePlaceholder
+        """
+        if self.lazy_loading:
+            return PagePlaceholder(structure, pid, parent=self)
+        return Page(structure, pid, parent=self)
+
+    def load_page(self, index):
+        """Build the page at the given index of the stack if it is still a placeholder.
+
+        Parameters
+        ----------
+        index : int
+            index of the page in the stack
+
+        Returns
+        -------
+        Page
+            the (now) built page
+        """
+        placeholder = self.Stack.widget(index)
+        if isinstance(placeholder, PagePlaceholder):
+            current = self.Stack.currentIndex()
+            page = Page(placeholder.structure, placeholder.id, parent=self)
+            self.Stack.blockSignals(True)
+            self.Stack.insertWidget(index, page)
+            self.Stack.removeWidget(placeholder)
+            self.Stack.setCurrentIndex(current)
+            self.Stack.blockSignals(False)
+            placeholder.deleteLater()
+        return self.Stack.widget(index)
+
+    def pupil_handshake(self):
+        """Connect to Pupil Remote and ask for its version, retry up to three times.
+
+        Returns
+        -------
+        zmq.Socket or None
+            the connected REQ socket or None if Pupil Capture did not answer
+        """
+        address = f'tcp://{self.pupil_ip}:{self.pupil_port}'
+        print(f"Connect to pupil {address}")
+        retries_left = 3
+        while retries_left > 0:
+            pupil_remote = zmq.Socket(self.ctx, zmq.REQ)
+            pupil_remote.setsockopt(zmq.RCVTIMEO, 2000)
+            pupil_remote.connect(address)
+            pupil_remote.send_string("v")
+            if (pupil_remote.poll(2500) & zmq.POLLIN) != 0:
+                _ = pupil_remote.recv_string()
+                return pupil_remote
+            retries_left -= 1
+            print("No response from pupil capture...")
+            pupil_remote.setsockopt(zmq.LINGER, 0)
+            pupil_remote.close()
+        return None
+
     def osc_listener_reaper(self, port):
         """ Handle the listening of messages from Reaper.
 
@@ -436,13 +694,18 @@ class StackedWindowGui(QWidget):
             ----------
             port : int
                 the port to listen on
+
+            Returns
+            -------
+            OSCReceiver
+                the receiver, its messages are handled in the GUI thread
         """
-        ip = socket.gethostbyname(socket.gethostname())
+        ip = self.probe_cache.local_ip().result()
         print(f"Listening on {ip}:{port}")
         dispatcher = Dispatcher()
         dispatcher.set_default_handler(self.play_state)
-        self.reaper_server = osc_server.OSCUDPServer((ip, port), dispatcher)
-        self.reaper_server.serve_forever()
+        self.reaper.ack_timeout = ACK_TIMEOUT  # Reaper confirms the commands now
+        return OSCReceiver(ip, port, dispatcher, self, addresses=REAPER_FEEDBACK)
 
     def osc_listener_default(self, port):
         """ Handle the listening of messages from any source.
@@ -451,13 +714,17 @@ class StackedWindowGui(QWidget):
             ----------
             port : int
                 the port to listen on
+
+            Returns
+            -------
+            OSCReceiver
+                the receiver, its messages are handled in the GUI thread
         """
-        ip = socket.gethostbyname(socket.gethostname())
+        ip = self.probe_cache.local_ip().result()
         print(f"Listening on {ip}:{port}")
         dispatcher = Dispatcher()
         dispatcher.set_default_handler(self.osc_reply)  # Funktion, die ausgeführt wird
-        self.osc_server = osc_server.OSCUDPServer((ip, port), dispatcher)
-        self.osc_server.serve_forever()
+        return OSCReceiver(ip, port, dispatcher, self)
 
     def osc_reply(self, address, osc_args):
         """Monitor the incoming OSC messages from the default OSC listener.
@@ -471,7 +738,7 @@ class StackedWindowGui(QWidget):
         """
         print("Received", osc_args, " from ", address)
         self.global_osc_message = osc_args
-        self.log += f"\n{str(datetime.datetime.now().replace(microsecond=0))} - Received {self.global_osc_message} from global OSC"
+        self.events.log("osc", value=self.global_osc_message)
 
     def play_state(self, address, reap_args):
         """ Monitor the play state given by Reaper.
@@ -484,9 +751,11 @@ class StackedWindowGui(QWidget):
             reap_args : tuple
                 value(s) of the message
         """
+        self.reaper.feedback(address, reap_args)
         if address in ["/play", "/pause", "/stop"]:
             if address == "/play" and ((isinstance(reap_args, float) and (reap_args == 1.0)) or (isinstance(reap_args, tuple) and (reap_args[0] == 1.0))):
                 self.global_play_state = "PLAY"
+                self.latency.feedback()
             elif address == "/pause" and ((isinstance(reap_args, float) and (reap_args == 1.0)) or (isinstance(reap_args, tuple) and (reap_args[0] == 1.0))):
                 self.global_play_state = "PAUSE"
             elif address == "/stop" and ((isinstance(reap_args, float) and (reap_args == 1.0)) or (isinstance(reap_args, tuple) and (reap_args[0] == 1.0))):
@@ -498,8 +767,8 @@ class StackedWindowGui(QWidget):
                             player.playing = False
                 else:
                     self.stop_initiated = False
-        elif address.find("/track/") > -1 and int(address.split("/")[2]) > self.audio_tracks:  # not needed anymore?
-            self.audio_tracks = address.split("/")[2]
+        elif address.startswith("/track/"):
+            self.audio_tracks = max(self.audio_tracks, self.reaper.track_count)
 
     def disconnect_all(self, layout):
         """ Disconnect all widgets from their function for preview.
@@ -558,124 +827,27 @@ class StackedWindowGui(QWidget):
                 player.stop()
                 if isinstance(player, MUSHRA):
                     self.audio_client.send_message("/action", MUSHRA.unsolo_all)
-        # check for required questions
-        not_all_answered = False
-        for quest in self.Stack.currentWidget().required.keys():
-            if self.Stack.currentWidget().required[quest][0]:
-                ans = self.Stack.currentWidget().evaluationvars[quest]
-                if (isinstance(ans, QButtonGroup) and (ans.checkedId() == -1)) or \
-                    (isinstance(ans, QCheckBox) and not ans.isChecked()) or \
-                    (isinstance(ans, (QLineEdit, PasswordEntry)) and (len(ans.text()) == 0)) or \
-                    (isinstance(ans, QPlainTextEdit) and (len(ans.toPlainText()) == 0)) or \
-                    (isinstance(ans, (Slider, LabeledSlider)) and (ans.value() == ans.start) and not ans.get_moved()) or \
-                    (isinstance(ans, list) and (len(ans) == 0) and not self.Stack.currentWidget().required[quest][3]) or \
-                    (isinstance(ans, list) and (isinstance(ans[0], list)) and (0 in (len(x) for x in ans)) and not self.Stack.currentWidget().required[quest][3]) or \
-                    (isinstance(ans, bool) and not ans) or \
-                    (isinstance(ans, ABX) and ([] in self.Stack.currentWidget().required[quest][3] or ans.answer.checkedId() == -1)) or \
-                    (isinstance(ans, RadioMatrix) and (-1 in [bg.checkedId() for bg in ans.buttongroups])) or \
-                    (isinstance(ans, (OSCButton, Button)) and not ans.used):
-                    not_all_answered = True
-                    if isinstance(self.Stack.currentWidget().required[quest][1], (QLabel, QPushButton)):
-                        self.Stack.currentWidget().required[quest][1].setObjectName("required")
-                        self.Stack.currentWidget().required[quest][1].setStyleSheet(self.css_data)
-                    elif isinstance(ans, ABX):
-                        if ans.answer.checkedId() == -1:
-                            ans.label.setObjectName("required")
-                        else:
-                            ans.label.setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                        if not ans.a_button.duration:
-                            self.Stack.currentWidget().required[quest][1][0].play_button.setObjectName("required")
-                        else:
-                            self.Stack.currentWidget().required[quest][1][0].play_button.setObjectName(
-                                str() if self.Stack.currentWidget().required[quest][2] is None else
-                                self.Stack.currentWidget().required[quest][2])
-                        if not ans.b_button.duration:
-                            self.Stack.currentWidget().required[quest][1][1].play_button.setObjectName("required")
-                        else:
-                            self.Stack.currentWidget().required[quest][1][1].play_button.setObjectName(
-                                str() if self.Stack.currentWidget().required[quest][2] is None else
-                                self.Stack.currentWidget().required[quest][2])
-                        if ans.x_button is not None and ans.x_button.duration == []:
-                            self.Stack.currentWidget().required[quest][1][2].play_button.setObjectName("required")
-                            self.Stack.currentWidget().required[quest][1][2].play_button.setStyleSheet(self.css_data)
-                        elif ans.x_button is not None and len(ans.x_button.duration) >= 1:
-                            self.Stack.currentWidget().required[quest][1][2].play_button.setObjectName(
-                                str() if self.Stack.currentWidget().required[quest][2] is None else
-                                self.Stack.currentWidget().required[quest][2])
-                            self.Stack.currentWidget().required[quest][1][2].play_button.setStyleSheet(self.css_data)
-
-                        ans.label.setStyleSheet(self.css_data)
-                        self.Stack.currentWidget().required[quest][1][0].play_button.setStyleSheet(self.css_data)
-                        self.Stack.currentWidget().required[quest][1][1].play_button.setStyleSheet(self.css_data)
-                    elif isinstance(ans, RadioMatrix):
-                        for q in range(0, len(ans.questions)):
-                            if ans.buttongroups[q].checkedId() == -1:
-                                self.Stack.currentWidget().required[quest][1][q].setObjectName("required")
-                            else:
-                                self.Stack.currentWidget().required[quest][1][q].setObjectName(
-                                    str() if self.Stack.currentWidget().required[quest][2] is None else
-                                    self.Stack.currentWidget().required[quest][2])
-                            self.Stack.currentWidget().required[quest][1][q].setStyleSheet(self.css_data)
-                    else:  # MUSHRA
-                        for b in range(0, len(self.Stack.currentWidget().required[quest][1])):
-                            if len(ans[b]) < 1:
-                                self.Stack.currentWidget().required[quest][1][b].setObjectName("required")
-                            else:
-                                self.Stack.currentWidget().required[quest][1][b].setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                            self.Stack.currentWidget().required[quest][1][b].setStyleSheet(self.css_data)
-                else:
-                    if isinstance(self.Stack.currentWidget().required[quest][1], QLabel):
-                        if len(self.Stack.currentWidget().required[quest]) <= 2:
-                            self.Stack.currentWidget().required[quest][1].setObjectName(str())
-                        else:
-                            self.Stack.currentWidget().required[quest][1].setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                        self.Stack.currentWidget().required[quest][1].setStyleSheet(self.css_data)
-                    elif isinstance(self.Stack.currentWidget().required[quest][1], QPushButton):
-                        self.Stack.currentWidget().required[quest][1].setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                        self.Stack.currentWidget().required[quest][1].setStyleSheet(self.css_data)
-                    elif isinstance(ans, ABX):
-                        if ans.answer.checkedId() != -1:
-                            ans.label.setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                            ans.label.setStyleSheet(self.css_data)
-                        if len(ans.a_button.duration) >= 1:
-                            self.Stack.currentWidget().required[quest][1][0].play_button.setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                            self.Stack.currentWidget().required[quest][1][0].play_button.setStyleSheet(self.css_data)
-                        if len(ans.b_button.duration) >= 1:
-                            self.Stack.currentWidget().required[quest][1][1].play_button.setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                            self.Stack.currentWidget().required[quest][1][1].play_button.setStyleSheet(self.css_data)
-                        if ans.x_button is not None and len(ans.x_button.duration) >= 1:
-                            self.Stack.currentWidget().required[quest][1][2].play_button.setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                            self.Stack.currentWidget().required[quest][1][2].play_button.setStyleSheet(self.css_data)
-                    elif isinstance(ans, RadioMatrix):
-                        for q in range(0, len(ans.questions)):
-                            if ans.buttongroups[q].checkedId() != -1:
-                                self.Stack.currentWidget().required[quest][1][q].setObjectName(
-                                    str() if self.Stack.currentWidget().required[quest][2] is None else
-                                    self.Stack.currentWidget().required[quest][2])
-                                self.Stack.currentWidget().required[quest][1][q].setStyleSheet(self.css_data)
-                    else:  # MUSHRA
-                        for b in range(0, len(self.Stack.currentWidget().required[quest][1])):
-                            if len(ans[b]) >= 1:
-                                self.Stack.currentWidget().required[quest][1][b].setObjectName(str() if self.Stack.currentWidget().required[quest][2] is None else self.Stack.currentWidget().required[quest][2])
-                                self.Stack.currentWidget().required[quest][1][b].setStyleSheet(self.css_data)
+        page = self.Stack.currentWidget()
+        # check for required questions, their state is tracked while they are answered
+        page.required_tracker.check_sliders()
+        not_all_answered = page.required_tracker.unanswered > 0
+        if not_all_answered:
+            page.required_tracker.highlight()
         timer_running = False
         pw_valid = True
-        for child in self.Stack.currentWidget().children():
-            if isinstance(child, PasswordEntry):
-                pw_valid = child.validate()
-                child.setStyleSheet(self.css_data)
-            elif isinstance(child, Player):
-                if child.timer is not None and child.countdown > 0:
-                    timer_running = True
+        for entry in page.password_entries:
+            pw_valid = entry.validate() and pw_valid
+        for player in page.players:
+            if isinstance(player, Player) and player.timer is not None and player.countdown > 0:
+                timer_running = True
         if not not_all_answered and pw_valid and not timer_running:
             self.forwardbutton.setToolTip(None)
-            self.log += self.Stack.currentWidget().page_log
-            self.Stack.currentWidget().page_log = ""
-            if self.global_osc_server_thread is not None:
+            if self.global_osc_receiver is not None:
                 self.Stack.currentWidget().set_osc_message(self.global_osc_message)
             i = self.Stack.currentIndex() + 1
+            self.journal_page(i - 1, min(i, self.Stack.count() - 1))
             if i + 1 <= self.Stack.count():
-                self.log += f'\n{str(datetime.datetime.now().replace(microsecond=0))} - Changed to Page {i + 1}'
+                self.events.log("page", value=i + 1)
             if self.go_back and (i == 1) and (self.Stack.count() > 1) and not self.saved:  # enable going back at page 2
                 self.backbutton.setEnabled(True)
             if i == self.sections.index(self.save_after) + 1:
@@ -687,6 +859,7 @@ class StackedWindowGui(QWidget):
                     if not self.preview:
                         self.collect_and_save_data()
                     self.saved = True
+                    self.load_page(i)
                     self.Stack.setCurrentIndex(i)
                     if self.Stack.currentIndex() == self.Stack.count() - 1:
                         self.forwardbutton.setEnabled(False)
@@ -695,10 +868,11 @@ class StackedWindowGui(QWidget):
                     if self.go_back:
                         self.backbutton.setEnabled(False)
             if self.pupil_remote is not None and self.Stack.currentWidget().pupil_on_next is not None:
-                self.Stack.currentWidget().pupil_func.send_trigger(self.Stack.currentWidget().pupil_func.new_trigger(self.Stack.currentWidget().pupil_on_next))
+                self.Stack.currentWidget().pupil_func.send_trigger(self.Stack.currentWidget().pupil_func.new_trigger(self.Stack.currentWidget().pupil_on_next, clock=self.pupil_clock))
 
             # change the page
             if i <= self.Stack.count() - 1:  # normal pages in the middle
+                self.load_page(i)
                 self.Stack.setCurrentIndex(i)
             if i == self.sections.index(self.save_after):
                 self.forwardbutton.setText(self.send_text)
@@ -709,6 +883,31 @@ class StackedWindowGui(QWidget):
             self.global_osc_message = None
         else:
             self.forwardbutton.setToolTip(self.tooltip_not_all_answered)
+            if not_all_answered:  # until the tracker reports the page as complete
+                self.forwardbutton.setEnabled(False)
+                self.required_block = True
+
+    def required_changed(self, page, complete):
+        """Enable the forward button as soon as the highlighted required questions are answered, and disable it again
+        if one is unanswered again.
+
+        Parameters
+        ----------
+        page : Page
+            page whose state changed
+        complete : bool
+            True if all required questions of the page are answered
+        """
+        if page is not self.Stack.currentWidget():
+            return
+        if complete and self.required_block:
+            self.forwardbutton.setEnabled(True)
+            self.forwardbutton.setToolTip(None)
+            self.required_block = False
+        elif not complete and not self.required_block and self.forwardbutton.isEnabled():
+            self.forwardbutton.setEnabled(False)
+            self.forwardbutton.setToolTip(self.tooltip_not_all_answered)
+            self.required_block = True
 
     def prev_page(self):
         """
@@ -719,7 +918,8 @@ class StackedWindowGui(QWidget):
                 player.stop()
         self.forwardbutton.setText(self.forward_text)
         i = self.Stack.currentIndex() - 1
-        self.log += f'\n{str(datetime.datetime.now().replace(microsecond=0))} - Changed to Page {i + 1}'
+        self.journal_page(i + 1, i)
+        self.events.log("page", value=i + 1)
         if i > 0:
             self.Stack.setCurrentIndex(i)
             self.forwardbutton.setEnabled(True)
@@ -736,6 +936,14 @@ class StackedWindowGui(QWidget):
         index : int
             index of the new page
         """
+        self.load_page(index)
+        if self.required_block:  # the block only holds for the page it was set on
+            self.forwardbutton.setEnabled(True)
+            self.required_block = False
+        tracker = self.Stack.currentWidget().required_tracker
+        if tracker.highlighting and tracker.unanswered > 0 and self.forwardbutton.isEnabled():
+            self.forwardbutton.setEnabled(False)
+            self.required_block = True
         if self.pagecount_text.count('{') == 2:
             self.page_label.setText(self.pagecount_text.format(index + 1, self.Stack.count()))
         elif self.pagecount_text.count('{') == 1:
@@ -765,14 +973,24 @@ class StackedWindowGui(QWidget):
         """
         if not self.saved and not self.preview:
             self.collect_and_save_data()
-        if self.osc_server is not None:
-            self.osc_server.shutdown()
-            self.osc_server.server_close()
-            self.global_osc_server_thread.join()
-        if self.reaper_server is not None:
-            self.reaper_server.shutdown()
-            self.reaper_server.server_close()
-            self.audio_server_thread.join()
+        if self.results_writer is not None and not self.results_writer.wait(SAVE_TIMEOUT):
+            print("Could not finish saving the results!")
+        elif self.results_writer is not None:
+            QApplication.sendPostedEvents(self, QEvent.Type.MetaCall)  # deliver save_finished before the journal is closed
+        if self.global_osc_receiver is not None:
+            self.global_osc_receiver.close()
+        if self.audio_receiver is not None:
+            self.audio_receiver.close()
+        if self.connection_monitor is not None:
+            self.connection_monitor.stop()
+        if self.annotations is not None:
+            self.annotations.close()
+        if self.pupil_clock is not None:
+            self.pupil_clock.close()
+        self.probe_cache.shutdown()
+        self.events.close()
+        if self.journal is not None:
+            self.journal.close()
         self.close()
 
     def continue_message(self):
@@ -795,6 +1013,141 @@ class StackedWindowGui(QWidget):
         retval = msg.buttonRole(msg.clickedButton())
         return retval
 
+    def resume_page(self, index):
+        """Show the page a resumed session was at, with the navigation in the according state.
+
+        Parameters
+        ----------
+        index : int
+            index of the page in the stack
+        """
+        self.load_page(index)
+        self.Stack.setCurrentIndex(index)
+        if self.go_back and self.Stack.count() > 1:
+            self.backbutton.setEnabled(True)
+        if index == self.sections.index(self.save_after):
+            self.forwardbutton.setText(self.send_text)
+        elif index + 1 == self.Stack.count():
+            self.forwardbutton.setEnabled(False)
+
+    def collect_page(self, index):
+        """Collect the values from all questions of a page.
+
+        Parameters
+        ----------
+        index : int
+            index of the page in the stack
+
+        Returns
+        -------
+        dict
+            the values, the keys are the column names of the results file
+        """
+        fields = {}
+        page = self.load_page(index)
+        if page.evaluationvars is not None:
+            for qid, ans in page.evaluationvars.items():
+                if isinstance(ans, ABX):
+                    fields[qid + "_order"] = ans.order
+                    fields[qid + "_answer"] = ans.answer.checkedId()
+                    fields[qid + "_duration_A"] = ans.a_button.duration
+                    fields[qid + "_duration_B"] = ans.b_button.duration
+                    if ans.x_button is not None:
+                        fields[qid + "_duration_X"] = ans.x_button.duration
+                elif isinstance(ans, RadioMatrix):
+                    for pqid, rmans in enumerate(ans.id_order):
+                        if len(ans.questions) >= 10:
+                            fields[f'{qid}_{rmans:02d}'] = ans.buttongroups[pqid].checkedId()
+                        else:
+                            fields[f'{qid}_{rmans}'] = ans.buttongroups[pqid].checkedId()
+                    fields[qid + "_order"] = ans.id_order
+                else:
+                    if isinstance(ans, QButtonGroup):
+                        fields[qid] = ans.checkedId()
+                    elif isinstance(ans, QCheckBox):
+                        fields[qid] = ans.isChecked()
+                    elif isinstance(ans, (QLineEdit, PasswordEntry)):
+                        if isinstance(ans.validator(), QDoubleValidator):
+                            ans.setText(ans.text().replace(",", "."))
+                        fields[qid] = ans.text()
+                        # remove any emojis
+                        fields[qid] = re.sub(EMOJI_PATTERN, '', fields[qid])
+                    elif isinstance(ans, QPlainTextEdit):
+                        fields[qid] = ans.toPlainText().replace("\n", " ")
+                        # remove any emojis
+                        fields[qid] = re.sub(EMOJI_PATTERN, '', fields[qid])
+                    elif isinstance(ans, (Slider, LabeledSlider, QSlider)):
+                        fields[qid] = ans.value()
+                    elif isinstance(ans, (Button, OSCButton)):
+                        fields[qid] = ans.used
+                    else:
+                        fields[qid] = ans
+        return fields
+
+    def journal_page(self, index, current):
+        """Keep the answers of a page the participant leaves and write them to the journal.
+
+        Parameters
+        ----------
+        index : int
+            index of the page that is left
+        current : int
+            index of the page that is shown next
+        """
+        self.page_answers[index] = copy.deepcopy(self.collect_page(index))  # the lists of durations keep growing
+        if self.journal is not None:
+            self.journal.record("page", index=index, page=self.Stack.widget(index).id, current=current,
+                                time=datetime.datetime.now().isoformat(), answers=self.page_answers[index])
+
+    def restore_page(self, index, answers):
+        """Set the questions of a page to the answers of a resumed session.
+
+        Parameters
+        ----------
+        index : int
+            index of the page in the stack
+        answers : dict
+            the values as collected by collect_page(), read from the journal
+        """
+        page = self.load_page(index)
+        for qid, ans in page.evaluationvars.items():
+            if isinstance(ans, ABX):
+                if qid + "_order" in answers:
+                    ans.order = [tuple(stimulus) for stimulus in answers[qid + "_order"]]
+                    for player, stimulus in zip([ans.a_button, ans.b_button], ans.order):
+                        player.set_stimulus(stimulus[0], [stimulus[1]])
+                if qid + "_answer" in answers and ans.answer.button(answers[qid + "_answer"]) is not None:
+                    ans.answer.button(answers[qid + "_answer"]).setChecked(True)
+                for player, key in [(ans.a_button, "_duration_A"), (ans.b_button, "_duration_B"), (ans.x_button, "_duration_X")]:
+                    if player is not None and qid + key in answers:
+                        player.duration[:] = answers[qid + key]
+            elif isinstance(ans, RadioMatrix):
+                for pqid, rmans in enumerate(ans.id_order):
+                    key = f'{qid}_{rmans:02d}' if len(ans.questions) >= 10 else f'{qid}_{rmans}'
+                    if key in answers and ans.buttongroups[pqid].button(answers[key]) is not None:
+                        ans.buttongroups[pqid].button(answers[key]).setChecked(True)
+            elif qid not in answers:
+                continue
+            elif isinstance(ans, QButtonGroup):
+                if ans.button(answers[qid]) is not None:
+                    ans.button(answers[qid]).setChecked(True)
+            elif isinstance(ans, QCheckBox):
+                ans.blockSignals(True)
+                ans.setChecked(answers[qid])
+                ans.blockSignals(False)
+            elif isinstance(ans, (QLineEdit, PasswordEntry)):
+                ans.setText(answers[qid])
+            elif isinstance(ans, QPlainTextEdit):
+                ans.setPlainText(answers[qid])
+            elif isinstance(ans, (Slider, LabeledSlider)):
+                ans.set_value(answers[qid])
+            elif isinstance(ans, (Button, OSCButton)):
+                ans.used = answers[qid]
+            elif isinstance(ans, list):  # durations of a player
+                ans[:] = answers[qid]
+        page.required_tracker.refresh()  # not every answer was restored with a signal
+        self.page_answers[index] = copy.deepcopy(self.collect_page(index))
+
     def collect_and_save_data(self):
         """Collect the values from all questions and write them to a .csv file for further processing.\n
         If the csv-file is opened in some application, a backup is saved instead.
@@ -804,213 +1157,160 @@ class StackedWindowGui(QWidget):
         for p in self.Stack.currentWidget().players:
             self.disconnect_all(p.layout())
 
-        # Stop pupil
-        if self.pupil_remote is not None:
-            try:
-                self.pupil_remote.send_string("r")
-                self.pupil_remote.recv_string()
-            except zmq.ZMQError:
-                print("Couldn't connect with Pupil Capture!")
-
-        emoji_pattern = re.compile("["
-                                u"\U0001F600-\U0001F64F"  # emoticons
-                                u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-                                u"\U0001F680-\U0001F6FF"  # transport & map symbols
-                                u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-                                u"\U00002500-\U000027B0"
-                                u"\U000024C2-\U0001F251"
-                                u"\U0001f926-\U0001f937"
-                                u"\U00010000-\U0010ffff"
-                                u"\u2640-\u2642"
-                                u"\u2600-\u2B55"
-                                u"\u200d"
-                                u"\u23cf"
-                                u"\u23e9"
-                                u"\u231a"
-                                u"\ufe0f"
-                                u"\u3030"
-                                "]+", flags=re.UNICODE)
-
-        try:
+        try:  # the number the session started with, the writer allocates the saved one
             fields = {"data_row_number": self.get_participant_number()}
         except PermissionError:  # file is open and can't be read
             fields = {"data_row_number": -1}
-        for s in range(0, self.Stack.count()):
-            if self.Stack.widget(s).evaluationvars is not None:
-                for qid, ans in self.Stack.widget(s).evaluationvars.items():
-                    if isinstance(ans, ABX):
-                        fields[qid + "_order"] = ans.order
-                        fields[qid + "_answer"] = ans.answer.checkedId()
-                        fields[qid + "_duration_A"] = ans.a_button.duration
-                        fields[qid + "_duration_B"] = ans.b_button.duration
-                        if ans.x_button is not None:
-                            fields[qid + "_duration_X"] = ans.x_button.duration
-                    elif isinstance(ans, RadioMatrix):
-                        for pqid, rmans in enumerate(ans.id_order):
-                            if len(ans.questions) >= 10:
-                                fields[f'{qid}_{rmans:02d}'] = ans.buttongroups[pqid].checkedId()
-                            else:
-                                fields[f'{qid}_{rmans}'] = ans.buttongroups[pqid].checkedId()
-                        fields[qid + "_order"] = ans.id_order
-                    else:
-                        if isinstance(ans, QButtonGroup):
-                            fields[qid] = ans.checkedId()
-                        elif isinstance(ans, QCheckBox):
-                            fields[qid] = ans.isChecked()
-                        elif isinstance(ans, (QLineEdit, PasswordEntry)):
-                            if isinstance(ans.validator(), QDoubleValidator):
-                                ans.setText(ans.text().replace(",", "."))
-                            fields[qid] = ans.text()
-                            # remove any emojis
-                            fields[qid] = re.sub(emoji_pattern, '', fields[qid])
-                        elif isinstance(ans, QPlainTextEdit):
-                            fields[qid] = ans.toPlainText().replace("\n", " ")
-                            # remove any emojis
-                            fields[qid] = re.sub(emoji_pattern, '', fields[qid])
-                        elif isinstance(ans, (Slider, LabeledSlider, QSlider)):
-                            fields[qid] = ans.value()
-                        elif isinstance(ans, (Button, OSCButton)):
-                            fields[qid] = ans.used
-                        else:
-                            fields[qid] = ans
+        for s in range(0, self.Stack.count()):  # the journal holds the answers of all left pages
+            if s in self.page_answers and s != self.Stack.currentIndex():
+                fields.update(self.page_answers[s])
+            elif isinstance(self.Stack.widget(s), PagePlaceholder):  # never shown, no need to build it
+                fields.update(page_defaults(self.Stack.widget(s).structure))
+            else:
+                fields.update(self.collect_page(s))
         if self.rand == "balanced latin square":
-            fields["Order"] = []
-            for rg in self.random_groups:
-                if not fields["data_row_number"] == -1:
-                    fields["Order"].append(balanced_latin_squares(rg)[(self.get_participant_number() - 1) % len(balanced_latin_squares(rg))])
-                else:
-                    fields["Order"] = "unknown"
+            fields["Order"] = self.page_order
         elif self.rand == "from file":
-            fields["Order"] = order_from_file(self.rand_file)[self.get_participant_number() - 1]
+            fields["Order"] = self.page_order[0] if len(self.page_order) > 0 else []
 
         end = datetime.datetime.now()
-        self.log += f'\n{str(end.replace(microsecond=0))} - Finished Questionnaire'
+        self.events.log("finished", time=end)
         fields["Start"] = str(self.start)
         fields["End"] = str(end)
 
-        path = self.filepath_log.rsplit("/", 1)
-        if not os.path.exists(self.filepath_log):
-            if path[0] != "." and path[0] != [".."]:
-                os.makedirs(path[0] + "/", exist_ok=True)
-        # remove any emojis
-        self.log = re.sub(emoji_pattern, '', self.log)
-
-        with open(self.filepath_log, 'w') as log_file:
-            log_file.write(self.log)
-            log_file.close()
-
-        path = self.filepath_results.rsplit("/", 1)
-        if not os.path.exists(self.filepath_results):
-            if path[0] != "." and path[0] != [".."]:
-                os.makedirs(path[0] + "/", exist_ok=True)
-            with open(self.filepath_results, "w+", newline='', encoding='utf_8') as csvfile:
-                writer = csv.writer(csvfile, delimiter=self.delimiter)
-                header = fields.keys()
-                writer.writerow(header)
-                print("wrote header")
-        print("resultsfile exists", os.path.exists(self.filepath_results))
-        time.sleep(5)
-        try:
-            headers = []
-            with open(self.filepath_results, 'r', newline='', encoding='utf_8') as f:
-                d_reader = csv.DictReader(f, delimiter=self.delimiter)
-                headers = d_reader.fieldnames
-                # print("Header",headers)
-            time.sleep(2)
-            with open(self.filepath_results, "a", newline='', encoding='utf_8') as csvfile:
-                writer = csv.writer(csvfile, delimiter=self.delimiter)
-                row = []
-                # print(headers)
-                for _, hfield in enumerate(headers):
-                    row.append(fields[hfield])
-                writer.writerow(row)
-        except (PermissionError, KeyError):
-            print("Can not access results file, saving backup!")
+        if self.filepath_latency is not None:
+            self.latency.save(self.filepath_latency)
+        if self.pupil_clock is not None and self.filepath_clock is not None:
+            self.pupil_clock.save(self.filepath_clock)
+        # the answers are collected, the disk is accessed in the background, the log is rendered without emojis
+        if self.results_backend == "SQLite":
+            self.results_writer = DatabaseWriter(fields, self.events.render(len(self.events), EMOJI_PATTERN), database_path(self.filepath_results), self.filepath_log,
+                                                 self.delimiter, schema=self.schema, events=self.events.events(len(self.events)), before=self.stop_pupil)
+        else:
+            self.results_writer = ResultsWriter(fields, self.events.render(len(self.events), EMOJI_PATTERN), self.filepath_results, self.filepath_log, self.delimiter,
+                                                schema=self.schema, before=self.stop_pupil)
+        self.results_writer.finished.connect(self.save_finished)
+        QApplication.setOverrideCursor(Qt.CursorShape.BusyCursor)
+        self.save_timer.start(SAVE_TIMEOUT * 1000)
+        self.results_writer.start()
+        self.saved = True
+
+    def stop_pupil(self):
+        """Stop the recording of Pupil Capture after the last annotations are in it, called by the results writer in the background."""
+        if self.annotations is not None and not self.annotations.flush(ANNOTATION_TIMEOUT):
+            print("Could not send all annotations to Pupil Capture!")
+        if self.pupil_remote is not None:
             try:
-                participant_number = self.get_participant_number()
-            except PermissionError:  # file can't be read
-                participant_number = "unknown"
-            self.filepath_results = f'{path[0]}/{participant_number}_backup_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.csv'
-            print(f'Backup file: {self.filepath_results}')
-            with open(self.filepath_results, "w+", newline='', encoding='utf_8') as csvfile:
-                writer = csv.writer(csvfile, delimiter=self.delimiter)
-                header = list(fields.keys())
-                writer.writerow(header)
-                row = []
-                for _, hfield in enumerate(header):
-                    row.append(fields[hfield])
-                writer.writerow(row)
+                self.pupil_remote.send_string("r")
+                self.pupil_remote.recv_string()
+            except zmq.ZMQError:
+                print("Couldn't connect with Pupil Capture!")
 
+    def save_finished(self, filepath):
+        """
+        Called when the results writer completed writing the data.
+
+        Parameters
+        ----------
+        filepath : str
+            file/path the results were written to (differs from the results file if a backup was saved)
+        """
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            QApplication.restoreOverrideCursor()
+        results = database_path(self.filepath_results) if self.results_backend == "SQLite" else self.filepath_results
+        if self.journal is not None and filepath == results:  # after a backup the session still has to be resumable
+            self.journal.record("saved", time=datetime.datetime.now().isoformat())
+        self.filepath_results = filepath
         print("DONE")
-        self.saved = True
         if self.help_client is not None:
             self.help_client.send_message("/questionnaire_finished", "")
 
+    def save_timed_out(self):
+        """
+        Called when saving takes longer than SAVE_TIMEOUT, writing continues in the background.
+        """
+        QApplication.restoreOverrideCursor()
+        print("Saving the results takes longer than expected!")
+        if self.help_client is not None:
+            self.help_client.send_message("/save_timeout", "")
+
     def get_participant_number(self):
         """
-        Get the number for the next participant according to how many rows the csv-file already has.
+        Get the number for the next participant according to how many rows the csv-file already has, or from the database.\n
+        The number is cached per results file, the rows are only counted if the counter file next to it is outdated.
 
         Returns
         -------
         int
             continuous number for participant
         """
-        if os.path.exists(self.filepath_results):
-            with open(self.filepath_results, "r") as csvfile:
-                reader = csv.reader(csvfile)
-                participant_number = sum(1 for _ in reader)
-        else:
-            participant_number = 1
-        return participant_number
+        if self.participant_number is None or self.participant_number[0] != self.filepath_results:
+            if self.results_backend == "SQLite":
+                self.participant_number = (self.filepath_results, database_participant_number(database_path(self.filepath_results)))
+            else:
+                self.participant_number = (self.filepath_results, participant_number(self.filepath_results))
+        return self.participant_number[1]
 
-    def is_connected(self):
-        """Check the internet connection."""
-        if self.audio_ip is not None:
-            host = self.audio_ip
-            response = ping(host, timeout=TIMEOUT)
-            if response is None:
-                if self.help_client is not None:
-                    self.help_client.send_message("/connection_lost", "")
-                msg = QMessageBox()
-                msg.setWindowTitle(self.connection_lost_title)
-                msg.setSizeGripEnabled(True)
-                msg.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-                msg.setIcon(QMessageBox.Icon.Information)
-                msg.setText(self.connection_lost_text)
-                msg.exec()
-        if self.video_ip is not None:
-            host = self.video_ip
-            response = ping(host, timeout=TIMEOUT)
-            if response is None:
-                if self.help_client is not None:
-                    self.help_client.send_message("/connection_lost", "")
-                msg = QMessageBox()
-                msg.setWindowTitle(self.connection_lost_title)
-                msg.setSizeGripEnabled(True)
-                msg.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-                msg.setIcon(QMessageBox.Icon.Information)
-                msg.setText(self.connection_lost_text)
-                msg.exec()
-        if self.pupil_ip is not None:
-            host = self.pupil_ip
-            response = ping(host, timeout=TIMEOUT)
-            if response is None:
-                if self.help_client is not None:
-                    self.help_client.send_message("/connection_lost", "")
-                msg = QMessageBox()
-                msg.setWindowTitle(self.connection_lost_title)
-                msg.setSizeGripEnabled(True)
-                msg.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-                msg.setIcon(QMessageBox.Icon.Information)
-                msg.setText(self.connection_lost_text)
-                msg.exec()
+    def reserve_participant_number(self):
+        """
+        Reserve the number of this participant for the log, the journal and the order of the pages when the session starts,
+        so that sessions running at the same time on stations sharing the results file get different numbers.\n
+        If the results file is locked for too long, the number is only counted. The saved number is allocated by the writer.
+        """
+        try:
+            if self.results_backend == "SQLite":
+                number = database_reserve_participant(database_path(self.filepath_results))
+            else:
+                number = reserve_participant(self.filepath_results)
+        except PermissionError:
+            print("Could not reserve the participant number!")
+            return
+        self.participant_number = (self.filepath_results, number)
+
+    def connection_changed(self, name, up):
+        """
+        Called by the connection monitor when an endpoint got (un-)reachable.
 
+        Parameters
+        ----------
+        name : str
+            name of the endpoint, e.g. 'audio'
+        up : bool
+            True if the endpoint is reachable
+        """
+        if not up and name not in self.connections_lost:
+            self.connections_lost[name] = False
+            self.events.log("connection_lost", value=name)
+            if self.help_client is not None:
+                self.help_client.send_message("/connection_lost", "")
+        elif up and name in self.connections_lost:
+            self.connections_lost.pop(name)
+            self.events.log("connection_restored", value=name)
+
+    def is_connected(self):
+        """Check the connection to the devices, a lost connection is reported to the participant once."""
+        if self.connection_monitor is None:
+            return
+        if False in self.connections_lost.values():
+            for name in self.connections_lost:
+                self.connections_lost[name] = True
+            msg = QMessageBox()
+            msg.setWindowTitle(self.connection_lost_title)
+            msg.setSizeGripEnabled(True)
+            msg.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            msg.setIcon(QMessageBox.Icon.Information)
+            msg.setText(self.connection_lost_text)
+            msg.exec()
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-f', '--file', help='filename of the questionnaire file', required=True, type=str)
+    parser.add_argument('-r', '--resume', help='continue a crashed session from its journal, by default the last unsaved one', nargs='?', const=True, default=None)
+    parser.add_argument('-l', '--latency', help='print the latency of every started playback, e.g. to check the lab setup', action='store_true')
+    parser.add_argument('-m', '--migrate', help='add the columns of changed questions to the existing results file', action='store_true')
     args = parser.parse_args()
 
     app = QApplication(sys.argv)
-    ex = StackedWindowGui(args.file)
+    ex = StackedWindowGui(args.file, resume=args.resume, show_latency=args.latency, migrate=args.migrate)
     sys.exit(app.exec())
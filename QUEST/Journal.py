@@ -0,0 +1,148 @@
+"""
+Crash-safe journal of the answers of a session, used to resume the session after a crash.
+"""
+import glob
+import json
+import os
+import queue
+import threading
+from time import monotonic
+
+SYNC_INTERVAL = 0.2  # seconds records are collected before they are synced to disk together
+
+
+def load_journal(filepath):
+    """Read the state of a session from its journal.
+
+    Parameters
+    ----------
+    filepath : str
+        file/path of the journal
+
+    Returns
+    -------
+    dict or None
+        the session record extended by 'pages' (page index -> latest answers), 'current' (index of the current page)
+        and 'saved' (True if the results were saved), None if the journal has no session record
+    """
+    session = None
+    with open(filepath, 'r', encoding='utf_8', errors='replace') as journal_file:
+        for line in journal_file:
+            try:
+                record = json.loads(line)
+            except ValueError:  # a line may be incomplete after a crash
+                continue
+            if record["type"] == "session":
+                session = record
+                session["pages"] = {}
+                session["current"] = 0
+                session["saved"] = False
+            elif session is None:
+                continue
+            elif record["type"] == "page":
+                session["pages"][record["index"]] = record["answers"]
+                session["current"] = record["current"]
+            elif record["type"] == "saved":
+                session["saved"] = True
+    return session
+
+
+def latest_journal(folder):
+    """Find the journal of the last session which wasn't saved.
+
+    Parameters
+    ----------
+    folder : str
+        folder of the results file, the journals are stored there
+
+    Returns
+    -------
+    str or None
+        file/path of the journal, None if there is none
+    """
+    for path in sorted(glob.glob(os.path.join(folder, "journal_*.jsonl")), key=os.path.getmtime, reverse=True):
+        session = load_journal(path)
+        if session is not None and not session["saved"]:
+            return path
+    return None
+
+
+class Journal:
+    """
+    Append-only journal, every record is a JSON line.\n
+    Records are written by a background thread, which syncs everything that piled up within SYNC_INTERVAL at once,
+    so the GUI doesn't wait for the disk.
+    """
+
+    def __init__(self, filepath):
+        """
+        Parameters
+        ----------
+        filepath : str
+            file/path of the journal, an existing journal is continued
+        """
+        self.filepath = filepath
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def record(self, kind, **data):
+        """Append a record.
+
+        Parameters
+        ----------
+        kind : str
+            type of the record: 'session', 'page' or 'saved'
+        **data
+            content of the record, has to be serializable to JSON
+        """
+        data["type"] = kind
+        self.queue.put(data)
+
+    def run(self):
+        """Write and sync the records until the journal is closed."""
+        try:
+            os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+            broken = False
+            if os.path.isfile(self.filepath) and os.path.getsize(self.filepath) > 0:
+                with open(self.filepath, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    broken = f.read(1) != b"\n"  # the session crashed in the middle of a line
+            journal_file = open(self.filepath, 'a', encoding='utf_8')
+            if broken:
+                journal_file.write("\n")
+        except OSError:
+            print("Could not open the journal, the session can't be resumed after a crash!")
+            journal_file = None
+        closed = False
+        while not closed:
+            records = [self.queue.get()]
+            deadline = monotonic() + SYNC_INTERVAL
+            try:
+                while records[-1] is not None:  # collect the records of the sync interval
+                    records.append(self.queue.get(timeout=max(deadline - monotonic(), 0)))
+            except queue.Empty:
+                pass
+            closed = records[-1] is None
+            if journal_file is not None:
+                try:
+                    journal_file.writelines(json.dumps(record, default=str) + "\n" for record in records if record is not None)
+                    journal_file.flush()
+                    os.fsync(journal_file.fileno())
+                except OSError:
+                    print("Could not write the journal!")
+            for _ in records:
+                self.queue.task_done()
+        if journal_file is not None:
+            journal_file.close()
+
+    def flush(self):
+        """Block until all records are on disk."""
+        if self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """Write the remaining records and stop the writer thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
@@ -103,6 +103,17 @@ class LabeledSlider(QtWidgets.QWidget):
         """
         return self.sl.value()
 
+    def set_value(self, value):
+        """
+        Move the handle to a value of the range, e.g. to restore an answer.
+
+        Parameters
+        ----------
+        value : int or float
+            value in the range
+        """
+        self.sl.set_value(value)
+
     def get_moved(self):
         """ Return whether the slider has been touched by the user.
 
@@ -0,0 +1,174 @@
+"""
+Measures the latency from clicking a play button to the OSC commands leaving and Reaper confirming the playback.
+"""
+import json
+import os
+from time import monotonic_ns
+
+from PySide6.QtCore import QEvent, QObject
+
+MAX_CLICK_GAP = 500_000_000  # ns between the mouse release and the handler, older releases don't belong to the click
+PERCENTILES = [50, 95, 99]
+# name -> (start, end) stage of the measured intervals
+INTERVALS = {
+    "release_to_handler": ("release", "handler"),
+    "handler_to_first_datagram": ("handler", "first"),
+    "handler_to_last_datagram": ("handler", "last"),
+    "release_to_last_datagram": ("release", "last"),
+    "handler_to_feedback": ("handler", "feedback"),
+    "release_to_feedback": ("release", "feedback"),
+}
+
+
+def percentile(values, p):
+    """Nearest-rank percentile.
+
+    Parameters
+    ----------
+    values : list of int
+        sorted values
+    p : int
+        the percentile, 0 - 100
+
+    Returns
+    -------
+    int
+        the value below which p percent of the values lie
+    """
+    return values[max(0, -(-len(values) * p // 100) - 1)]
+
+
+def histogram(values):
+    """Count the values in buckets of powers of two microseconds.
+
+    Parameters
+    ----------
+    values : list of int
+        durations in ns
+
+    Returns
+    -------
+    dict
+        upper bound of the bucket in µs -> number of values
+    """
+    buckets = {}
+    for value in values:
+        bound = 1
+        while bound * 1000 < value:
+            bound *= 2
+        buckets[bound] = buckets.get(bound, 0) + 1
+    return dict(sorted(buckets.items()))
+
+
+class LatencyTracker(QObject):
+    """
+    Collects one sample per started playback with monotonic timestamps in ns of the stages:
+    release (mouse button released), handler (play handler entered), first/last (datagram sent to Reaper)
+    and feedback (Reaper reported /play 1).\n
+    Installed as event filter on the play buttons to see the mouse release.
+    """
+
+    def __init__(self, echo=False):
+        """
+        Parameters
+        ----------
+        echo : bool, default=False
+            if True, every sample is printed to the console, e.g. to check the setup in the lab
+        """
+        super().__init__()
+        self.echo = echo
+        self.samples = []
+        self.current = None
+        self.released = None
+
+    def eventFilter(self, watched, event):
+        """Note the time the mouse button was released over a play button."""
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            self.released = monotonic_ns()
+        return False
+
+    def watch(self, button):
+        """
+        Parameters
+        ----------
+        button : QPushButton
+            button starting a playback
+        """
+        button.installEventFilter(self)
+
+    def begin(self, element):
+        """Start a sample, called when the play handler is entered.
+
+        Parameters
+        ----------
+        element : str
+            id of the player
+        """
+        now = monotonic_ns()
+        self.finish()
+        released = self.released if self.released is not None and now - self.released < MAX_CLICK_GAP else None
+        self.released = None
+        self.current = {"element": element, "release": released, "handler": now, "first": None, "last": None, "feedback": None}
+
+    def sent(self):
+        """Note that a datagram was sent to Reaper."""
+        if self.current is not None and self.current["feedback"] is None:
+            now = monotonic_ns()
+            if self.current["first"] is None:
+                self.current["first"] = now
+            self.current["last"] = now
+
+    def feedback(self):
+        """Note that Reaper confirmed the playback, which completes the sample."""
+        if self.current is not None and self.current["last"] is not None:
+            self.current["feedback"] = monotonic_ns()
+            self.finish()
+
+    def finish(self):
+        """Store the current sample."""
+        if self.current is None:
+            return
+        sample, self.current = self.current, None
+        self.samples.append(sample)
+        if self.echo:
+            durations = [f'{name} {(sample[end] - sample[start]) / 1e6:.3f} ms' for name, (start, end) in INTERVALS.items()
+                         if sample[start] is not None and sample[end] is not None]
+            print(f'Latency {sample["element"]}: {", ".join(durations)}')
+
+    def summary(self):
+        """
+        Returns
+        -------
+        dict
+            interval name -> count, percentiles and maximum in µs and a histogram, for every measured interval
+        """
+        self.finish()
+        summary = {}
+        for name, (start, end) in INTERVALS.items():
+            values = sorted(sample[end] - sample[start] for sample in self.samples if sample[start] is not None and sample[end] is not None)
+            if len(values) == 0:
+                continue
+            summary[name] = {"count": len(values), **{f'p{p}': percentile(values, p) / 1000 for p in PERCENTILES},
+                             "max": values[-1] / 1000, "histogram_us": histogram(values)}
+        return summary
+
+    def save(self, filepath):
+        """Write the summary and the samples as JSON.
+
+        Parameters
+        ----------
+        filepath : str
+            file/path of the latency file
+        """
+        summary = self.summary()
+        if len(self.samples) == 0:
+            return
+        try:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            with open(filepath, 'w', encoding='utf_8') as latency_file:
+                json.dump({"summary": summary, "samples": self.samples}, latency_file, indent=1)
+        except OSError:
+            print("Could not save the latencies!")
+        if self.echo:
+            for name, stats in summary.items():
+                print(f'{name}: n={stats["count"]} ' + " ".join(f'p{p}={stats[f"p{p}"]:.0f} µs' for p in PERCENTILES))
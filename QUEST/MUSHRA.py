@@ -1,10 +1,11 @@
 """MUSHRA question unit"""
-import datetime
 from time import time
 
 from PySide6.QtCore import Qt, QSignalMapper, QTimer
 from PySide6.QtWidgets import QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QSlider, QSizePolicy
 
+from BundleClient import bundle
+from PlaybackProgram import PAUSE, PLAY, STOP, PlaybackProgram, encoded, locate
 from Slider import Slider
 
 
@@ -80,6 +81,11 @@ class MUSHRA(QWidget):
         self.id = qid
         self.start_cues = start_cues
         self.end_cues = end_cues
+        # messages positioning the cursor at a stimulus and restarting the playback there, [cue][looped]
+        self.locate_programs = [(locate(start_cue), locate(start_cue, end_cue, self.set_loop_end, self.set_loop_start))
+                                for start_cue, end_cue in zip(start_cues, end_cues)]
+        self.restart_programs = [tuple(PlaybackProgram((STOP,)) + program + (PLAY,) for program in programs) for programs in self.locate_programs]
+        self.play_on_stopped = encoded("/action", self.mushra_play_on_stopped)
         if isinstance(tracks, str) and ("[" not in tracks and "]" not in tracks and "," not in tracks):
             tracks = [int(tracks)]
         self.tracks = tracks
@@ -148,6 +154,7 @@ class MUSHRA(QWidget):
                 self.refbutton = QPushButton("Reference")
                 self.refbutton.setObjectName(self.objectName())
                 self.refbutton.clicked.connect(lambda: self.play(0, self.refbutton))
+                self.page.gui.latency.watch(self.refbutton)
                 self.refbutton.clicked.connect(lambda: self.__click_animation(self.refbutton))
                 labels.addWidget(self.refbutton)
                 h.addItem(labels)
@@ -169,6 +176,7 @@ class MUSHRA(QWidget):
                 start_button.setObjectName(self.objectName())
                 self.buttons.append(start_button)
                 start_button.clicked.connect(mapper.map)
+                self.page.gui.latency.watch(start_button)
                 start_button.clicked.connect(lambda: self.__click_animation(start_button))
                 mapper.setMapping(start_button, m)
                 sliderlayout = QVBoxLayout()
@@ -187,7 +195,7 @@ class MUSHRA(QWidget):
         self.loop_button.setCheckable(True)
         self.loop_button.clicked.connect(self.loop)
         if self.audio_client is not None:
-            self.audio_client.send_message("/action", self.loop_off_command)
+            self.audio_client.send(encoded("/action", self.loop_off_command))
         self.pause_button = QPushButton("Pause", None)
         self.pause_button.setEnabled(False)
         self.pause_button.setObjectName(self.objectName())
@@ -222,35 +230,39 @@ class MUSHRA(QWidget):
 
     def fade(self):
         """Handle cross-fade."""
-        if self.xfade.isChecked():
-            self.xfade_in_use = True
-            if not self.looped and self.playing:
-                self.loop_button.setDisabled(True)
-                self.audio_client.send_message("/action", self.loop_off_command)
-        else:
-            self.xfade_in_use = False
-            if not self.loop_button.isEnabled():
-                self.loop_button.setEnabled(True)
-            if self.playing:
-                self.audio_client.send_message("/action", self.unsolo_all)
-                for i in range(1, self.audio_tracks + 1):
-                    if len(self.tracks) < len(self.buttons) + 1:  # only one track
-                        if i in self.tracks:  # single track
-                            self.audio_client.send_message(f'/track/{i}/mute', 0)
-                        else:
-                            self.audio_client.send_message(f'/track/{i}/mute', 1)
-                    elif (len(self.tracks) == len(self.buttons) + 1) and (
-                            not isinstance(self.tracks[self.last_sender], list)):  # 1 track per button
-                        if i == self.tracks[self.last_sender]:
-                            self.audio_client.send_message(f'/track/{i}/mute', 0)
-                        else:
-                            self.audio_client.send_message(f'/track/{i}/mute', 1)
-                    elif (len(self.tracks) == len(self.buttons) + 1) and (
-                            not isinstance(self.tracks[self.last_sender], list)):  # more than one track per stimulus
-                        if i in self.tracks[self.last_sender]:
-                            self.audio_client.send_message(f'/track/{i}/mute', 0)
-                        else:
-                            self.audio_client.send_message(f'/track/{i}/mute', 1)
+        with bundle(self.audio_client):
+            if self.xfade.isChecked():
+                self.xfade_in_use = True
+                if not self.looped and self.playing:
+                    self.loop_button.setDisabled(True)
+                    self.audio_client.send(encoded("/action", self.loop_off_command))
+            else:
+                self.xfade_in_use = False
+                if not self.loop_button.isEnabled():
+                    self.loop_button.setEnabled(True)
+                if self.playing:
+                    self.audio_client.send(encoded("/action", self.unsolo_all))
+                    self.page.gui.reaper.unmute_only(self.audio_client, self.stimulus_tracks(self.last_sender), self.audio_tracks)
+
+    def stimulus_tracks(self, sender):
+        """
+            Parameters
+            ----------
+            sender : int
+                index of the stimulus, 0 is the reference
+
+            Returns
+            -------
+            set of int
+                the tracks which are audible for the stimulus
+        """
+        if isinstance(self.tracks, int):
+            return {self.tracks}
+        if len(self.tracks) < len(self.buttons) + 1:  # the same tracks for all stimuli
+            return {int(t) for t in self.tracks}
+        if isinstance(self.tracks[sender], list):  # more than one track per stimulus
+            return {int(t) for t in self.tracks[sender]}
+        return {int(self.tracks[sender])}
 
     def update_label(self):
         """Update the label above the slider that indicates the handle position, when the handle was moved."""
@@ -274,29 +286,29 @@ class MUSHRA(QWidget):
         self.looped = not self.looped
         if self.looped:
             self.loop_button.setChecked(True)
-            self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Loop on {self.id}'
-            self.audio_client.send_message("/action", self.loop_on_command)
+            self.page.log_event("loop_on", self.id)
+            self.audio_client.send(encoded("/action", self.loop_on_command))
         else:
             self.loop_button.setChecked(False)
-            self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Loop off {self.id}'
-            self.audio_client.send_message("/action", self.loop_off_command)
+            self.page.log_event("loop_off", self.id)
+            self.audio_client.send(encoded("/action", self.loop_off_command))
 
     def pause(self):
         """Pause the current playback and resume at that position of the playback."""
         if self.playing:
             self.playing = False
             self.paused = True
-            self.audio_client.send_message("/pause", 1)
+            self.audio_client.send(PAUSE)
             self.pause_button.setChecked(True)
-            self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Paused MUSHRA-player {self.id}'
+            self.page.log_event("mushra_paused", self.id)
             self.end = time()
             self.duration[self.current].append(self.end - self.start)
         else:
             self.playing = True
             self.paused = False
-            self.audio_client.send_message("/pause", 1)
+            self.audio_client.send(PAUSE)
             self.pause_button.setChecked(False)
-            self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Unpaused MUSHRA-player {self.id}'
+            self.page.log_event("mushra_unpaused", self.id)
             self.start = time()
             self.end = 0
 
@@ -311,115 +323,54 @@ class MUSHRA(QWidget):
             btn: QPushButton, default=None
                 button which initiated play
         """
+        self.page.gui.latency.begin(f'{self.id}_{cue}')
         if self.audio_tracks != self.page.gui.audio_tracks:
             self.audio_tracks = self.page.gui.audio_tracks
-        for player in self.page.players:
-            if player.playing and (not player == self and not self.conditionsUseSameMarker or (self.conditionsUseSameMarker and not self.xfade.isChecked())):
-                player.stop()
-        self.pause_button.setEnabled(True)
-        self.pause_button.setChecked(False)
-        self.stop_button.setEnabled(True)
-
-        if self.paused and self.current == cue:
-            # print("pause")
-            self.audio_client.send_message("/pause", 1)
-            self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Unpaused Player {self.id}'
-        else:
-            if btn != self.refbutton:
-                if self.sender().sender() in self.buttons:
-                    for s, sli in enumerate(self.sliders):
-                        if s != self.buttons.index(self.sender().sender()):
-                            sli.setEnabled(False)
-                        else:
-                            sli.setEnabled(True)
-
-                sender = 0 if self.sender().sender() not in self.buttons else self.buttons.index(self.sender().sender()) + 1
-            else:
-                sender = 0
+        with bundle(self.audio_client):  # switch tracks and position at once
+            for player in self.page.players:
+                if player.playing and (not player == self and not self.conditionsUseSameMarker or (self.conditionsUseSameMarker and not self.xfade.isChecked())):
+                    player.stop()
+            self.pause_button.setEnabled(True)
+            self.pause_button.setChecked(False)
+            self.stop_button.setEnabled(True)
 
-            self.audio_client.send_message("/action", 40297)  # unselect all
-            if isinstance(self.tracks, list) and len(self.tracks) == len(self.buttons) + 1 and isinstance(self.tracks[sender], list):
-                for t in self.tracks[sender]:
-                    self.audio_client.send_message(f'/track/{t}/select', 1)  # add t to selection
-            self.audio_client.send_message("/action", 40341)  # mute all
-            if isinstance(self.tracks, int):
-                self.audio_client.send_message(f'/track/{self.tracks}/mute', 0)
-            elif isinstance(self.tracks, list) and len(self.tracks) < len(self.buttons) + 1:
-                for t in self.tracks:
-                    self.audio_client.send_message(f'/track/{t}/select', 1)  # add t to selection
-                self.audio_client.send_message("/action", 40280)  # toggle mute for selected tracks
-            elif isinstance(self.tracks[sender], int):
-                self.audio_client.send_message(f'/track/{self.tracks[sender]}/mute', 0)
+            if self.paused and self.current == cue:
+                # print("pause")
+                self.audio_client.send(PAUSE)
+                self.page.log_event("player_unpaused", self.id)
             else:
-                self.audio_client.send_message("/action", 40280)  # toggle mute for selected tracks
+                if btn != self.refbutton:
+                    if self.sender().sender() in self.buttons:
+                        for s, sli in enumerate(self.sliders):
+                            if s != self.buttons.index(self.sender().sender()):
+                                sli.setEnabled(False)
+                            else:
+                                sli.setEnabled(True)
 
-            if self.conditionsUseSameMarker and self.xfade.isChecked() and not self.looped:
-                self.loop_button.setDisabled(True)
-                self.audio_client.send_message("/action", self.loop_off_command)
-            if not self.conditionsUseSameMarker or (self.conditionsUseSameMarker and not self.xfade.isChecked()):
-                if not self.loop_button.isEnabled():
-                    self.loop_button.setEnabled(True)
-                self.audio_client.send_message("/stop", 1)
-                if self.looped:
-                    if int(self.end_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.end_cues[cue]))  # goto cue
-                    elif int(self.end_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.end_cues[cue]))  # goto cue
-                    self.audio_client.send_message("/action", self.set_loop_end)  # end of loop
-                    if int(self.start_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.start_cues[cue]))  # goto cue
-                    elif int(self.start_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.start_cues[cue]))  # goto cue
-                    self.audio_client.send_message("/action", self.set_loop_start)  # start of loop
-                else:
-                    if int(self.start_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.start_cues[cue]))  # goto cue
-                    elif int(self.start_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.start_cues[cue]))  # goto cue
-                self.audio_client.send_message("/play", 1)
-            if self.conditionsUseSameMarker and self.xfade.isChecked() and not self.playing and not self.paused:
-                if self.looped:
-                    if int(self.end_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.end_cues[cue]))  # goto cue
-                    elif int(self.end_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.end_cues[cue]))  # goto cue
-                    self.audio_client.send_message("/action", self.set_loop_end)  # end of loop
-                    if int(self.start_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.start_cues[cue]))  # goto cue
-                    elif int(self.start_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.start_cues[cue]))  # goto cue
-                    self.audio_client.send_message("/action", self.set_loop_start)  # start of loop
+                    sender = 0 if self.sender().sender() not in self.buttons else self.buttons.index(self.sender().sender()) + 1
                 else:
-                    if int(self.start_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.start_cues[cue]))  # goto cue
-                    elif int(self.start_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.start_cues[cue]))  # goto cue
+                    sender = 0
+
+                self.page.gui.reaper.unmute_only(self.audio_client, self.stimulus_tracks(sender), self.audio_tracks, mute_all=True)
+
+                if self.conditionsUseSameMarker and self.xfade.isChecked() and not self.looped:
+                    self.loop_button.setDisabled(True)
+                    self.audio_client.send(encoded("/action", self.loop_off_command))
+                if not self.conditionsUseSameMarker or (self.conditionsUseSameMarker and not self.xfade.isChecked()):
+                    if not self.loop_button.isEnabled():
+                        self.loop_button.setEnabled(True)
+                    self.restart_programs[cue][self.looped].send(self.audio_client)
+                if self.conditionsUseSameMarker and self.xfade.isChecked() and not self.playing and not self.paused:
+                    self.locate_programs[cue][self.looped].send(self.audio_client)
 
-            if self.conditionsUseSameMarker and self.xfade.isChecked() and not self.paused:
-                if not self.playing:
-                    if int(self.start_cues[cue]) < 10:
-                        self.audio_client.send_message("/action", 40160 + int(self.start_cues[cue]))  # goto cue
-                    elif int(self.start_cues[cue]) == 10:
-                        self.audio_client.send_message("/action", 40160)  # goto cue
-                    else:
-                        self.audio_client.send_message("/action", 41240 + int(self.start_cues[cue]))  # goto cue
-                self.audio_client.send_message("/action", self.mushra_play_on_stopped)
-            elif self.conditionsUseSameMarker and self.xfade.isChecked() and self.paused:
-                self.audio_client.send_message("/pause", 1)
-                self.paused = False
-            self.last_sender = sender
+                if self.conditionsUseSameMarker and self.xfade.isChecked() and not self.paused:
+                    if not self.playing:
+                        self.locate_programs[cue][False].send(self.audio_client)
+                    self.audio_client.send(self.play_on_stopped)
+                elif self.conditionsUseSameMarker and self.xfade.isChecked() and self.paused:
+                    self.audio_client.send(PAUSE)
+                    self.paused = False
+                self.last_sender = sender
         if (self.start != 0) and self.playing:
             self.end = time()
             self.duration[self.current].append(self.end - self.start)
@@ -429,13 +380,13 @@ class MUSHRA(QWidget):
         self.playing = True
         self.paused = False
         self.loop_button.setDisabled(True)
-        self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - (Re-)Started MUSHRA-player for cue {self.start_cues[cue]} {self.id}_{str(cue)}'
+        self.page.log_event("mushra_started", f'{self.id}_{str(cue)}', self.start_cues[cue])
 
     def stop(self):
         """
             Stop the playback, calculate the time it played.
         """
-        self.audio_client.send_message("/stop", 1)
+        self.audio_client.send(STOP)
         if self.playing:
             self.end = time()
             self.duration[self.current].append(self.end - self.start)
@@ -447,4 +398,4 @@ class MUSHRA(QWidget):
         self.stop_button.setEnabled(False)
         self.pause_button.setEnabled(False)
         self.pause_button.setChecked(False)
-        self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Stopped MUSHRA playback {self.id}'
+        self.page.log_event("mushra_stopped", self.id)
@@ -1,8 +1,6 @@
 """
 This class creates a button with additional functionality to interact by sending an OSC command.
 """
-import datetime
-from ping3 import ping
 from pythonosc import udp_client
 
 from PySide6.QtCore import QTimer
@@ -10,7 +8,6 @@ from PySide6.QtGui import QDoubleValidator
 from PySide6.QtWidgets import QPushButton, QWidget, QHBoxLayout, QMessageBox, QSizePolicy, QLineEdit, QPlainTextEdit
 
 from PasswordEntry import PasswordEntry
-TIMEOUT = 1
 
 
 class OSCButton(QWidget):
@@ -44,20 +41,15 @@ class OSCButton(QWidget):
         self.address = address
         self.value = value
         if self.value.startswith("id:"):
-            var = self.value[2:].strip(' :')
-            skip = False
-            for s in range(0, self.page.gui.count()):
-                if not skip and self.page.gui.widget(s).evaluationvars is not None and \
-                        var in self.page.gui.widget(s).evaluationvars:
-                    self.value = self.page.gui.widget(s).evaluationvars[var]
-                    if isinstance(self.value, (QLineEdit, PasswordEntry)):
-                        if isinstance(self.value.validator(), QDoubleValidator):
-                            self.value.setText(self.value.text().replace(",", "."))
-                        self.value = self.value.text()
-                    elif isinstance(self.value, QPlainTextEdit):
-                        self.value = self.value.toPlainText().replace("\n", " ")
-                if not skip and self.page.gui.widget(s) == self.page:
-                    skip = True
+            answer = self.page.gui.answer_of(self.value, self.page)
+            if answer is not None:
+                self.value = answer
+                if isinstance(self.value, (QLineEdit, PasswordEntry)):
+                    if isinstance(self.value.validator(), QDoubleValidator):
+                        self.value.setText(self.value.text().replace(",", "."))
+                    self.value = self.value.text()
+                elif isinstance(self.value, QPlainTextEdit):
+                    self.value = self.value.toPlainText().replace("\n", " ")
 
         try:  # try to send float if possible
             self.value = float(self.value)
@@ -78,8 +70,7 @@ class OSCButton(QWidget):
             self.osc_client = self.page.gui.global_osc_client
         else:
             self.osc_client = udp_client.SimpleUDPClient(receiver[0], int(receiver[1]))
-        response = ping(receiver[0], timeout=TIMEOUT)
-        if response is None:
+        if not self.page.gui.probe_cache.reachable(receiver[0]):  # pinged once per host at startup
             msg = QMessageBox()
             msg.setWindowTitle(self.page.gui.connection_lost_title)
             msg.setSizeGripEnabled(True)
@@ -120,4 +111,4 @@ class OSCButton(QWidget):
 
     def log(self):
         """Log Action"""
-        self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Pressed OSC-Button {self.id}'
+        self.page.log_event("pressed_osc", self.id)
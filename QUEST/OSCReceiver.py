@@ -0,0 +1,118 @@
+"""
+Receives OSC messages inside the Qt event loop, so their handlers run in the GUI thread.
+"""
+import re
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QHostAddress, QUdpSocket
+
+BUNDLE = b"#bundle\0"
+
+
+def address_filter(addresses):
+    """Compile OSC addresses into a check on the raw address of a datagram.
+
+    Parameters
+    ----------
+    addresses : list of str
+        accepted addresses, '*' matches one part of the address, e.g. '/track/*/mute'
+
+    Returns
+    -------
+    function
+        called with the address as bytes, returns True if it is accepted
+    """
+    exact = {address.encode() for address in addresses if "*" not in address}
+    patterns = [re.escape(address).replace(r"\*", "[^/]*") for address in addresses if "*" in address]
+    if len(patterns) == 0:
+        return exact.__contains__
+    pattern = re.compile("|".join(patterns).encode())
+    return lambda address: address in exact or pattern.fullmatch(address) is not None
+
+
+class OSCReceiver(QObject):
+    """
+    UDP socket which is read by the Qt event loop whenever a datagram arrives.\n
+    The handlers of the dispatcher run in the GUI thread, so they may change widgets directly.
+    If only some addresses are of interest, all other messages are dropped by their raw address
+    before their arguments are parsed. Bundles are unpacked and their messages handled immediately.
+    """
+    activity = Signal()
+
+    def __init__(self, ip, port, dispatcher, parent=None, addresses=None):
+        """
+        Parameters
+        ----------
+        ip : str
+            IP address to listen on
+        port : int
+            port to listen on
+        dispatcher : pythonosc.dispatcher.Dispatcher
+            maps the OSC addresses to their handlers
+        parent : QObject, optional
+            parent of the receiver
+        addresses : list of str, optional
+            only messages to these addresses are dispatched, see address_filter(), default is all
+        """
+        super().__init__(parent)
+        self.dispatcher = dispatcher
+        self.accepts = address_filter(addresses) if addresses is not None else None
+        self.received = 0
+        self.dropped = 0
+        self.socket = QUdpSocket(self)
+        self.socket.readyRead.connect(self.read_datagrams)
+        if not self.socket.bind(QHostAddress(ip), port):
+            print(f"Could not listen on {ip}:{port}: {self.socket.errorString()}")
+
+    def is_bound(self):
+        """
+        Returns
+        -------
+        bool
+            True if the socket is listening
+        """
+        return self.socket.state() == QUdpSocket.SocketState.BoundState
+
+    def read_datagrams(self):
+        """Dispatch the accepted messages of all pending datagrams in order."""
+        read = False
+        while self.socket.hasPendingDatagrams():
+            datagram = self.socket.receiveDatagram()
+            if not datagram.isValid():
+                break
+            read = True
+            sender = (datagram.senderAddress().toString(), datagram.senderPort())
+            for message in self.accepted_messages(bytes(datagram.data().data())):
+                self.dispatcher.call_handlers_for_packet(message, sender)
+        if read:
+            self.activity.emit()
+
+    def accepted_messages(self, data):
+        """Split a datagram into its messages and filter them by address.
+
+        Parameters
+        ----------
+        data : bytes
+            the datagram, a message or a (nested) bundle
+
+        Yields
+        ------
+        bytes
+            the accepted messages
+        """
+        if data.startswith(BUNDLE):
+            index = len(BUNDLE) + 8  # skip the time tag
+            while index + 4 <= len(data):
+                size = int.from_bytes(data[index:index + 4], "big")
+                yield from self.accepted_messages(data[index + 4:index + 4 + size])
+                index += 4 + size
+            return
+        self.received += 1
+        if self.accepts is None or self.accepts(data[:data.find(b"\0")]):
+            yield data
+        else:
+            self.dropped += 1
+
+    def close(self):
+        """Stop listening."""
+        self.socket.close()
@@ -1,7 +1,6 @@
 """
 Creates a structured page.
 """
-import datetime
 
 from PySide6.QtCore import QSignalMapper, Qt
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QButtonGroup, QCheckBox, QLineEdit, QPlainTextEdit, \
@@ -20,6 +19,7 @@ from PasswordEntry import PasswordEntry
 from Player import Player
 from PupilCoreButton import Button
 from RadioMatrix import RadioMatrix
+from RequiredTracker import RequiredTracker
 
 
 class Page(QWidget):
@@ -48,7 +48,7 @@ class Page(QWidget):
         self.evaluationvars = {}
         self.players = []
         self.required = {}
-        self.page_log = ""
+        self.password_entries = []
         self.image_position = None
         self.image = None
         self.outer_layout = None
@@ -181,6 +181,7 @@ class Page(QWidget):
                 lbl = QLabel(structure[quest]["text"])
                 layout.addRow(lbl, pw)
                 self.evaluationvars[structure[quest]["id"]] = pw
+                self.password_entries.append(pw)
                 self.required[structure[quest]["id"]] = [("required" in structure[quest].keys()) and (structure[quest].as_bool("required")), lbl]
             elif structure[quest]["type"] == "Slider":
                 ans_layout, slider = mas(structure[quest].as_bool("labelled"), structure[quest]["id"],
@@ -290,6 +291,9 @@ class Page(QWidget):
                             player_found = True
         layout.setLabelAlignment(Qt.AlignmentFlag.AlignVCenter)
         layout.setRowWrapPolicy(QFormLayout.RowWrapPolicy.WrapLongRows)  # automatic line breaks in text
+        self.gui.register_answers(self)
+        self.required_tracker = RequiredTracker(self)
+        self.required_tracker.completed.connect(lambda complete: self.gui.required_changed(self, complete))
 
     def log(self, qid, sender):
         """Log changes
@@ -303,15 +307,29 @@ class Page(QWidget):
         """
         # print("Log raised", qid, type(sender))
         if isinstance(sender, (QLineEdit, PasswordEntry)):
-            self.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Changed {qid} to {sender.text()}'
+            self.log_event("changed", qid, sender.text())
         elif isinstance(sender, QPlainTextEdit):
-            self.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Changed {qid} to {sender.toPlainText()}'
+            self.log_event("changed", qid, sender.toPlainText())
         elif isinstance(sender, QButtonGroup):
-            self.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Changed {qid} to {sender.checkedId()}'
+            self.log_event("changed", qid, sender.checkedId())
         elif isinstance(sender, QSignalMapper) and isinstance(sender, QCheckBox):  # QCheckBox
-            self.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Changed {qid} to {sender.isChecked()}'
+            self.log_event("changed", qid, sender.isChecked())
         else:  # Slider
-            self.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Changed {qid} to {sender.value()}'
+            self.log_event("changed", qid, sender.value())
+
+    def log_event(self, kind, element, value=None):
+        """Log an event of an element on this page.
+
+        Parameters
+        ----------
+        kind : str
+            type of the event, see EventLog.TEMPLATES
+        element : str
+            id of the element that raised the event
+        value : optional
+            value of the event, e.g. the new answer
+        """
+        self.gui.events.log(kind, element, value, page=self.id)
 
     def get_key(self, val):
         """ function to return key for any value
@@ -326,7 +344,10 @@ class Page(QWidget):
         str
             key or "key doesn't exist"
         """
-        for key, value in self.evaluationvars.items():
+        key = self.gui.answer_keys.get(id(val))
+        if key is not None and self.evaluationvars.get(key) is val:
+            return key
+        for key, value in self.evaluationvars.items():  # values set after the page was built, e.g. OSC messages
             if val == value:
                 return key
 
@@ -341,3 +362,23 @@ class Page(QWidget):
             message to set
         """
         self.evaluationvars[f'OSCMessage_{self.id}'] = val
+
+
+class PagePlaceholder(QWidget):
+    """Lightweight stand-in for a page that is built the first time it is needed."""
+
+    def __init__(self, structure, pid, parent=None):
+        """
+
+        Parameters
+        ----------
+        structure : ConfigObj
+            questionnaire structure of the page
+        pid : str
+            name of the page
+        parent : QObject, optional
+             widget/layout this widget is embedded in
+        """
+        QWidget.__init__(self, parent=parent)
+        self.structure = structure
+        self.id = pid
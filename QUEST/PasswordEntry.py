@@ -4,6 +4,8 @@ from PySide6.QtCore import QRegularExpression, QLocale
 from PySide6.QtGui import QIntValidator, QDoubleValidator, QRegularExpressionValidator
 from PySide6.QtWidgets import QLineEdit
 
+from highlight import set_required
+
 
 class PasswordEntry(QLineEdit):
     """A textfield of which the entry gets validated against a list of possible entries
@@ -60,12 +62,12 @@ class PasswordEntry(QLineEdit):
         """Check if the user-given string is in the list of valid passwords."""
         if (len(self.text()) > 0) and (len(self.passwords) > 0) and (not self.text() in self.passwords):
             self.setToolTip("Invalid password.")
-            self.setObjectName("required")
+            set_required(self, True)
             return False
         if (len(self.text()) == 0) and (len(self.passwords) > 0) and (not self.text() in self.passwords):
             return False
         if (len(self.text()) == 0) and (len(self.passwords) > 0) and ('' in self.passwords):
             return True
         self.setToolTip("")
-        self.setObjectName(self.name if self.name is not None else "")
+        set_required(self, False)
         return True
@@ -0,0 +1,114 @@
+"""
+Playback commands for Reaper, encoded once when the page is built instead of on every click.
+"""
+from functools import lru_cache
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from BundleClient import bundle
+
+
+@lru_cache(maxsize=None)
+def encoded(address, value):
+    """Encode an OSC message once, identical messages share the datagram.
+
+    Parameters
+    ----------
+    address : str
+        OSC address of the message
+    value : int or float or str
+        the argument of the message
+
+    Returns
+    -------
+    OscMessage
+        the encoded message
+    """
+    builder = OscMessageBuilder(address=address)
+    builder.add_arg(value)
+    return builder.build()
+
+
+def goto_cue(cue):
+    """
+    Parameters
+    ----------
+    cue : int or str
+        number of the marker in Reaper
+
+    Returns
+    -------
+    int
+        ID of the Reaper action moving the cursor to the marker
+    """
+    cue = int(cue)
+    if cue < 10:
+        return 40160 + cue
+    elif cue == 10:
+        return 40160
+    return 41240 + cue
+
+
+STOP = encoded("/stop", 1)
+PLAY = encoded("/play", 1)
+PAUSE = encoded("/pause", 1)  # toggles pause in Reaper
+
+
+class PlaybackProgram(tuple):
+    """
+    Immutable sequence of encoded OSC messages, sent as one bundle if the client supports it.
+    """
+
+    def __new__(cls, messages=()):
+        """
+        Parameters
+        ----------
+        messages : iterable of OscMessage or tuple
+            the messages, tuples of address and value are encoded
+        """
+        return super().__new__(cls, (message if not isinstance(message, tuple) else encoded(*message) for message in messages))
+
+    def __add__(self, other):
+        return PlaybackProgram(tuple(self) + tuple(other))
+
+    def send(self, client):
+        """Send the messages.
+
+        Parameters
+        ----------
+        client : SimpleUDPClient or None
+            client sending to Reaper, nothing is sent if None
+        """
+        if client is None:
+            return
+        with bundle(client):
+            for message in self:
+                client.send(message)
+
+
+def locate(start_cue, end_cue=None, loop_end=None, loop_start=None):
+    """Create the program moving the cursor to a stimulus.
+
+    Parameters
+    ----------
+    start_cue : int or str
+        marker the stimulus starts at
+    end_cue : int or str, optional
+        marker the stimulus ends at, only needed to set a loop
+    loop_end : int, optional
+        ID of the action setting the end of the loop to the cursor
+    loop_start : int, optional
+        ID of the action setting the start of the loop to the cursor
+
+    Returns
+    -------
+    PlaybackProgram
+        the cursor is moved to the start, after setting the loop if end_cue is given
+    """
+    messages = []
+    if end_cue is not None:
+        messages += [("/action", goto_cue(end_cue)), ("/action", loop_end)]
+    messages.append(("/action", goto_cue(start_cue)))
+    if end_cue is not None:
+        messages.append(("/action", loop_start))
+    return PlaybackProgram(messages)
@@ -1,12 +1,13 @@
 """
 Audio/Video Player Control
 """
-import datetime
 from time import time
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import QWidget, QPushButton, QHBoxLayout, QStyle, QFormLayout
 
+from BundleClient import bundle
+from PlaybackProgram import PAUSE, PLAY, STOP, locate
 from PupilCoreButton import Button
 from tools import player_buttons
 from Video import madmapper, vlc
@@ -14,6 +15,7 @@ from Video import madmapper, vlc
 
 class Player(QWidget):
     """Multi-Media player unit."""
+    started = Signal()  # the playback was started
 
     def __init__(self, start_cue, track, qid, video=None, parent=None, end_cue=None,
                  displayed_buttons=player_buttons, icons=False, pupil=None, objectname=None, timer=None,
@@ -80,7 +82,6 @@ class Player(QWidget):
         else:
             self.name = None
         self.id = qid
-        self.start_cue = start_cue
         self.end_cue = end_cue
         if timer is not None:
             self.countdown = int(timer)
@@ -97,7 +98,7 @@ class Player(QWidget):
         else:
             for _, tra in enumerate(track):
                 tra = int(tra)
-        self.track = track
+        self.set_stimulus(start_cue, track)
         if self.audio_tracks < max(self.track):
             self.audio_tracks = max(self.track)
             self.gui.audio_tracks = max(self.track)
@@ -114,6 +115,7 @@ class Player(QWidget):
                 self.play_button.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
             self.play_button.setEnabled(True)
             self.play_button.clicked.connect(self.play)
+            self.gui.latency.watch(self.play_button)
             self.play_button.clicked.connect(lambda: self.__click_animation(self.play_button))
             self.play_button.setObjectName(self.objectName())
             layout.addWidget(self.play_button)
@@ -144,68 +146,59 @@ class Player(QWidget):
 
     def play(self):
         """Start the playback of audio (and video) of the stimulus."""
-        previous_start = None
-        for player in (self.page.players if str(type(self.page)) == "<class 'Page.Page'>" else self.parent().parent().players):
-            if player.playing and not player == self:
-                if self.crossfade and player.crossfade:
-                    previous_start = player.start_cue
-                    self.start = player.start
-                    player.stop_button.setEnabled(False)
-                    player.playing = False
-                    if self.video != player.video:
-                        # TODO how to handle video during crossfade
+        self.gui.latency.begin(self.id)
+        with bundle(self.audio_client):  # switch tracks and position at once
+            previous_start = None
+            for player in (self.page.players if str(type(self.page)) == "<class 'Page.Page'>" else self.parent().parent().players):
+                if player.playing and not player == self:
+                    if self.crossfade and player.crossfade:
+                        previous_start = player.start_cue
+                        self.start = player.start
+                        player.stop_button.setEnabled(False)
+                        player.playing = False
+                        if self.video != player.video:
+                            # TODO how to handle video during crossfade
+                            if (self.video is not None) and (self.video_client is not None):
+                                self.video_client.send_message(self.video_player["stop"][0], self.video_player["stop"][1])
+                    else:
+                        player.stop()
                         if (self.video is not None) and (self.video_client is not None):
                             self.video_client.send_message(self.video_player["stop"][0], self.video_player["stop"][1])
-                else:
-                    player.stop()
-                    if (self.video is not None) and (self.video_client is not None):
-                        self.video_client.send_message(self.video_player["stop"][0], self.video_player["stop"][1])
-        if "Stop" in self.buttons:
-            self.stop_button.setEnabled(True)
-        if "Pause" in self.buttons:
-            self.pause_button.setEnabled(True)
-            self.pause_button.setChecked(False)
+            if "Stop" in self.buttons:
+                self.stop_button.setEnabled(True)
+            if "Pause" in self.buttons:
+                self.pause_button.setEnabled(True)
+                self.pause_button.setChecked(False)
 
-        if self.paused:
-            self.audio_client.send_message("/pause", 1)
-            if (self.video is not None) and (self.video_client is not None):
-                self.video_client.send_message(self.video_player["unpause"][0], self.video_player["unpause"][1])
-            self.pause_button.setChecked(False)
-            if str(type(self.page)) == "<class 'Page.Page'>":
-                self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Unpaused Player {self.id}'
-            else:
-                self.gui.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Unpaused Player {self.id}'
-        else:
-            if self.audio_tracks != self.gui.audio_tracks:
-                self.audio_tracks = self.gui.audio_tracks
-            for i in range(1, self.audio_tracks + 1):
-                if i in self.track:
-                    self.audio_client.send_message(f'/track/{i}/mute', 0)
-                else:
-                    self.audio_client.send_message(f'/track/{i}/mute', 1)
-            if not self.crossfade or (self.crossfade and self.start_cue != previous_start):
-                if int(self.start_cue) < 10:
-                    self.audio_client.send_message("/action", 40160 + int(self.start_cue))  # goto cue
-                elif int(self.start_cue) == 10:
-                    self.audio_client.send_message("/action", 40160)  # goto cue
+            if self.paused:
+                self.audio_client.send(PAUSE)
+                if (self.video is not None) and (self.video_client is not None):
+                    self.video_client.send_message(self.video_player["unpause"][0], self.video_player["unpause"][1])
+                self.pause_button.setChecked(False)
+                if str(type(self.page)) == "<class 'Page.Page'>":
+                    self.page.log_event("player_unpaused", self.id)
                 else:
-                    self.audio_client.send_message("/action", 41240 + int(self.start_cue))  # goto cue
-                self.gui.stop_initiated = True
-                self.audio_client.send_message("/stop", 1)
-                self.audio_client.send_message("/play", 1)
-            elif self.crossfade and self.start_cue == previous_start and self.gui.global_play_state == "STOP":
-                self.audio_client.send_message("/play", 1)
-            if (self.video is not None) and (self.video_client is not None):
-                if "select" in self.video_player:
-                    self.video_client.send_message(self.video_player["reset"][0], self.video_player["reset"][1])
-                    self.video_client.send_message(self.video_player["select"][0].format(self.video), self.video_player["select"][1])
-                    self.video_client.send_message(self.video_player["play"][0], self.video_player["play"][1])
-                else:
-                    self.video_client.send_message(self.video_player["play"][0], self.video_player["play"][1].format(self.video))
-            if str(type(self.page)) == "<class 'Page.Page'>":
-                self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - (Re-)Started Player {self.id}'
+                    self.gui.events.log("player_unpaused", self.id)
             else:
-                self.gui.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - (Re-)Started Player {self.id}'
+                if self.audio_tracks != self.gui.audio_tracks:
+                    self.audio_tracks = self.gui.audio_tracks
+                self.gui.reaper.unmute_only(self.audio_client, self.audible, self.audio_tracks)
+                if not self.crossfade or (self.crossfade and self.start_cue != previous_start):
+                    self.gui.stop_initiated = True
+                    self.restart.send(self.audio_client)
+                elif self.crossfade and self.start_cue == previous_start and self.gui.global_play_state == "STOP":
+                    self.audio_client.send(PLAY)
+                if (self.video is not None) and (self.video_client is not None):
+                    if "select" in self.video_player:
+                        self.video_client.send_message(self.video_player["reset"][0], self.video_player["reset"][1])
+                        self.video_client.send_message(self.video_player["select"][0].format(self.video), self.video_player["select"][1])
+                        self.video_client.send_message(self.video_player["play"][0], self.video_player["play"][1])
+                    else:
+                        self.video_client.send_message(self.video_player["play"][0], self.video_player["play"][1].format(self.video))
+                if str(type(self.page)) == "<class 'Page.Page'>":
+                    self.page.log_event("player_started", self.id)
+                else:
+                    self.gui.events.log("player_started", self.id)
         if (self.start != 0) and self.playing:
             self.end = time()
             self.duration.append(self.end - self.start)
@@ -214,15 +207,31 @@ class Player(QWidget):
         self.end = 0
         self.playing = True
         self.paused = False
+        self.started.emit()
 
         if self.pupil_func is not None:
-            self.pupil_func.send_trigger(self.pupil_func.new_trigger(self.pupil_message))
+            self.pupil_func.send_trigger(self.pupil_func.new_trigger(self.pupil_message, clock=self.pupil_func.clock))
         if self.timer is not None:
             self.timer.start(self.countdown)
 
         if self.play_once and "Play" in self.buttons:
             self.play_button.setEnabled(False)
 
+    def set_stimulus(self, start_cue, track):
+        """Set the stimulus and compile the messages starting it.
+
+        Parameters
+        ----------
+        start_cue : int
+            number of the marker the stimulus starts at
+        track : list[int]
+            track(s) of the stimulus
+        """
+        self.start_cue = start_cue
+        self.track = track
+        self.audible = {int(t) for t in track}
+        self.restart = locate(start_cue) + (STOP, PLAY)
+
     def timer_done(self):
         """Show the following elements on this page after the timer is finished."""
         self.timer.stop()
@@ -249,14 +258,14 @@ class Player(QWidget):
         """Pause the current playback and resume at that position."""
         if self.playing:
             self.playing = False
-            self.audio_client.send_message("/pause", 1)
+            self.audio_client.send(PAUSE)
             if (self.video is not None) and (self.video_client is not None):
                 self.video_client.send_message(self.video_player["pause"][0], self.video_player["pause"][1])
             self.pause_button.setChecked(True)
             if str(type(self.page)) == "<class 'Page.Page'>":
-                self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Paused Player {self.id}'
+                self.page.log_event("player_paused", self.id)
             else:
-                self.gui.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Paused Player {self.id}'
+                self.gui.events.log("player_paused", self.id)
             self.end = time()
             self.duration.append(self.end - self.start)
             self.paused = True
@@ -265,14 +274,14 @@ class Player(QWidget):
                 self.timer.stop()
         else:
             self.playing = True
-            self.audio_client.send_message("/pause", 1)
+            self.audio_client.send(PAUSE)
             if (self.video is not None) and (self.video_client is not None):
                 self.video_client.send_message(self.video_player["unpause"][0], self.video_player["unpause"][1])
             self.pause_button.setChecked(False)
             if str(type(self.page)) == "<class 'Page.Page'>":
-                self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Unpaused Player {self.id}'
+                self.page.log_event("player_unpaused", self.id)
             else:
-                self.gui.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Unpaused Player {self.id}'
+                self.gui.events.log("player_unpaused", self.id)
             self.start = time()
             self.end = 0
             self.paused = False
@@ -281,7 +290,7 @@ class Player(QWidget):
 
     def stop(self):
         """Stop the playback."""
-        self.audio_client.send_message("/stop", 1)
+        self.audio_client.send(STOP)
         if (self.video is not None) and (self.video_client is not None) and not self.paused:
             self.video_client.send_message(self.video_player["stop"][0], self.video_player["stop"][1])
         self.end = time()
@@ -299,8 +308,7 @@ class Player(QWidget):
             self.pause_button.setEnabled(False)
             self.pause_button.setChecked(False)
         if str(type(self.page)) == "<class 'Page.Page'>":
-            self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Stopped Player {self.id}'
-            # self.gui.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Stopped Player {self.id}'
+            self.page.log_event("player_stopped", self.id)
         if self.timer is not None and self.timer.remainingTime() > 0 and self.countdown > 0:
             self.timer.stop()
         self.playing = False
@@ -0,0 +1,103 @@
+"""
+Runs the connection checks at startup in parallel, every host is only probed once.
+"""
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ConnectionMonitor import icmp_probe
+
+WORKERS = 8  # maximum number of handshakes running at the same time
+
+
+class ProbeCache:
+    """
+    Starts probes/handshakes in a thread pool and keeps their results, so e.g. ten OSCButtons
+    sending to the same receiver cost a single ping.
+    """
+
+    def __init__(self, timeout, workers=WORKERS):
+        """
+        Parameters
+        ----------
+        timeout : float
+            time in seconds to wait for the answer of a ping
+        workers : int, default=WORKERS
+            maximum number of probes running at the same time
+        """
+        self.timeout = timeout
+        self.workers = workers
+        self.executor = None
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def submit(self, key, function, *args):
+        """Start a probe unless a probe with the same key was already started.
+
+        Parameters
+        ----------
+        key : tuple
+            identifies the probe, e.g. ('ping', '127.0.0.1')
+        function : function
+            the probe
+        *args
+            arguments passed to the probe
+
+        Returns
+        -------
+        concurrent.futures.Future
+            future of the (possibly already finished) probe
+        """
+        with self.lock:
+            if key not in self.futures:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="probe")
+                self.futures[key] = self.executor.submit(function, *args)
+            return self.futures[key]
+
+    def ping(self, host):
+        """Start pinging a host.
+
+        Parameters
+        ----------
+        host : str
+            IP address of the host
+
+        Returns
+        -------
+        concurrent.futures.Future
+            future which results in True if the host answered, None if it can't be pinged
+        """
+        return self.submit(("ping", host), icmp_probe(host, self.timeout))
+
+    def reachable(self, host):
+        """Wait for the ping of a host, it is started if necessary.
+
+        Parameters
+        ----------
+        host : str
+            IP address of the host
+
+        Returns
+        -------
+        bool
+            True if the host answered, False if not or if it can't be pinged
+        """
+        return self.ping(host).result() is True
+
+    def local_ip(self):
+        """Start resolving the IP address of this machine.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            future which results in the IP address the OSC listeners are bound to
+        """
+        return self.submit(("local_ip",), lambda: socket.gethostbyname(socket.gethostname()))
+
+    def shutdown(self):
+        """Stop the pool without waiting for running probes."""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
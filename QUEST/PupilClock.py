@@ -0,0 +1,153 @@
+"""
+Tracks the offset between the local monotonic clock and Pupil time, so annotations can be stamped in Pupil time.
+"""
+import json
+import os
+import threading
+from time import monotonic
+
+import zmq
+
+INTERVAL = 10  # seconds between two synchronisations
+SAMPLES = 5  # requests per synchronisation, the one with the shortest round trip is used
+TIMEOUT = 1000  # ms to wait for Pupil Remote's answer
+
+
+def estimate(samples):
+    """Cristian's algorithm: assume Pupil's answer was taken halfway through the round trip of the fastest request.
+
+    Parameters
+    ----------
+    samples : list of tuple
+        (sent, pupil time, received) with sent and received in monotonic seconds
+
+    Returns
+    -------
+    tuple
+        (offset, round trip time, uncertainty) in seconds, offset = Pupil time - monotonic time
+    """
+    sent, pupil_time, received = min(samples, key=lambda sample: sample[2] - sample[0])
+    rtt = received - sent
+    return pupil_time - (sent + received) / 2, rtt, rtt / 2
+
+
+class PupilClock:
+    """
+    Periodically asks Pupil Remote for the current Pupil time in a background thread, which owns its own socket.\n
+    The estimate of the synchronisation with the shortest round trip replaces the offset,
+    every estimate is kept in the history with the monotonic time it was taken at.
+    """
+
+    def __init__(self, ctx, ip, port, interval=INTERVAL, samples=SAMPLES):
+        """
+        Parameters
+        ----------
+        ctx : zmq.Context
+            ZMQ context to create the socket in
+        ip : str
+            IP address of Pupil Capture
+        port : int or str
+            port of Pupil Remote
+        interval : float, default=INTERVAL
+            seconds between two synchronisations
+        samples : int, default=SAMPLES
+            requests per synchronisation
+        """
+        self.ctx = ctx
+        self.address = f'tcp://{ip}:{port}'
+        self.interval = interval
+        self.samples = samples
+        self.lock = threading.Lock()
+        self.offset = None
+        self.history = []  # {"monotonic", "offset", "rtt", "uncertainty"} of every synchronisation
+        self.synced = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """Start the synchronisation thread."""
+        self.thread.start()
+
+    def now(self):
+        """
+        Returns
+        -------
+        float or None
+            current Pupil time, None before the first synchronisation
+        """
+        stamp = monotonic()
+        with self.lock:
+            return stamp + self.offset if self.offset is not None else None
+
+    def sync(self, remote):
+        """Take the samples of one synchronisation and update the offset.
+
+        Parameters
+        ----------
+        remote : zmq.Socket
+            REQ socket connected to Pupil Remote
+
+        Returns
+        -------
+        bool
+            False if Pupil Capture didn't answer, the socket has to be replaced then
+        """
+        samples = []
+        for _ in range(self.samples):
+            sent = monotonic()
+            remote.send_string("t")
+            if (remote.poll(TIMEOUT) & zmq.POLLIN) == 0:
+                return False
+            pupil_time = float(remote.recv_string())
+            samples.append((sent, pupil_time, monotonic()))
+        offset, rtt, uncertainty = estimate(samples)
+        with self.lock:
+            self.offset = offset
+            self.history.append({"monotonic": samples[-1][2], "offset": offset, "rtt": rtt, "uncertainty": uncertainty})
+        self.synced.set()
+        return True
+
+    def run(self):
+        """Synchronise until closed."""
+        remote = None
+        while not self.stop_event.is_set():
+            if remote is None:
+                remote = self.ctx.socket(zmq.REQ)
+                remote.setsockopt(zmq.LINGER, 0)
+                remote.connect(self.address)
+            try:
+                if not self.sync(remote):
+                    print("Couldn't synchronise with Pupil Capture!")
+                    remote.close()
+                    remote = None
+            except (zmq.ZMQError, ValueError):
+                print("Couldn't synchronise with Pupil Capture!")
+                remote.close()
+                remote = None
+            self.stop_event.wait(self.interval)
+        if remote is not None:
+            remote.close()
+
+    def close(self):
+        """Stop the synchronisation thread."""
+        self.stop_event.set()
+        self.thread.join(self.samples * TIMEOUT / 1000)
+
+    def save(self, filepath):
+        """Write the history of the offset as JSON.
+
+        Parameters
+        ----------
+        filepath : str
+            file/path of the clock file
+        """
+        with self.lock:
+            history = list(self.history)
+        if len(history) == 0:
+            return
+        try:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            with open(filepath, 'w', encoding='utf_8') as clock_file:
+                json.dump({"interval": self.interval, "samples": self.samples, "history": history}, clock_file, indent=1)
+        except OSError:
+            print("Could not save the clock synchronisation!")
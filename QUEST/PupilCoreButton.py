@@ -1,7 +1,6 @@
 """
 This class creates a button with additional functionality to interact with PupilCore.
 """
-import datetime
 from time import time
 
 import msgpack as serializer
@@ -56,16 +55,17 @@ class Button(QWidget):
             self.name = None
         if hasattr(self.page, "pupil_remote") and self.page.pupil_remote is not None:
             self.pupil_remote = self.page.pupil_remote
-            self.ctx = self.page.ctx
-            self.ip = self.page.pupil_ip
+            self.annotations = self.page.annotations
+            self.clock = getattr(self.page, "pupil_clock", None)
         elif hasattr(self.page.gui, "pupil_remote") and self.page.gui.pupil_remote is not None:
             self.pupil_remote = self.page.gui.pupil_remote
-            self.ctx = self.page.gui.ctx
-            self.ip = self.page.gui.pupil_ip
+            self.annotations = self.page.gui.annotations
+            self.clock = getattr(self.page.gui, "pupil_clock", None)
         else:
             self.pupil_remote = None
+            self.annotations = None
+            self.clock = None
         self.recording_name = recording_name
-        self.pub_socket = None
         if inscription is not None:
             layout = QHBoxLayout()
             self.button = QPushButton(inscription)
@@ -82,7 +82,7 @@ class Button(QWidget):
             elif function == "Annotate":
                 if self.page.gui.popup and not self.page.gui.preview:
                     self.setup_annotate()
-                self.button.clicked.connect(lambda: self.send_trigger(self.new_trigger("test" if annotation is None else str(annotation))))
+                self.button.clicked.connect(lambda: self.send_trigger(self.new_trigger("test" if annotation is None else str(annotation), clock=self.clock)))
             self.button.clicked.connect(self.log)
             self.button.clicked.connect(lambda: self.__click_animation(self.button))
             self.setLayout(layout)
@@ -111,20 +111,15 @@ class Button(QWidget):
             else:
                 if self.recording_name.startswith("id:"):
                     # print("recording name starts with id")
-                    var = self.recording_name[2:].strip(' :')
-                    skip = False
-                    for s in range(0, self.page.gui.count()):
-                        if not skip and self.page.gui.widget(s).evaluationvars is not None and \
-                                var in self.page.gui.widget(s).evaluationvars:
-                            self.recording_name = self.page.gui.widget(s).evaluationvars[var]
-                            if isinstance(self.recording_name, (QLineEdit, PasswordEntry)):
-                                if isinstance(self.recording_name.validator(), QDoubleValidator):
-                                    self.recording_name.setText(self.recording_name.text().replace(",", "."))
-                                self.recording_name = self.recording_name.text()
-                            elif isinstance(self.recording_name, QPlainTextEdit):
-                                self.recording_name = self.recording_name.toPlainText().replace("\n", " ")
-                        if not skip and self.page.gui.widget(s) == self.page:
-                            skip = True
+                    answer = self.page.gui.answer_of(self.recording_name, self.page)
+                    if answer is not None:
+                        self.recording_name = answer
+                        if isinstance(self.recording_name, (QLineEdit, PasswordEntry)):
+                            if isinstance(self.recording_name.validator(), QDoubleValidator):
+                                self.recording_name.setText(self.recording_name.text().replace(",", "."))
+                            self.recording_name = self.recording_name.text()
+                        elif isinstance(self.recording_name, QPlainTextEdit):
+                            self.recording_name = self.recording_name.toPlainText().replace("\n", " ")
                 print("Recording name:",self.recording_name)
                 self.pupil_remote.send_string(f'R {self.recording_name}')
             print("Start recording...", self.pupil_remote.recv_string())
@@ -160,25 +155,9 @@ class Button(QWidget):
         Credits to: https://github.com/pupil-labs/pupil-helpers/blob/master/python/remote_annotations.py
         """
         try:
-            # create and connect PUB socket to IPC
-            self.pupil_remote.send_string("PUB_PORT")
-            pub_port = self.pupil_remote.recv_string()
-            self.pub_socket = zmq.Socket(self.ctx, zmq.PUB)
-            # self.pub_socket.setsockopt(zmq.LINGER, 0)  # ____POLICY: set upon instantiations
-            # self.pub_socket.setsockopt(zmq.RCVTIMEO, 2000)
-            self.pub_socket.connect(f'tcp://{self.ip}:{pub_port}')
-            # In order for the annotations to be correlated correctly with the rest of
-            # the data it is required to change Pupil Capture's time base to this scripts
-            # clock. We only set the time base once. Consider using Pupil Time Sync for
-            # a more precise and long term time synchronization
-
-            # Set Pupil Capture's time base to this scripts time. (Should be done before
-            # starting the recording)
-
-            self.pupil_remote.send_string(f'T {time()}')
-            print("Annotate...", self.pupil_remote.recv_string())
-
-            # Start the annotations plugin
+            # Pupil Capture's time base is set once by the GUI, afterwards the annotations are stamped
+            # in Pupil time via the offset tracked by the PupilClock of the GUI
+            # Start the annotations plugin, the annotations are published by the AnnotationSender of the GUI
             self.notify({"subject": "start_plugin", "name": "Annotation_Capture", "args": {}})
         except (zmq.ZMQError, AttributeError):
             print("Couldn't connect with Pupil Capture!")
@@ -217,22 +196,13 @@ class Button(QWidget):
 
         """
         self.used = True
-        if self.pub_socket is not None:
-            payload = serializer.dumps(trigger, use_bin_type=True)
-            try:
-                self.pupil_remote.send_string(trigger["topic"], flags=zmq.SNDMORE)
-                self.pupil_remote.send(payload)
-                recv = self.pupil_remote.recv_string()
-                print("Trigger", trigger, recv)  # this *somehow* makes the annotations work
-            except zmq.ZMQError:
-                print("Couldn't connect with Pupil Capture!")
-                self.pub_socket.close()
-                print("Connection to pupil closed.")
+        if self.annotations is not None:
+            self.annotations.send(trigger)  # only queued, the GUI doesn't wait for Pupil Capture
         else:
             print("Couldn't connect with Pupil Capture!")
 
     @staticmethod
-    def new_trigger(label, duration=1):
+    def new_trigger(label, duration=1, clock=None):
         """Basic trigger structure
 
         Parameters
@@ -241,14 +211,17 @@ class Button(QWidget):
             text for the annotation
         duration : int, default=1
             time to display the annotation
+        clock : PupilClock, optional
+            clock mapping the monotonic time to Pupil time, the wall-clock time is used if None or not yet synchronised
         """
+        timestamp = clock.now() if clock is not None else None
         return {
             "topic": "annotation",
             "label": label,
-            "timestamp": time(),  # time.asctime(time.localtime()); for Pupil Core > v3.4.0 NEEDS to be of type float
+            "timestamp": timestamp if timestamp is not None else time(),  # for Pupil Core > v3.4.0 NEEDS to be of type float
             "duration": duration,
         }
 
     def log(self):
         """Log Action"""
-        self.page.page_log += f'\n\t{str(datetime.datetime.now().replace(microsecond=0))} - Pressed Button {self.id}'
+        self.page.log_event("pressed", self.id)
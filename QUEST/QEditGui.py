@@ -16,10 +16,11 @@ from configobj import ConfigObj, ConfigObjError
 from fpdf import FPDF
 
 from GUI import StackedWindowGui, VERSION
+from highlight import compatible_stylesheet
 from TextEdit import TextEdit
 from Tree import Tree
 from Validator import validate_questionnaire, listify
-from tools import general_fields, default_values, tooltips, types, fields_per_type, video_player, randomize_options, page_fields, image_positions, policy_possibilities, player_buttons, function_possibilites
+from tools import general_fields, default_values, tooltips, types, fields_per_type, video_player, results_backends, randomize_options, page_fields, image_positions, policy_possibilities, player_buttons, function_possibilites
 
 
 class QEditGuiMain(QMainWindow):
@@ -548,7 +549,7 @@ class EditGui(QWidget):
                         css_data = css_file.read().replace('\n', '')
                 p_widget = QWidget()
                 p_widget.setLayout(self.preview_gui.layout())
-                p_widget.setStyleSheet(css_data)
+                p_widget.setStyleSheet(compatible_stylesheet(css_data))
                 self.prev_widget.addWidget(p_widget)
 
                 if self.current_item is not None and self.current_item.parent() is None:
@@ -639,10 +640,10 @@ class EditGui(QWidget):
                     for field in general_fields:
                         if field not in self.parent().structure.keys() and field in default_values:
                             self.parent().structure[field] = default_values[field]
-                        if field == "go_back":
+                        if field in ["go_back", "lazy_loading", "osc_bundles"]:
                             val_field = QCheckBox("")
                             val_field.toggled.connect(self.update_val)
-                            val_field.setChecked(bool(((self.parent().structure[field] == "True") or (isinstance(self.parent().structure["go_back"], bool) and self.parent().structure["go_back"]))))
+                            val_field.setChecked(bool(((self.parent().structure[field] == "True") or (isinstance(self.parent().structure[field], bool) and self.parent().structure[field]))))
                         elif field == "save_message":
                             val_field = TextEdit(self.parent().structure[field] if field in self.parent().structure.keys() else "")
                             val_field.editingFinished.connect(self.edit_done)
@@ -689,6 +690,11 @@ class EditGui(QWidget):
                             val_field.addItems(video_player)
                             val_field.setCurrentIndex(video_player.index(self.parent().structure[field]))
                             val_field.activated.connect(self.update_val)
+                        elif field == "results_backend":
+                            val_field = QComboBox()
+                            val_field.addItems(results_backends)
+                            val_field.setCurrentIndex(results_backends.index(self.parent().structure[field]))
+                            val_field.activated.connect(self.update_val)
                         else:
                             val_field = QLineEdit("")
                             if field in self.parent().structure.keys():
@@ -1059,7 +1065,7 @@ class EditGui(QWidget):
                         self.rand_filechooser.setEnabled(True)
                     else:
                         self.rand_filechooser.setEnabled(False)
-                elif lbl == "video_player":
+                elif lbl == "video_player" or lbl == "results_backend":
                     new_val = self.sender().currentText()
                 elif lbl == "save_after":
                     new_val = self.sender().currentText()
@@ -0,0 +1,155 @@
+"""
+Mirror of the transport and mixer state of Reaper, so only the changes have to be sent.
+"""
+from time import monotonic
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from PlaybackProgram import encoded
+
+ACK_TIMEOUT = 500  # ms until a command which Reaper didn't confirm is reported as diverged
+TRACK_KEYS = ["mute", "solo", "select"]
+MUTE_ALL = 40341  # Reaper action muting all tracks
+
+
+class ReaperState(QObject):
+    """
+    Known transport state and mute/solo/select state per track of Reaper.\n
+    Commands update the model when they are sent. If Reaper's feedback is received, it corrects the model,
+    and a command which isn't confirmed in time is reported via diverged and resent the next time.
+    Without feedback nothing would correct the model, so the full state is sent every time.
+    """
+    diverged = Signal(str)
+
+    def __init__(self, ack_timeout=None, parent=None):
+        """
+        Parameters
+        ----------
+        ack_timeout : int, optional
+            time in ms Reaper has to confirm a command, None if Reaper doesn't send feedback
+        parent : QObject, optional
+            parent of the model
+        """
+        super().__init__(parent)
+        self.ack_timeout = ack_timeout
+        self.transport = None
+        self.tracks = {}  # track number -> {key: bool}, unknown keys are missing
+        self.track_count = 0
+        self.pending = {}  # address -> (value, deadline) of unconfirmed commands
+
+    def get(self, track, key):
+        """
+        Parameters
+        ----------
+        track : int
+            number of the track
+        key : str
+            'mute', 'solo' or 'select'
+
+        Returns
+        -------
+        bool or None
+            the known state, None if unknown
+        """
+        return self.tracks.get(track, {}).get(key)
+
+    def feedback(self, address, value):
+        """Update the model with a message of Reaper.
+
+        Parameters
+        ----------
+        address : str
+            OSC address of the message
+        value : float or tuple
+            value(s) of the message
+        """
+        if isinstance(value, tuple):
+            value = value[0] if len(value) > 0 else None
+        if address in ["/play", "/pause", "/stop"]:
+            if value == 1.0:
+                self.transport = address[1:].upper()
+            return
+        parts = address.split("/")
+        if len(parts) < 3 or parts[1] != "track" or not parts[2].isdigit():
+            return
+        track = int(parts[2])
+        self.track_count = max(self.track_count, track)
+        if len(parts) == 4 and parts[3] in TRACK_KEYS:
+            state = bool(float(value))
+            self.tracks.setdefault(track, {})[parts[3]] = state
+            if address in self.pending and self.pending[address][0] == state:
+                del self.pending[address]
+
+    def set_tracks(self, client, key, wanted):
+        """Send the commands to bring tracks into the wanted state, tracks already in it are skipped if Reaper sends feedback.
+        Tracks are switched off before others are switched on, so no two stimuli overlap.
+
+        Parameters
+        ----------
+        client : BundleClient or None
+            client sending to Reaper, nothing is sent if None
+        key : str
+            'mute', 'solo' or 'select'
+        wanted : dict
+            track number -> wanted state
+        """
+        if client is None:
+            return
+        for state in [False, True] if key != "mute" else [True, False]:
+            for track in sorted(wanted):
+                if wanted[track] == state and (self.ack_timeout is None or self.get(track, key) != state):
+                    address = f'/track/{track}/{key}'
+                    client.send(encoded(address, int(state)))
+                    self.tracks.setdefault(track, {})[key] = state
+                    if self.ack_timeout is not None:
+                        self.pending[address] = (state, monotonic() + self.ack_timeout / 1000)
+                        QTimer.singleShot(self.ack_timeout, self.check)
+
+    def unmute_only(self, client, tracks, count, mute_all=False):
+        """Mute all tracks but the given ones.
+
+        Parameters
+        ----------
+        client : BundleClient or None
+            client sending to Reaper
+        tracks : set of int
+            tracks to play
+        count : int
+            number of tracks in the Reaper project
+        mute_all : bool, default=False
+            True to mute also the tracks beyond count. Unless Reaper's feedback reported the mute state of every track,
+            the action muting all tracks is sent, as the project may have more tracks than known.
+        """
+        last = max([count, *tracks])
+        if mute_all and client is not None and (self.ack_timeout is None or self.track_count < last or
+                                                any(self.get(track, "mute") is None for track in range(1, self.track_count + 1))):
+            client.send(encoded("/action", MUTE_ALL))
+            for track in range(1, max(last, self.track_count) + 1):
+                self.tracks.setdefault(track, {})["mute"] = True
+            self.set_tracks(client, "mute", {track: False for track in tracks})
+        else:
+            self.set_tracks(client, "mute", {track: track not in tracks for track in range(1, max(last, self.track_count if mute_all else 0) + 1)})
+
+    def forget(self, key):
+        """Mark a state of all tracks as unknown, e.g. after an action changed it in Reaper.
+
+        Parameters
+        ----------
+        key : str
+            'mute', 'solo' or 'select'
+        """
+        for state in self.tracks.values():
+            state.pop(key, None)
+
+    def check(self):
+        """Report the commands which weren't confirmed in time, their state is unknown afterwards."""
+        now = monotonic()
+        for address, (_, deadline) in list(self.pending.items()):
+            if deadline <= now:
+                del self.pending[address]
+                _, _, track, key = address.split("/")
+                self.tracks.get(int(track), {}).pop(key, None)
+                print(f"Reaper did not confirm {address}.")
+                self.diverged.emit(address)
+        if len(self.pending) > 0:  # the timer may fire a bit before the deadline
+            QTimer.singleShot(max(1, int((min(deadline for _, deadline in self.pending.values()) - now) * 1000) + 1), self.check)
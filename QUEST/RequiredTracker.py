@@ -0,0 +1,180 @@
+"""
+Keeps track of the unanswered required questions of a page while the participant answers them.
+"""
+from PySide6.QtCore import QEvent, QObject, QTimer, Signal
+from PySide6.QtWidgets import QButtonGroup, QCheckBox, QLineEdit, QPlainTextEdit
+
+from ABX import ABX
+from LabeledSlider import LabeledSlider
+from MUSHRA import MUSHRA
+from OSCButton import OSCButton
+from PupilCoreButton import Button
+from RadioMatrix import RadioMatrix
+from Slider import Slider
+from highlight import set_required
+
+
+def played(player):
+    """
+    Parameters
+    ----------
+    player : Player
+        the player
+
+    Returns
+    -------
+    bool
+        True if the player was started at least once
+    """
+    return len(player.duration) > 0 or player.playing
+
+
+class RequiredTracker(QObject):
+    """
+    Counts the unanswered parts of the required questions of a page, e.g. the questions of a matrix.\n
+    Each part is re-evaluated only when one of its widgets signals a change, and once the page is highlighted,
+    only the widgets whose state flipped are restyled.
+    """
+    completed = Signal(bool)  # the page became complete (True) or incomplete again (False)
+
+    def __init__(self, page):
+        """
+        Parameters
+        ----------
+        page : Page
+            the page, its required questions are taken from page.required and page.evaluationvars
+        """
+        super().__init__(page)
+        self.page = page
+        self.parts = []  # [answered-function, highlighted widget or None, answered]
+        self.unanswered = 0
+        self.flagged = {}  # highlighted widget -> number of its unanswered parts
+        self.highlighting = False
+        self.sliders = {}  # slider -> its part, updated after mouse and key releases
+        for qid, entry in page.required.items():
+            if entry[0]:
+                self.add_question(page.evaluationvars[qid], entry)
+
+    def add_question(self, ans, entry):
+        """Split a required question into its parts.
+
+        Parameters
+        ----------
+        ans : object
+            the answer of the question, see Page.evaluationvars
+        entry : list
+            required flag, highlighted widget(s) and further state, see Page.required
+        """
+        if isinstance(ans, QButtonGroup):
+            self.add(lambda: ans.checkedId() != -1, entry[1], ans.idToggled)
+        elif isinstance(ans, QCheckBox):
+            self.add(ans.isChecked, entry[1], ans.toggled)
+        elif isinstance(ans, QLineEdit):  # also PasswordEntry
+            self.add(lambda: len(ans.text()) > 0, entry[1], ans.textChanged)
+        elif isinstance(ans, QPlainTextEdit):
+            self.add(lambda: len(ans.toPlainText()) > 0, entry[1], ans.textChanged)
+        elif isinstance(ans, (Slider, LabeledSlider)):  # the slider blocks its signals while it's handled
+            self.add(lambda: ans.value() != ans.start or ans.get_moved(), entry[1], None)
+            self.add_slider(ans.sl if isinstance(ans, LabeledSlider) else ans, self.parts[-1])
+        elif isinstance(ans, (Button, OSCButton)):
+            self.add(lambda: ans.used, entry[1], ans.button.clicked)
+        elif isinstance(ans, ABX):
+            self.add(lambda: ans.answer.checkedId() != -1, ans.label, ans.answer.idToggled)  # like before, the stimuli needn't be played
+        elif isinstance(ans, RadioMatrix):
+            for label, group in zip(entry[1], ans.buttongroups):
+                self.add(lambda group=group: group.checkedId() != -1, label, group.idToggled)
+        elif isinstance(ans, list) and isinstance(entry[1], list):  # MUSHRA, reference and stimuli
+            mushra = next(player for player in self.page.players if isinstance(player, MUSHRA) and player.duration is ans)
+            for cue, button in enumerate(entry[1]):
+                self.add(lambda cue=cue: len(ans[cue]) > 0 or (mushra.playing and mushra.current == cue), button, button.clicked)
+        elif isinstance(ans, list):  # Player
+            player = next(player for player in self.page.players if player.duration is ans)
+            self.add(lambda: played(player), entry[1], player.started)
+
+    def add(self, answered, widget, signal):
+        """Add a part and follow its changes.
+
+        Parameters
+        ----------
+        answered : function
+            returns True if the part is answered
+        widget : QWidget or None
+            widget highlighted while the part is unanswered
+        signal : SignalInstance or None
+            emitted when the answer may have changed
+        """
+        part = [answered, widget, answered()]
+        self.parts.append(part)
+        if not part[2]:
+            self.unanswered += 1
+        if signal is not None:
+            signal.connect(lambda *args: self.update(part))
+
+    def add_slider(self, slider, part):
+        """Follow a slider via its events, its signals are blocked while the handle is moved.
+
+        Parameters
+        ----------
+        slider : Slider
+            the slider
+        part : list
+            its part, see add()
+        """
+        self.sliders[slider] = part
+        slider.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        """Re-evaluate a slider once the mouse release, key release or wheel event is handled."""
+        if event.type() in [QEvent.Type.MouseButtonRelease, QEvent.Type.KeyRelease, QEvent.Type.Wheel] and watched in self.sliders:
+            QTimer.singleShot(0, lambda: self.update(self.sliders[watched]))
+        return False
+
+    def update(self, part):
+        """Re-evaluate a part and restyle its widget if its state flipped.
+
+        Parameters
+        ----------
+        part : list
+            the part, see add()
+        """
+        answered = bool(part[0]())
+        if answered == part[2]:
+            return
+        part[2] = answered
+        was_complete = self.unanswered == 0
+        self.unanswered += -1 if answered else 1
+        if self.highlighting:
+            self.flag(part, not answered)
+            if was_complete != (self.unanswered == 0):
+                self.completed.emit(self.unanswered == 0)
+
+    def flag(self, part, unanswered):
+        """Count an unanswered part for its widget, the widget is only restyled if its count changes from/to 0."""
+        widget = part[1]
+        if widget is None:
+            return
+        count = self.flagged.get(widget, 0) + (1 if unanswered else -1)
+        self.flagged[widget] = count
+        if count == 1 and unanswered:
+            set_required(widget, True)
+        elif count == 0:
+            set_required(widget, False)
+
+    def highlight(self):
+        """Highlight the unanswered parts, from now on the highlighting follows the answers."""
+        if self.highlighting:
+            return
+        self.highlighting = True
+        for part in self.parts:
+            if not part[2]:
+                self.flag(part, True)
+
+    def check_sliders(self):
+        """Re-evaluate the sliders, e.g. before the page is left, as a value set without an event isn't followed."""
+        for part in self.sliders.values():
+            self.update(part)
+
+    def refresh(self):
+        """Re-evaluate all parts, e.g. after the answers were restored without signals."""
+        for part in self.parts:
+            self.update(part)
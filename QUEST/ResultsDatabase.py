@@ -0,0 +1,245 @@
+"""
+Stores the results of all sessions in a SQLite database, as alternative to the csv-file for studies with several stations.
+"""
+import argparse
+import csv
+import datetime
+import os
+import sqlite3
+from itertools import groupby
+
+from ResultsWriter import ResultsWriter, LOCK_TIMEOUT
+
+TABLES = """
+CREATE TABLE IF NOT EXISTS participants (number INTEGER PRIMARY KEY, start TEXT, end TEXT, saved TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS reservations (number INTEGER PRIMARY KEY, time TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS columns (position INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS answers (participant INTEGER NOT NULL REFERENCES participants(number), qid TEXT NOT NULL, value TEXT,
+                                    PRIMARY KEY (participant, qid)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS answers_qid ON answers (qid, participant);
+CREATE TABLE IF NOT EXISTS events (participant INTEGER NOT NULL REFERENCES participants(number), position INTEGER NOT NULL,
+                                   time TEXT, page INTEGER, element TEXT, kind TEXT, value TEXT, PRIMARY KEY (participant, position)) WITHOUT ROWID;
+"""
+NEXT_NUMBER = "SELECT COALESCE(MAX(number), 0) + 1 FROM participants"
+NEXT_RESERVATION = "SELECT MAX(COALESCE((SELECT MAX(number) FROM participants), 0), COALESCE((SELECT MAX(number) FROM reservations), 0)) + 1"
+
+
+def database_path(filepath_results):
+    """Get the path of the database belonging to a results file.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+
+    Returns
+    -------
+    str
+        file/path of the database, the results file with the extension .sqlite
+    """
+    return f'{os.path.splitext(filepath_results)[0]}.sqlite'
+
+
+def connect(database, timeout=LOCK_TIMEOUT):
+    """Open the database in WAL mode, so that stations can read while another one writes, and create the tables.
+
+    Parameters
+    ----------
+    database : str
+        file/path of the database
+    timeout : float, default=LOCK_TIMEOUT
+        maximum time to wait for other stations writing to the database
+
+    Returns
+    -------
+    sqlite3.Connection
+        the connection, transactions are controlled explicitly
+    """
+    folder = os.path.dirname(database)
+    if folder != "":
+        os.makedirs(folder, exist_ok=True)
+    connection = sqlite3.connect(database, timeout=timeout, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # with WAL a power loss may lose the last sessions, but never corrupts the database
+    connection.executescript(TABLES)
+    return connection
+
+
+def participant_number(database):
+    """Get the number for the next participant.
+
+    Parameters
+    ----------
+    database : str
+        file/path of the database
+
+    Returns
+    -------
+    int
+        continuous number for participant
+
+    Raises
+    ------
+    PermissionError
+        if the database can't be read
+    """
+    if not os.path.exists(database):
+        return 1
+    try:
+        connection = connect(database)
+        try:
+            return connection.execute(NEXT_NUMBER).fetchone()[0]
+        finally:
+            connection.close()
+    except sqlite3.Error as error:
+        raise PermissionError(f"Can not read the database: {error}")
+
+
+def reserve_participant(database, timeout=LOCK_TIMEOUT):
+    """Reserve a number for the log, the journal and the order of the pages when a session starts,
+    the reservations are dropped whenever a participant is saved, see ResultsWriter.reserve_participant.
+
+    Parameters
+    ----------
+    database : str
+        file/path of the database
+    timeout : float, default=LOCK_TIMEOUT
+        maximum time to wait for other stations writing to the database
+
+    Returns
+    -------
+    int
+        continuous number for participant
+
+    Raises
+    ------
+    PermissionError
+        if the database can't be accessed or is locked by another station for too long
+    """
+    try:
+        connection = connect(database, timeout)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            number = connection.execute(NEXT_RESERVATION).fetchone()[0]
+            connection.execute("INSERT INTO reservations (number, time) VALUES (?, ?)", (number, str(datetime.datetime.now())))
+            connection.execute("COMMIT")
+            return number
+        finally:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            connection.close()
+    except sqlite3.Error as error:
+        raise PermissionError(f"Can not reserve a participant number in the database: {error}")
+
+
+def export_csv(database, filepath, delimiter=';'):
+    """Write the results in the layout of the results file, one participant after another without loading all answers.
+
+    Parameters
+    ----------
+    database : str
+        file/path of the database
+    filepath : str
+        file/path of the csv-file to write
+    delimiter : str, default=';'
+        delimiter of the csv-file
+
+    Returns
+    -------
+    int
+        number of exported participants
+    """
+    connection = connect(database)
+    count = 0
+    try:
+        header = [name for name, in connection.execute("SELECT name FROM columns ORDER BY position")]
+        with open(filepath, "w", newline='', encoding='utf_8') as csvfile:
+            writer = csv.writer(csvfile, delimiter=delimiter)
+            writer.writerow(header)
+            answers = connection.execute("SELECT participant, qid, value FROM answers ORDER BY participant")
+            for participant, group in groupby(answers, key=lambda answer: answer[0]):
+                values = {qid: value for _, qid, value in group}
+                values["data_row_number"] = participant
+                writer.writerow([values.get(column, "") for column in header])
+                count += 1
+    finally:
+        connection.close()
+    return count
+
+
+class DatabaseWriter(ResultsWriter):
+    """
+    Worker saving a session to the database without blocking the GUI, see ResultsWriter.\n
+    The participant, its answers in long format (one row per column) and its events are inserted in a single transaction.
+
+    Parameters
+    ----------
+    fields : dict
+        values of the row to save, the keys are the column names
+    log : iterable of str
+        the complete log of the session, e.g. rendered from the event log while it is written
+    database : str
+        file/path of the database
+    filepath_log : str
+        file/path of the log file
+    delimiter : str
+        delimiter of a backup file
+    timeout : float, default=LOCK_TIMEOUT
+        maximum time to wait for other stations writing to the database, a backup is saved afterwards
+    schema : list[str], optional
+        columns of the results derived from the questionnaire, by default the keys of fields
+    events : iterable of dict, optional
+        the events of the session, see EventLog.events
+    before : callable, optional
+        called in the background before the data is written, e.g. to stop a recording
+    """
+
+    def __init__(self, fields, log, database, filepath_log, delimiter, timeout=LOCK_TIMEOUT, schema=None, events=None, before=None):
+        super().__init__(fields, log, database, filepath_log, delimiter, timeout=timeout, schema=schema, before=before)
+        self.events = events if events is not None else []
+
+    def append_row(self):
+        """Insert the participant, its answers and events.\n
+        The participant number is allocated in the same transaction, the reservations of running sessions are dropped.
+
+        Raises
+        ------
+        PermissionError
+            if the database can't be accessed or is locked by another station for too long
+        """
+        try:
+            connection = connect(self.filepath_results, self.timeout)
+        except sqlite3.Error as error:
+            raise PermissionError(f"Can not open the database: {error}")
+        try:
+            connection.execute("BEGIN IMMEDIATE")  # one writer at a time, readers continue thanks to WAL
+            number = connection.execute(NEXT_NUMBER).fetchone()[0]
+            if self.fields.get("data_row_number", -1) not in [-1, number]:
+                print(f'Another station saved first, participant {self.fields["data_row_number"]} is saved as {number}.')
+            connection.execute("DELETE FROM reservations")
+            connection.execute("INSERT INTO participants (number, start, end, saved) VALUES (?, ?, ?, ?)",
+                               (number, self.fields.get("Start"), self.fields.get("End"), str(datetime.datetime.now())))
+            known = {name for name, in connection.execute("SELECT name FROM columns")}
+            connection.executemany("INSERT INTO columns (name) VALUES (?)", [(column,) for column in self.schema if column not in known])
+            connection.executemany("INSERT INTO answers (participant, qid, value) VALUES (?, ?, ?)",
+                                   [(number, qid, str(value)) for qid, value in self.fields.items() if qid != "data_row_number"])
+            connection.executemany("INSERT INTO events (participant, position, time, page, element, kind, value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   ((number, position, str(event["time"]), event["page"], event["element"], event["kind"],
+                                     None if event["value"] is None else str(event["value"])) for position, event in enumerate(self.events)))
+            connection.execute("COMMIT")
+        except sqlite3.Error as error:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise PermissionError(f"Can not write to the database: {error}")
+        finally:
+            connection.close()
+        self.fields = dict(self.fields, data_row_number=number)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the results database to a csv-file.')
+    parser.add_argument('database', help='file/path of the database', type=str)
+    parser.add_argument('csv', help='file/path of the csv-file to write', type=str)
+    parser.add_argument('-d', '--delimiter', help='delimiter of the csv-file', default=';', type=str)
+    args = parser.parse_args()
+    print(f'Exported {export_csv(args.database, args.csv, args.delimiter)} participants to {args.csv}.')
@@ -0,0 +1,350 @@
+"""
+Writes the results and the log of a questionnaire in a background thread.
+"""
+import csv
+import datetime
+import os
+import random
+import threading
+from contextlib import contextmanager
+from time import monotonic, sleep
+
+import portalocker
+from PySide6.QtCore import QObject, Signal
+
+append_lock = threading.Lock()  # only one writer of this process may append to a results file at a time
+LOCK_TIMEOUT = 10  # s, maximum time to wait for the other stations writing to the same results file
+BACKOFF = (0.02, 1)  # s, first and maximum pause between two tries to get the lock
+
+
+def counter_path(filepath_results):
+    """Get the path of the counter file belonging to a results file.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+
+    Returns
+    -------
+    str
+        file/path of the (hidden) counter file next to the results file
+    """
+    folder, name = os.path.split(filepath_results)
+    return os.path.join(folder, f'.{name}.count')
+
+
+def lock_path(filepath_results):
+    """Get the path of the lock file belonging to a results file.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+
+    Returns
+    -------
+    str
+        file/path of the (hidden) lock file next to the results file
+    """
+    folder, name = os.path.split(filepath_results)
+    return os.path.join(folder, f'.{name}.lock')
+
+
+def reservation_path(filepath_results):
+    """Get the path of the reservation file belonging to a results file.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+
+    Returns
+    -------
+    str
+        file/path of the (hidden) file holding the next free participant number
+    """
+    folder, name = os.path.split(filepath_results)
+    return os.path.join(folder, f'.{name}.next')
+
+
+@contextmanager
+def results_lock(filepath_results, timeout=LOCK_TIMEOUT):
+    """Hold the exclusive lock of a results file, shared by all processes/stations writing to it.\n
+    The lock is tried again with an exponentially growing, randomized pause until the timeout is reached.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file, its folder has to exist
+    timeout : float, default=LOCK_TIMEOUT
+        maximum time to wait for the lock in seconds
+
+    Raises
+    ------
+    PermissionError
+        if the lock couldn't be acquired in time
+    """
+    file = open(lock_path(filepath_results), 'a')
+    deadline = monotonic() + timeout
+    pause = BACKOFF[0]
+    try:
+        while True:
+            try:
+                portalocker.lock(file, portalocker.LockFlags.EXCLUSIVE | portalocker.LockFlags.NON_BLOCKING)
+                break
+            except portalocker.LockException:
+                if monotonic() >= deadline:
+                    raise PermissionError(f"The results file {filepath_results} is locked by another station.")
+                sleep(min(pause * random.uniform(0.5, 1), max(deadline - monotonic(), 0)))
+                pause = min(pause * 2, BACKOFF[1])
+        try:
+            yield
+        finally:
+            portalocker.unlock(file)
+    finally:
+        file.close()
+
+
+def participant_number(filepath_results):
+    """Get the number for the next participant, i.e. the number of rows (incl. header) of the results file.\n
+    The number is taken from the counter file, as long as it was written for the current state of the results file.
+    Otherwise, the rows are counted and the counter file is renewed.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+
+    Returns
+    -------
+    int
+        continuous number for participant
+    """
+    if not os.path.exists(filepath_results):
+        return 1
+    try:
+        with open(counter_path(filepath_results), 'r') as f:
+            rows, size, mtime = (int(value) for value in f.read().split())
+        stat = os.stat(filepath_results)
+        if size == stat.st_size and mtime == stat.st_mtime_ns:
+            return rows
+    except (OSError, ValueError):
+        pass  # no valid counter, the results file was changed by someone else
+    with open(filepath_results, "r") as csvfile:
+        reader = csv.reader(csvfile)
+        rows = sum(1 for _ in reader)
+    write_counter(filepath_results, rows)
+    return rows
+
+
+def write_counter(filepath_results, rows):
+    """Store the number of rows together with the current size and modification time of the results file.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+    rows : int
+        number of rows (incl. header) of the results file
+    """
+    try:
+        stat = os.stat(filepath_results)
+        with open(counter_path(filepath_results), 'w') as f:
+            f.write(f'{rows} {stat.st_size} {stat.st_mtime_ns}')
+    except OSError:
+        print("Could not write the participant counter.")
+
+
+def reserve_participant(filepath_results, timeout=LOCK_TIMEOUT):
+    """Reserve a number for the log, the journal and the order of the pages when a session starts.\n
+    Sessions running at the same time on several stations get different numbers. The reservations are only valid
+    as long as the results file is unchanged, so numbers of aborted sessions are given again once anyone saved.
+    The number is final only if the sessions are saved in the order they started, see ResultsWriter.append_row.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+    timeout : float, default=LOCK_TIMEOUT
+        maximum time to wait for other stations writing to the results file
+
+    Returns
+    -------
+    int
+        continuous number for participant
+
+    Raises
+    ------
+    PermissionError
+        if the results file is locked by another station for too long
+    """
+    folder = os.path.dirname(filepath_results)
+    if folder != "":
+        os.makedirs(folder, exist_ok=True)
+    with results_lock(filepath_results, timeout):
+        number = participant_number(filepath_results)
+        try:
+            stat = os.stat(filepath_results)
+            state = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            state = (-1, -1)  # no results yet
+        try:
+            with open(reservation_path(filepath_results), 'r') as f:
+                reserved, size, mtime = (int(value) for value in f.read().split())
+            if (size, mtime) == state:
+                number = max(number, reserved)
+        except (OSError, ValueError):
+            pass  # nothing reserved since the results file was changed
+        try:
+            with open(reservation_path(filepath_results), 'w') as f:
+                f.write(f'{number + 1} {state[0]} {state[1]}')
+        except OSError:
+            print("Could not write the participant reservation.")
+    return number
+
+
+class ResultsWriter(QObject):
+    """
+    Worker writing a snapshot of the answers to the results file without blocking the GUI.
+
+    Parameters
+    ----------
+    fields : dict
+        values of the row to save, the keys are the column names
+    log : iterable of str
+        the complete log of the session, e.g. rendered from the event log while it is written
+    filepath_results : str
+        file/path of the results file
+    filepath_log : str
+        file/path of the log file
+    delimiter : str
+        delimiter of the results file
+    timeout : float, default=LOCK_TIMEOUT
+        maximum time to wait for other stations writing to the results file, a backup is saved afterwards
+    schema : list[str], optional
+        columns of the results file derived from the questionnaire, by default the keys of fields
+    before : callable, optional
+        called in the background before the data is written, e.g. to stop a recording
+    """
+    finished = Signal(str)
+
+    def __init__(self, fields, log, filepath_results, filepath_log, delimiter, timeout=LOCK_TIMEOUT, schema=None, before=None):
+        super().__init__()
+        self.fields = fields
+        self.log = log
+        self.filepath_results = filepath_results
+        self.filepath_log = filepath_log
+        self.delimiter = delimiter
+        self.timeout = timeout
+        schema = list(schema if schema is not None else fields.keys())
+        known = set(schema)
+        self.schema = schema + [key for key in fields if key not in known]  # e.g. answers set after the page was built
+        self.before = before
+        self.thread = threading.Thread(target=self.run)
+
+    def start(self):
+        """Start writing in the background, finished is emitted with the path of the written file."""
+        self.thread.start()
+
+    def is_running(self):
+        """
+        Returns
+        -------
+        bool
+            True if the data is still being written
+        """
+        return self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Block until the data is written.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            maximum time to wait in seconds
+
+        Returns
+        -------
+        bool
+            True if writing is completed
+        """
+        if self.thread.ident is not None:
+            self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def run(self):
+        """Write the log and append the row to the results file, save a backup if that is not possible."""
+        if self.before is not None:
+            self.before()
+        try:
+            self.write_log()
+        except OSError:
+            print("Could not write the log file!")
+        with append_lock:
+            try:
+                self.append_row()
+            except (PermissionError, KeyError):
+                print("Can not access results file, saving backup!")
+                self.write_backup()
+        self.finished.emit(self.filepath_results)
+
+    def write_log(self):
+        """Write the log file."""
+        path = self.filepath_log.rsplit("/", 1)
+        if not os.path.exists(self.filepath_log):
+            if path[0] != "." and path[0] != "..":
+                os.makedirs(path[0] + "/", exist_ok=True)
+        with open(self.filepath_log, 'w') as log_file:
+            log_file.writelines(self.log)
+
+    def append_row(self):
+        """Append the row to the results file, the columns are ordered like in the schema or the existing header.\n
+        The participant number is allocated while the results file is locked, so that stations sharing the file
+        get unique and continuous numbers.
+
+        Raises
+        ------
+        KeyError
+            if the file lacks columns of the questionnaire, see schema.migrate
+        PermissionError
+            if the file can't be accessed or is locked by another station for too long
+        """
+        path = self.filepath_results.rsplit("/", 1)
+        if len(path) > 1 and path[0] != "." and path[0] != "..":
+            os.makedirs(path[0] + "/", exist_ok=True)
+        with results_lock(self.filepath_results, self.timeout):
+            if not os.path.exists(self.filepath_results):
+                with open(self.filepath_results, "w+", newline='', encoding='utf_8') as csvfile:
+                    writer = csv.writer(csvfile, delimiter=self.delimiter)
+                    writer.writerow(self.schema)
+                headers = self.schema
+            else:
+                with open(self.filepath_results, 'r', newline='', encoding='utf_8') as f:
+                    headers = next(csv.reader(f, delimiter=self.delimiter), None)
+            if headers is None:
+                raise KeyError("The results file has no header.")
+            if not set(self.schema) <= set(headers):  # columns of removed questions stay empty
+                raise KeyError("The columns of the results file do not fit the questionnaire, start it once with --migrate.")
+            rows = participant_number(self.filepath_results)
+            if self.fields.get("data_row_number", -1) not in [-1, rows]:
+                print(f'Another station saved first, participant {self.fields["data_row_number"]} is saved as {rows}.')
+            fields = dict(self.fields, data_row_number=rows)
+            row = [fields.get(column, "") for column in headers]
+            with open(self.filepath_results, "a", newline='', encoding='utf_8') as csvfile:
+                writer = csv.writer(csvfile, delimiter=self.delimiter)
+                writer.writerow(row)
+            write_counter(self.filepath_results, rows + 1)
+        self.fields = fields
+
+    def write_backup(self):
+        """Write the row with its own header to a separate backup file."""
+        number = self.fields["data_row_number"] if self.fields["data_row_number"] != -1 else "unknown"
+        folder = self.filepath_results.rsplit("/", 1)[0]
+        self.filepath_results = f'{folder}/{number}_backup_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.csv'
+        print(f'Backup file: {self.filepath_results}')
+        with open(self.filepath_results, "w+", newline='', encoding='utf_8') as csvfile:
+            writer = csv.writer(csvfile, delimiter=self.delimiter)
+            header = list(self.fields.keys())
+            writer.writerow(header)
+            writer.writerow([self.fields[hfield] for hfield in header])
@@ -227,6 +227,17 @@ class Slider(QSlider):
         # print("new value", value)
         return value if int(self.step) != float(self.step) else int(value)
 
+    def set_value(self, value):
+        """ Move the handle to a value of the range, e.g. to restore an answer.
+
+        Parameters
+        ----------
+        value : int or float
+            value in the range
+        """
+        self.setValue(round((value - self._min) / self.step))
+        self.moved = self.moved or value != self.start
+
     def get_moved(self):
         """ Return whether the slider has been touched by the user.
 
@@ -307,7 +318,7 @@ class Slider(QSlider):
         self.setTickPosition(tickpos)
         self.sid = sid
 
-        if hasattr(self.parent(), "page_log"):  # awkward workaround to reference "Page"
+        if hasattr(self.parent(), "log_event"):  # awkward workaround to reference "Page"
             sheet = self.parent().parent().styleSheet()
             sheet = sheet[sheet.find("Slider::groove"):]
             sheet = sheet[:sheet.find("}")]
@@ -9,7 +9,7 @@ from PySide6.QtWidgets import QSizePolicy, QMessageBox
 from PySide6.QtCore import QRegularExpression
 
 from MessageBox import ResizeMessageBox
-from tools import fields_per_type, player_buttons, policy_possibilities, randomize_options, image_positions, video_player
+from tools import fields_per_type, player_buttons, policy_possibilities, randomize_options, image_positions, video_player, results_backends
 
 
 def validate_passwords(file, policy):
@@ -549,6 +549,20 @@ def validate_questionnaire(structure, suppress=False):
         warning_found = True
         warning_details.append("No option for 'go_back' found, using False as default value.\n")
 
+    if "lazy_loading" in structure.keys():
+        try:
+            _ = structure.as_bool("lazy_loading")
+        except ValueError:
+            error_found = True
+            error_details.append("No valid value found for 'lazy_loading'.\n")
+
+    if "osc_bundles" in structure.keys():
+        try:
+            _ = structure.as_bool("osc_bundles")
+        except ValueError:
+            error_found = True
+            error_details.append("No valid value found for 'osc_bundles'.\n")
+
     if "back_text" in structure.keys():
         if "go_back" not in structure.keys() or not structure.as_bool("go_back"):
             warning_found = True
@@ -570,6 +584,10 @@ def validate_questionnaire(structure, suppress=False):
         error_found = True
         error_details.append("Invalid delimiter found. It can only have one character.\n")
 
+    if "results_backend" in structure.keys() and structure["results_backend"] not in results_backends:
+        error_found = True
+        error_details.append("Invalid value for results_backend.\n")
+
     if "filepath_results" in structure.keys():
         if not path.exists(path.dirname(structure["filepath_results"])):
             warning_found = True
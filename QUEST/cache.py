@@ -0,0 +1,185 @@
+"""On-disk cache of compiled (listified and validated) questionnaires."""
+import hashlib
+import os
+
+import msgpack as serializer
+from configobj import ConfigObj
+
+CACHE_FORMAT = 1
+CACHE_FOLDER = ".quest_cache"
+_TUPLE = 1  # msgpack extension type code for tuples (e.g. from ast.literal_eval)
+
+
+def cache_path(file):
+    """Get the path of the cache file belonging to a questionnaire file.
+
+    Parameters
+    ----------
+    file : str
+        file/path to the questionnaire config file
+
+    Returns
+    -------
+    str
+        file/path of the cache file
+    """
+    folder, name = os.path.split(os.path.abspath(file))
+    return os.path.join(folder, CACHE_FOLDER, f'{name}.msgpack')
+
+
+def referenced_files(structure):
+    """Collect all paths the validation of the questionnaire depends on.
+
+    Parameters
+    ----------
+    structure : ConfigObj
+        the compiled questionnaire structure
+
+    Returns
+    -------
+    list[str]
+        paths of referenced files/folders
+    """
+    files = []
+    for key in ["stylesheet", "randomization_file"]:
+        if key in structure.keys() and structure[key] not in ["", None]:
+            files.append(structure[key])
+    if "filepath_results" in structure.keys():
+        files.append(os.path.dirname(structure["filepath_results"]))
+    for page in structure.sections:
+        for quest in structure[page].sections:
+            for key in ["password_file", "image_file"]:
+                if key in structure[page][quest].keys() and structure[page][quest][key] not in ["", None]:
+                    files.append(structure[page][quest][key])
+    return list(dict.fromkeys(files))
+
+
+def fingerprint(path, content_hash=True):
+    """Describe the current state of a file or folder.
+
+    Parameters
+    ----------
+    path : str
+        file/path to describe
+    content_hash : bool, default=True
+        if True, the hash of the file content is included
+
+    Returns
+    -------
+    list
+        absolute path, existence, mtime in ns, size and sha256 of the content
+    """
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, False, 0, 0, ""]
+    digest = ""
+    if content_hash and os.path.isfile(path):
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    return [path, True, stat.st_mtime_ns, stat.st_size, digest]
+
+
+def unchanged(stored):
+    """Check if a file or folder is still in the state it was in when the cache was written.
+
+    Parameters
+    ----------
+    stored : list
+        fingerprint of the file at the time of caching
+
+    Returns
+    -------
+    bool
+    """
+    current = fingerprint(stored[0], content_hash=False)
+    if current[1] != stored[1]:
+        return False
+    if not current[1] or current[2:4] == stored[2:4]:
+        return True
+    return fingerprint(stored[0])[4] == stored[4]  # touched, but maybe not modified
+
+
+def _encode(value):
+    if isinstance(value, dict):  # ConfigObj and its sections
+        return {key: _encode(value[key]) for key in value}
+    if isinstance(value, tuple):
+        return serializer.ExtType(_TUPLE, serializer.packb([_encode(v) for v in value], use_bin_type=True))
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _ext_hook(code, data):
+    if code == _TUPLE:
+        return tuple(serializer.unpackb(data, raw=False, ext_hook=_ext_hook))
+    return serializer.ExtType(code, data)
+
+
+def load_compiled(file, version):
+    """Load the compiled questionnaire from the cache, if it is still valid.
+
+    Parameters
+    ----------
+    file : str
+        file/path to the questionnaire config file
+    version : str
+        version of QUEST the cache has to be created with
+
+    Returns
+    -------
+    tuple or None
+        (structure, warning_found, warning_details) or None if there is no valid cache
+    """
+    try:
+        with open(cache_path(file), "rb") as f:
+            cached = serializer.unpackb(f.read(), raw=False, ext_hook=_ext_hook)
+        if cached["format"] != CACHE_FORMAT or cached["version"] != version or \
+                cached["cwd"] != os.getcwd() or not unchanged(cached["config"]):
+            return None
+        for stored in cached["files"]:
+            if not unchanged(stored):
+                return None
+        structure = ConfigObj()
+        for key, value in cached["structure"].items():
+            structure[key] = value
+        return structure, cached["warning_found"], cached["warning_details"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_compiled(file, structure, warning_found, warning_details, version):
+    """Write the compiled questionnaire to the cache.
+
+    Parameters
+    ----------
+    file : str
+        file/path to the questionnaire config file
+    structure : ConfigObj
+        the listified and validated questionnaire structure
+    warning_found : bool
+        whether the validation found warnings
+    warning_details : list[str]
+        the text of the warnings
+    version : str
+        version of QUEST
+    """
+    cached = {
+        "format": CACHE_FORMAT,
+        "version": version,
+        "cwd": os.getcwd(),
+        "config": fingerprint(file),
+        "files": [fingerprint(path) for path in referenced_files(structure)],
+        "warning_found": warning_found,
+        "warning_details": warning_details,
+        "structure": _encode(structure)
+    }
+    path = cache_path(file)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f'{path}.tmp', "wb") as f:
+            f.write(serializer.packb(cached, use_bin_type=True))
+        os.replace(f'{path}.tmp', path)
+    except OSError:
+        print("Could not write questionnaire cache.")
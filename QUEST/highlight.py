@@ -0,0 +1,39 @@
+"""
+Highlighting of unanswered questions via the dynamic property 'required', so only the affected widgets are restyled.
+"""
+import re
+
+# '#required' as a whole selector, e.g. in 'QLabel#required', but not '#required_text'
+REQUIRED_SELECTOR = re.compile(r'#required(?![\w-])')
+
+
+def compatible_stylesheet(css):
+    """Translate the former selectors by objectName to the property, so existing stylesheets keep working.
+
+    Parameters
+    ----------
+    css : str
+        the stylesheet of the questionnaire
+
+    Returns
+    -------
+    str
+        the stylesheet with '#required' replaced by '[required="true"]'
+    """
+    return REQUIRED_SELECTOR.sub('[required="true"]', css)
+
+
+def set_required(widget, required):
+    """Highlight a widget or remove its highlight.\n
+    The widget is only repolished with the stylesheet that was already parsed for the window.
+
+    Parameters
+    ----------
+    widget : QWidget
+        the widget
+    required : bool
+        True to highlight the widget
+    """
+    widget.setProperty("required", required)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
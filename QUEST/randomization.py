@@ -1,6 +1,9 @@
 """Different randomization methods"""
+import os
 from math import floor
 
+_orders = {}  # file -> (mtime, parsed orders), see order_from_file
+
 
 def balanced_latin_squares(n):
     """
@@ -25,8 +28,30 @@ def balanced_latin_squares(n):
     return latin
 
 
+def williams_row(n, row):
+    """
+        Creates a single row of the balanced latin square of size n without building the square, see balanced_latin_squares.
+
+        Parameters
+        ----------
+        n : int
+            size of the square / number of stimuli
+        row : int
+            index of the row, wraps around after n (even n) or 2n (odd n) rows
+
+        Returns
+        -------
+        list[int]
+            order of the stimuli, starting at 1
+    """
+    row %= n if n % 2 == 0 else 2 * n
+    order = [(((j + 1) // 2 if j % 2 else n - j // 2) + row) % n + 1 for j in range(n)]
+    return order[::-1] if row >= n else order
+
+
 def order_from_file(file):
-    """Load custom randomization orders from file.
+    """Load custom randomization orders from file.\n
+    The parsed orders are kept until the file is modified, so they must not be changed by the caller.
 
     Parameters
     ----------
@@ -38,10 +63,44 @@ def order_from_file(file):
     list[list[int]]
         list of orders
     """
+    mtime = os.stat(file).st_mtime_ns
+    if file in _orders and _orders[file][0] == mtime:
+        return _orders[file][1]
     with open(file) as f:
         orders = f.read().splitlines()
     for row, order in enumerate(orders):
         orders[row] = order.split(",")
         for entry in range(0, len(orders[row])):
             orders[row][entry] = int(orders[row][entry])
+    _orders[file] = (mtime, orders)
     return orders
+
+
+def participant_orders(method, sizes, number, file=None):
+    """Compute the orders of all random groups for one participant.
+
+    Parameters
+    ----------
+    method : str
+        "balanced latin square" or "from file"
+    sizes : list[int]
+        number of pages of each random group
+    number : int
+        number of the participant, starting at 1
+    file : str, optional
+        file of custom orders, used for "from file", one row per participant.
+        If there are more participants than rows, the rows are used again from the top.
+
+    Returns
+    -------
+    list[list[int]]
+        order of each group, starting at 1
+    """
+    if method == "balanced latin square":
+        return [williams_row(size, number - 1) for size in sizes]
+    elif method == "from file":
+        orders = order_from_file(file)
+        if number > len(orders):
+            print(f"{file} has only {len(orders)} orders, participant {number} gets the order of participant {(number - 1) % len(orders) + 1}.")
+        return [orders[(number - 1) % len(orders)] for _ in sizes]
+    return [list(range(1, size + 1)) for size in sizes]
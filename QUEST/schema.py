@@ -0,0 +1,178 @@
+"""Columns of the results file derived from the questionnaire, and migration of existing results files."""
+import csv
+import os
+
+from ResultsWriter import participant_number, results_lock, write_counter
+
+
+def _count(value):
+    """Number of entries of a listified value, single entries are kept as string."""
+    return 1 if isinstance(value, str) else len(value)
+
+
+def question_columns(question):
+    """Get the columns of a single question, ordered like they are collected from the page.
+
+    Parameters
+    ----------
+    question : Section
+        the question of the compiled questionnaire
+
+    Returns
+    -------
+    list[str]
+        column names, empty if the question doesn't produce any results
+    """
+    if "type" not in question.keys() or question["type"] in ["Plain Text", "HLine", "Image"]:
+        return []
+    qid = question["id"]
+    if question["type"] == "ABX":
+        columns = [f'{qid}_order', f'{qid}_answer', f'{qid}_duration_A', f'{qid}_duration_B']
+        if "x" in question.keys() and question.as_bool("x"):
+            columns.append(f'{qid}_duration_X')
+        return columns
+    elif question["type"] == "Matrix":
+        questions = _count(question["questions"])
+        return [f'{qid}_{q:02d}' if questions >= 10 else f'{qid}_{q}' for q in range(1, questions + 1)] + [f'{qid}_order']
+    elif question["type"] == "Check":
+        return [f'{qid}_{c}' for c in range(_count(question["answers"]))]
+    elif question["type"] == "MUSHRA":  # durations, then the sliders without the reference
+        return [qid] + [f'{qid}_{sl + 1}' for sl in range(_count(question["start_cues"]) - 1)]
+    return [qid]
+
+
+def _slider_start(minimum, maximum, start, step):
+    """Value of an untouched slider, the start is moved to the closest step within the range, see Slider.prepare_slider."""
+    steps = int((maximum - minimum) / step)
+    position = min(max(round((start - minimum) / step), min(steps, 0)), max(steps, 0))
+    value = minimum + position * step
+    if int(step) != float(step):
+        return round(value, str(step)[::-1].find('.'))
+    return int(value)
+
+
+def question_defaults(question):
+    """Get the values of a question the participant never saw, like they are collected from an untouched page.\n
+    The order of randomized stimuli or questions is left empty, as nothing was presented.
+
+    Parameters
+    ----------
+    question : Section
+        the question of the compiled questionnaire
+
+    Returns
+    -------
+    dict
+        the values, the keys are the column names, see question_columns
+    """
+    columns = question_columns(question)
+    if len(columns) == 0:
+        return {}
+    qid = question["id"]
+    if question["type"] == "ABX":
+        return {column: -1 if column == f'{qid}_answer' else [] for column in columns}
+    elif question["type"] == "Matrix":
+        randomize = "randomize" in question.keys() and question.as_bool("randomize")
+        values = {column: -1 for column in columns[:-1]}
+        values[f'{qid}_order'] = [] if randomize else list(range(1, len(columns)))
+        return values
+    elif question["type"] == "Check":
+        return {column: False for column in columns}
+    elif question["type"] == "MUSHRA":
+        return {column: [] if column == qid else 100 for column in columns}
+    elif question["type"] == "Radio":
+        return {qid: -1}
+    elif question["type"] in ["Button", "OSCButton"]:
+        return {qid: False}
+    elif question["type"] == "Player":
+        return {qid: []}
+    elif question["type"] == "Slider":
+        return {qid: _slider_start(question.as_float("min"), question.as_float("max"), question.as_float("start"), question.as_float("step"))}
+    return {qid: ""}  # Text, Password
+
+
+def page_defaults(page):
+    """Get the values of a page the participant never saw, without building it.
+
+    Parameters
+    ----------
+    page : Section
+        the page of the compiled questionnaire
+
+    Returns
+    -------
+    dict
+        the values, the keys are the column names of the results file
+    """
+    values = {}
+    for quest in page.sections:
+        values.update(question_defaults(page[quest]))
+    return values
+
+
+def results_schema(structure, osc=False, order=False):
+    """Derive all columns of the results file from the compiled questionnaire, in the order of its pages.
+
+    Parameters
+    ----------
+    structure : ConfigObj
+        the compiled questionnaire structure
+    osc : bool, default=False
+        True if the message of the global OSC receiver is saved for every page
+    order : bool, default=False
+        True if the order of the random groups is saved
+
+    Returns
+    -------
+    list[str]
+        column names of the results file
+    """
+    columns = ["data_row_number"]
+    for page in structure.sections:
+        for quest in structure[page].sections:
+            columns += question_columns(structure[page][quest])
+        if osc:
+            columns.append(f'OSCMessage_{page}')
+    if order:
+        columns.append("Order")
+    return columns + ["Start", "End"]
+
+
+def migrate(filepath_results, schema, delimiter):
+    """Rewrite an existing results file with the union of its header and the schema, e.g. after questions were added.\n
+    The rows are copied in a single streaming pass, the new columns are appended and left empty.
+
+    Parameters
+    ----------
+    filepath_results : str
+        file/path of the results file
+    schema : list[str]
+        columns of the questionnaire, see results_schema
+    delimiter : str
+        delimiter of the results file
+
+    Returns
+    -------
+    list[str]
+        the header of the results file after the migration, None if there is no results file
+    """
+    if not os.path.exists(filepath_results):
+        return None
+    with results_lock(filepath_results):
+        rows = participant_number(filepath_results)
+        with open(filepath_results, 'r', newline='', encoding='utf_8') as source:
+            reader = csv.reader(source, delimiter=delimiter)
+            header = next(reader, [])
+            added = [column for column in schema if column not in set(header)]
+            if len(added) == 0:
+                return header
+            temp = f'{filepath_results}.migrate'
+            with open(temp, 'w', newline='', encoding='utf_8') as target:
+                writer = csv.writer(target, delimiter=delimiter)
+                writer.writerow(header + added)
+                for row in reader:
+                    writer.writerow(row + [""] * (len(header) - len(row) + len(added)))
+        os.replace(temp, filepath_results)
+        write_counter(filepath_results, rows)
+    print(f'Added the columns {", ".join(added)} to {filepath_results}.')
+    return header + added
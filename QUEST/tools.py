@@ -52,6 +52,7 @@ tooltips = {
     "pagecount_text": "Text displaying the number of the current page. Use {} as placeholder for the actual number.",
     "filepath_results": "Path to the destination/csv-file which the results should be saved to.",
     "delimiter": "Delimiter to use for the csv-file.",
+    "results_backend": "Where the results are saved. SQLite writes all sessions to a database next to the results file (same name, extension .sqlite), which several stations can share.",
     "stylesheet": "Path to the stylesheet file to use.",
     "inscription": "Text to display on the button.",
     "function": "Functionality of the button.",
@@ -84,7 +85,9 @@ tooltips = {
     "receiver": "IP and port of the OSC receiver to send to.",
     "step": "Difference of two successive values.",
     "video_player": "Choose the video player that will be used.",
-    "audio_recv_port": "Port to receive messages from Reaper on."
+    "audio_recv_port": "Port to receive messages from Reaper on.",
+    "lazy_loading": "Build each page only when it is displayed for the first time. Speeds up the start of long questionnaires.",
+    "osc_bundles": "Send all OSC messages of one playback command (e.g. switching tracks) as a single bundle, so REAPER applies them at once."
 }
 
 # question types and their fields
@@ -136,6 +139,8 @@ image_positions = ["here", "top", "bottom", "left", "right", "free"]
 
 video_player = ["None", "MadMapper", "VLC"]
 
+results_backends = ["CSV", "SQLite"]
+
 # page fields
 page_fields = ["title", "description", "randomgroup", "pupil_on_next"]
 
@@ -166,10 +171,13 @@ general_fields = [
     "pagecount_text",
     "filepath_results",
     "delimiter",
+    "results_backend",
     "stylesheet",
     "button_fade",
     "randomization",
-    "randomization_file"
+    "randomization_file",
+    "lazy_loading",
+    "osc_bundles"
 ]
 
 default_values = {
@@ -197,6 +205,7 @@ default_values = {
     "pagecount_text": "Seite {} von {}",
     "filepath_results": './results/results.csv',
     "delimiter": ';',
+    "results_backend": results_backends[0],
     "stylesheet": './stylesheets/minimal.qss',
     "title": "",
     "id": "",
@@ -232,5 +241,7 @@ default_values = {
     "height": "",
     "image_position": "here",
     "receiver": [],
-    "address": ""
+    "address": "",
+    "lazy_loading": False,
+    "osc_bundles": False
 }
@@ -666,6 +666,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
     assert run.Stack.count() == 1
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_abx.csv', mode='r') as file:
@@ -689,6 +690,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -731,6 +733,7 @@ def test_execute_questionnaire_ab(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_abx.csv', mode='r') as file:
@@ -772,6 +775,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                 QTest.mouseClick(child.answer.button(0), Qt.MouseButton.LeftButton, delay=1000)
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -808,6 +812,7 @@ def test_execute_questionnaire_no_interaction_x(run2, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run2.forwardbutton, Qt.MouseButton.LeftButton)
+    run2.results_writer.wait()
 
     results = []
     with open('./tests/results/results_abx.csv', mode='r') as file:
@@ -832,6 +837,7 @@ def test_execute_questionnaire_no_interaction_x_blocked(run2, qtbot):
         assert run2.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run2.forwardbutton, Qt.MouseButton.LeftButton)
+        run2.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -883,6 +889,7 @@ def test_execute_questionnaire_abx(run2, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run2.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run2.results_writer.wait()
 
     results = []
     with open('./tests/results/results_abx.csv', mode='r') as file:
@@ -931,6 +938,7 @@ def test_execute_questionnaire_abx_blocked(run2, qtbot):
                 QTest.mouseClick(child.answer.button(0), Qt.MouseButton.LeftButton, delay=1000)
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run2.forwardbutton, Qt.MouseButton.LeftButton)
+        run2.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -0,0 +1,82 @@
+"""Testing the background annotation pipeline in AnnotationSender.py"""
+import threading
+import time
+
+import msgpack
+import zmq
+
+from tests.context import pytest, AnnotationSender, Button
+
+
+@pytest.fixture
+def pupil():
+    """Minimal Pupil Remote answering PUB_PORT and a SUB socket as backbone, served by a thread collecting the annotations."""
+    ctx = zmq.Context()
+    sub = ctx.socket(zmq.SUB)
+    sub.setsockopt(zmq.SUBSCRIBE, b"")
+    pub_port = sub.bind_to_random_port("tcp://127.0.0.1")
+    rep = ctx.socket(zmq.REP)
+    port = rep.bind_to_random_port("tcp://127.0.0.1")
+    received = []
+    stop = threading.Event()
+
+    def serve():  # the sockets have to be polled all the time, otherwise the subscription isn't sent
+        poller = zmq.Poller()
+        poller.register(rep, zmq.POLLIN)
+        poller.register(sub, zmq.POLLIN)
+        while not stop.is_set():
+            events = dict(poller.poll(50))
+            if rep in events:
+                rep.recv_string()
+                rep.send_string(str(pub_port))
+            if sub in events:
+                received.append(sub.recv_multipart())
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield ctx, port, received
+    stop.set()
+    thread.join()
+    rep.close()
+    sub.close()
+    ctx.term()
+
+
+def test_publish(pupil):
+    ctx, port, received = pupil
+    sender = AnnotationSender(ctx, "127.0.0.1", port)
+    sender.start()
+    trigger = Button.new_trigger("stimulus 1")
+    assert sender.send(trigger)
+    assert sender.flush(5)
+    deadline = time.monotonic() + 1
+    while len(received) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(received) == 1
+    topic, payload = received[0]
+    assert topic == b"annotation"
+    assert msgpack.loads(payload) == trigger
+    assert sender.sent == 1
+    sender.close()
+    assert not sender.thread.is_alive()
+
+
+def test_bounded():
+    sender = AnnotationSender(None, "127.0.0.1", 50020, queue_size=2)  # not started
+    assert sender.send(Button.new_trigger("1"))
+    assert sender.send(Button.new_trigger("2"))
+    assert not sender.send(Button.new_trigger("3"))
+    assert sender.dropped == 1
+    assert not sender.flush(0.1)
+
+
+def test_unreachable(capfd):
+    ctx = zmq.Context()
+    sender = AnnotationSender(ctx, "127.0.0.1", 1)
+    sender.start()
+    assert sender.send(Button.new_trigger("lost"))  # the GUI isn't blocked
+    assert not sender.flush(0.5)
+    sender.close()
+    assert not sender.thread.is_alive()
+    out, _ = capfd.readouterr()
+    assert "Couldn't connect with Pupil Capture!" in out
+    ctx.term()
@@ -0,0 +1,68 @@
+"""Testing the bundling of OSC messages in BundleClient.py"""
+import socket
+
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_message import OscMessage
+from pythonosc.udp_client import SimpleUDPClient
+
+from tests.context import pytest, BundleClient, bundle
+
+
+@pytest.fixture
+def receiver():
+    """Provide a UDP socket to receive the raw datagrams."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+def receive_all(sock):
+    datagrams = []
+    sock.settimeout(0.2)
+    try:
+        while True:
+            datagrams.append(sock.recv(65535))
+    except socket.timeout:
+        pass
+    return datagrams
+
+
+def test_bundle(receiver):
+    client = BundleClient("127.0.0.1", receiver.getsockname()[1])
+    with client.bundle():
+        for i in range(1, 49):
+            client.send_message(f'/track/{i}/mute', 1 if i != 3 else 0)
+        with bundle(client):  # nested, e.g. another player is stopped
+            client.send_message("/stop", 1)
+        client.send_message("/play", 1)
+    datagrams = receive_all(receiver)
+    assert len(datagrams) == 1
+    assert OscBundle.dgram_is_bundle(datagrams[0])
+    messages = [(msg.address, msg.params) for msg in OscBundle(datagrams[0])]
+    assert messages[0] == ("/track/1/mute", [1])
+    assert messages[2] == ("/track/3/mute", [0])
+    assert messages[-2:] == [("/stop", [1]), ("/play", [1])]
+    assert len(messages) == 50
+
+
+def test_single_message(receiver):
+    client = BundleClient("127.0.0.1", receiver.getsockname()[1])
+    with client.bundle():
+        client.send_message("/pause", 1)
+    datagrams = receive_all(receiver)
+    assert len(datagrams) == 1
+    assert OscMessage(datagrams[0]).address == "/pause"
+
+
+def test_disabled(receiver):
+    for client in [BundleClient("127.0.0.1", receiver.getsockname()[1], bundles=False),
+                   SimpleUDPClient("127.0.0.1", receiver.getsockname()[1])]:
+        with bundle(client):
+            client.send_message("/stop", 1)
+            client.send_message("/play", 1)
+        datagrams = receive_all(receiver)
+        assert [OscMessage(d).address for d in datagrams] == ["/stop", "/play"]
+    with bundle(None):
+        pass
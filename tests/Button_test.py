@@ -200,7 +200,7 @@ def test_inscription(gui_load, qtbot, capfd):
             QTest.qWait(1000)
             out, err = capfd.readouterr()
             assert out.index("Trigger {'topic': 'annotation', 'label': 'test', 'timestamp':") != -1
-            assert out.endswith(", 'duration': 1} Message forwarded.\n")
+            assert out.endswith(", 'duration': 1} published\n")
             
     QTimer.singleShot(1000, handle_dialog)
     QTest.mouseClick(test_gui.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
@@ -231,7 +231,7 @@ def test_inscription(gui_load, qtbot, capfd):
             QTest.qWait(500)
             out, err = capfd.readouterr()
             assert out.index("Trigger {'topic': 'annotation', 'label': 'test', 'timestamp':") != -1
-            assert out.endswith(", 'duration': 1} Message forwarded.\n")
+            assert out.endswith(", 'duration': 1} published\n")
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(test_gui.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
     test_gui.close()
@@ -292,7 +292,7 @@ def test_custom_annotation_text(gui_load, qtbot, capfd):
             child.button.click()
             out, err = capfd.readouterr()
             assert out.index("Trigger {'topic': 'annotation', 'label': 'Custom text', 'timestamp':") != -1
-            assert out.endswith(", 'duration': 1} Message forwarded.\n")
+            assert out.endswith(", 'duration': 1} published\n")
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(test_gui.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
@@ -475,7 +475,7 @@ def test_function(gui_load, qtbot, capfd):
             child.button.click()
             out, err = capfd.readouterr()
             assert out.index("Trigger {'topic': 'annotation', 'label': 'test', 'timestamp':") != -1
-            assert out.endswith(", 'duration': 1} Message forwarded.\n")
+            assert out.endswith(", 'duration': 1} published\n")
             QTest.qWait(500)
     test_gui.close()
 
@@ -538,6 +538,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pb.csv', mode='r') as file:
@@ -564,6 +565,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -598,10 +600,11 @@ def test_execute_questionnaire(run, qtbot, capfd):
             child.button.click()
             out, err = capfd.readouterr()
             assert out.startswith("Trigger {'topic': 'annotation', 'label': 'test', 'timestamp':")
-            assert out.endswith(", 'duration': 1} Message forwarded.\n")
+            assert out.endswith(", 'duration': 1} published\n")
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pb.csv', mode='r') as file:
@@ -632,9 +635,10 @@ def test_execute_questionnaire_blocked(run, qtbot, capfd):
                 child.button.click()
                 out, err = capfd.readouterr()
                 assert out.startswith("Trigger {'topic': 'annotation', 'label': 'test', 'timestamp':")
-                assert out.endswith(", 'duration': 1} Message forwarded.\n")
+                assert out.endswith(", 'duration': 1} published\n")
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
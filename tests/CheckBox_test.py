@@ -195,6 +195,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_cb.csv', mode='r') as file:
@@ -226,6 +227,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -266,6 +268,7 @@ def test_execute_questionnaire(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_cb.csv', mode='r') as file:
@@ -296,6 +299,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                 cb_cnt += 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -0,0 +1,98 @@
+"""Testing the background connection monitor in ConnectionMonitor.py"""
+import sys
+import threading
+
+import zmq
+
+from tests.context import pytest, ConnectionMonitor, icmp_probe, zmq_probe
+
+
+class FakeProbe:
+    """Probe whose answer can be switched by the test."""
+    def __init__(self, up=True):
+        self.up = up
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.up
+
+
+def test_transitions(qtbot):
+    monitor = ConnectionMonitor(interval=0.05)
+    probe = FakeProbe()
+    monitor.add_endpoint("audio", probe)
+    assert monitor.is_up("audio") is None
+    with qtbot.waitSignal(monitor.connection_changed, timeout=1000) as blocker:
+        monitor.start()
+    assert blocker.args == ["audio", True]
+    assert monitor.is_up("audio")
+    with qtbot.waitSignal(monitor.connection_changed, timeout=1000) as blocker:
+        probe.up = False
+    assert blocker.args == ["audio", False]
+    assert not monitor.is_up("audio")
+    with qtbot.assertNotEmitted(monitor.connection_changed, wait=200):
+        pass  # no signal as long as the state doesn't change
+    monitor.stop()
+    assert not monitor.thread.is_alive()
+
+
+def test_seen(qtbot):
+    monitor = ConnectionMonitor(interval=10)
+    probe = FakeProbe(up=False)
+    monitor.add_endpoint("audio", probe)
+    monitor.seen("audio")
+    monitor.seen("video")  # not monitored
+    monitor.heartbeat()
+    assert probe.calls == 0  # a message was received recently, no need to probe
+    assert monitor.is_up("audio")
+    assert monitor.is_up("video") is None
+
+
+def test_unknown(qtbot):
+    monitor = ConnectionMonitor(interval=10)
+    probe = FakeProbe(up=None)  # e.g. no permission to ping
+    monitor.add_endpoint("audio", probe)
+    with qtbot.assertNotEmitted(monitor.connection_changed):
+        monitor.heartbeat()
+    assert monitor.is_up("audio") is None
+    probe.up = True
+    monitor.heartbeat()
+    probe.up = None
+    with qtbot.assertNotEmitted(monitor.connection_changed):
+        monitor.heartbeat()
+    assert monitor.is_up("audio")  # the last known state is kept
+
+
+def test_down_from_start(qtbot):
+    monitor = ConnectionMonitor(interval=10)
+    monitor.add_endpoint("video", FakeProbe(up=False))
+    with qtbot.waitSignal(monitor.connection_changed, timeout=1000) as blocker:
+        monitor.heartbeat()
+    assert blocker.args == ["video", False]  # reported even though it never answered
+    assert monitor.is_up("video") is False
+
+
+def test_icmp_probe_error(monkeypatch):
+    def ping(host, timeout):
+        raise PermissionError("no raw socket")
+    monkeypatch.setattr(sys.modules[ConnectionMonitor.__module__], "ping", ping)
+    assert icmp_probe("127.0.0.1", 0.1)() is None
+
+
+def test_zmq_probe(qtbot):
+    context = zmq.Context()
+    rep = context.socket(zmq.REP)
+    port = rep.bind_to_random_port("tcp://127.0.0.1")
+
+    def answer():
+        if rep.poll(2000):
+            rep.recv_string()
+            rep.send_string("1.23")
+    thread = threading.Thread(target=answer)
+    thread.start()
+    assert zmq_probe(context, f'tcp://127.0.0.1:{port}', 1)()
+    thread.join()
+    rep.close()
+    assert not zmq_probe(context, f'tcp://127.0.0.1:{port}', 0.2)()
+    context.term()
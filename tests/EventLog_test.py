@@ -0,0 +1,52 @@
+"""Testing the structured event log in EventLog.py"""
+import datetime
+import json
+import re
+
+from tests.context import pytest, EventLog, render_event, os
+
+START = datetime.datetime(2024, 1, 2, 3, 4, 5, 678)
+
+
+def test_render_event():
+    assert render_event({"time": START.isoformat(), "page": None, "element": None, "kind": "page", "value": 2}) == \
+        "2024-01-02 03:04:05 - Changed to Page 2"
+    assert render_event({"time": START.isoformat(), "page": "Page 1", "element": "sl", "kind": "changed", "value": 3}) == \
+        "\t2024-01-02 03:04:05 - Changed sl to 3"
+
+
+def test_in_memory():
+    log = EventLog()
+    log.log("started", time=START)
+    log.log("toggled", "cb", True, page="Page 1", time=START)
+    assert len(log) == 2
+    assert "".join(log.render()) == "2024-01-02 03:04:05 - Started GUI\n\t2024-01-02 03:04:05 - Toggled cb to True"
+
+
+def test_streamed(tmp_path):
+    path = os.path.join(tmp_path, "events.jsonl")
+    log = EventLog()
+    log.log("started", time=START)  # before the file is known
+    log.open(path)
+    for value in range(100):
+        log.log("changed", "sl", value, page="Page 1", time=START)
+    snapshot = len(log)
+    log.log("page", value=2, time=START)
+    log.flush()
+    with open(path, "r", encoding="utf_8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 102
+    assert records[0]["kind"] == "started"
+    assert records[50] == {"time": START.isoformat(), "page": "Page 1", "element": "sl", "kind": "changed", "value": 49}
+    text = "".join(log.render(snapshot))
+    assert text.count("\n") == 100
+    assert text.endswith("Changed sl to 99")
+    log.close()
+    assert not log.thread.is_alive()
+    assert len(list(log.events())) == 102
+
+
+def test_emojis_removed():
+    log = EventLog()
+    log.log("changed", "txt", "hi \U0001F600", page="Page 1", time=START)
+    assert "".join(log.render(pattern=re.compile("\U0001F600"))) == "\t2024-01-02 03:04:05 - Changed txt to hi "
@@ -558,6 +558,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
             assert child.y() == 400
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_img.csv', mode='r') as file:
@@ -582,6 +583,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
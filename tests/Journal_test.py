@@ -0,0 +1,94 @@
+"""Testing the answer journal in Journal.py and resuming a session in GUI.py"""
+import json
+
+from tests.context import pytest, Journal, load_journal, latest_journal, StackedWindowGui, QTest, QTimer, Qt, handle_dialog, csv, os
+
+
+def test_journal(tmp_path):
+    path = os.path.join(tmp_path, "journal_1_x.jsonl")
+    journal = Journal(path)
+    journal.record("session", participant=1, start="2024-01-02T03:04:05", order=["Page 1", "Page 2"], file="q.txt")
+    journal.record("page", index=0, page="Page 1", current=1, answers={"rb": 1})
+    journal.record("page", index=1, page="Page 2", current=0, answers={"sl": 3})
+    journal.record("page", index=0, page="Page 1", current=1, answers={"rb": 0})
+    journal.close()
+    session = load_journal(path)
+    assert session["participant"] == 1
+    assert session["order"] == ["Page 1", "Page 2"]
+    assert session["pages"] == {0: {"rb": 0}, 1: {"sl": 3}}
+    assert session["current"] == 1
+    assert not session["saved"]
+    assert latest_journal(tmp_path) == path
+
+    with open(path, "a", encoding="utf_8") as f:
+        f.write('{"type": "page", "index": 1, "pa')  # crashed while writing
+    assert load_journal(path)["pages"][1] == {"sl": 3}
+
+    journal = Journal(path)
+    journal.record("saved")
+    journal.flush()
+    assert load_journal(path)["saved"]
+    assert latest_journal(tmp_path) is None
+    journal.close()
+
+
+# noinspection PyArgumentList
+def test_resume(qtbot):
+    if os.path.exists("./tests/results/"):
+        [os.remove('./tests/results/' + fil) for fil in os.listdir('./tests/results/')]
+    crashed = StackedWindowGui(os.path.join(os.getcwd(), "tests/resumetest.txt"))
+    crashed.Stack.currentWidget().evaluationvars["rb"].button(1).setChecked(True)
+    crashed.Stack.currentWidget().evaluationvars["tf"].setText("some text")
+    QTest.mouseClick(crashed.forwardbutton, Qt.MouseButton.LeftButton)
+    crashed.Stack.currentWidget().evaluationvars["sl"].set_value(3)
+    crashed.Stack.currentWidget().evaluationvars["cb_1"].setChecked(True)
+    QTest.mouseClick(crashed.forwardbutton, Qt.MouseButton.LeftButton)
+    QTest.mouseClick(crashed.backbutton, Qt.MouseButton.LeftButton)
+    assert crashed.Stack.currentIndex() == 1
+    crashed.journal.close()  # the session crashes here, nothing was saved
+    crashed.hide()
+    with open(crashed.journal.filepath, "r", encoding="utf_8") as f:
+        assert [json.loads(line)["type"] for line in f] == ["session", "page", "page", "page"]
+
+    run = StackedWindowGui(os.path.join(os.getcwd(), "tests/resumetest.txt"), resume=True)
+    assert run.journal.filepath == crashed.journal.filepath
+    assert run.start == crashed.start
+    assert run.Stack.currentIndex() == 1
+    assert run.backbutton.isEnabled()
+    assert run.Stack.widget(0).evaluationvars["rb"].checkedId() == 1
+    assert run.Stack.widget(0).evaluationvars["tf"].text() == "some text"
+    assert run.Stack.widget(1).evaluationvars["sl"].value() == 3
+    assert run.Stack.widget(1).evaluationvars["cb_1"].isChecked()
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    QTimer.singleShot(100, handle_dialog)
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
+    qtbot.waitUntil(lambda: run.journal.flush() or load_journal(run.journal.filepath)["saved"])  # recorded once written
+
+    with open('./tests/results/results_resume.csv', mode='r') as file:
+        rows = list(csv.DictReader(file, delimiter=';'))
+    assert len(rows) == 1
+    assert rows[0]["rb"] == '1'
+    assert rows[0]["tf"] == 'some text'
+    assert rows[0]["sl"] == '3'
+    assert rows[0]["cb_0"] == 'False'
+    assert rows[0]["cb_1"] == 'True'
+    assert rows[0]["Start"] == str(crashed.start)
+    run.journal.close()
+    [os.remove('./tests/results/' + fil) for fil in os.listdir('./tests/results/')]
+
+
+# noinspection PyArgumentList
+def test_backup_not_saved(qtbot):
+    if os.path.exists("./tests/results/"):
+        [os.remove('./tests/results/' + fil) for fil in os.listdir('./tests/results/')]
+    else:
+        os.makedirs("./tests/results/")
+    with open('./tests/results/results_resume.csv', mode='w') as file:
+        file.write("data_row_number;other\n")  # the header doesn't match, a backup is saved
+    run = StackedWindowGui(os.path.join(os.getcwd(), "tests/resumetest.txt"))
+    run.close()
+    assert "_backup_" in run.filepath_results
+    assert not load_journal(run.journal.filepath)["saved"]
+    assert latest_journal("./tests/results") == run.journal.filepath
+    [os.remove('./tests/results/' + fil) for fil in os.listdir('./tests/results/')]
@@ -0,0 +1,61 @@
+"""Testing the playback latency measurement in LatencyTracker.py"""
+import json
+
+from PySide6.QtWidgets import QPushButton
+
+from tests.context import pytest, LatencyTracker, percentile, histogram, BundleClient, PLAY, QTest, Qt, os
+
+
+def test_statistics():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert histogram([500, 1000, 1001, 3000, 5000]) == {1: 2, 2: 1, 4: 1, 8: 1}
+
+
+def test_samples(qtbot, capfd):
+    tracker = LatencyTracker(echo=True)
+    button = QPushButton("Play")
+    qtbot.addWidget(button)
+    tracker.watch(button)
+    button.clicked.connect(lambda: tracker.begin("pl"))
+    client = BundleClient("127.0.0.1", 8014)
+    client.on_sent = tracker.sent
+    QTest.mouseClick(button, Qt.MouseButton.LeftButton)
+    client.send(PLAY)
+    client.send(PLAY)
+    tracker.feedback()
+    client.send(PLAY)  # not part of a playback anymore
+    tracker.begin("pl")  # e.g. started by the keyboard, Reaper doesn't answer
+    client.send(PLAY)
+    tracker.feedback()  # before anything was sent
+    tracker.begin("pl")
+    assert len(tracker.samples) == 2
+    first, second = tracker.samples
+    assert first["release"] <= first["handler"] <= first["first"] < first["last"] <= first["feedback"]
+    assert second["release"] is None
+    assert second["feedback"] is not None
+    summary = tracker.summary()
+    assert len(tracker.samples) == 3
+    assert summary["handler_to_last_datagram"]["count"] == 2
+    assert summary["release_to_feedback"]["count"] == 1
+    assert summary["handler_to_feedback"]["p50"] <= summary["handler_to_feedback"]["p99"] <= summary["handler_to_feedback"]["max"]
+    assert sum(summary["handler_to_first_datagram"]["histogram_us"].values()) == 2
+    out, _ = capfd.readouterr()
+    assert "Latency pl: release_to_handler" in out
+
+
+def test_save(tmp_path):
+    tracker = LatencyTracker()
+    tracker.save(os.path.join(tmp_path, "empty.json"))
+    assert not os.path.isfile(os.path.join(tmp_path, "empty.json"))  # nothing measured
+    tracker.begin("mr_1")
+    tracker.sent()
+    tracker.feedback()
+    tracker.save(os.path.join(tmp_path, "results", "latency.json"))
+    with open(os.path.join(tmp_path, "results", "latency.json")) as latency_file:
+        latencies = json.load(latency_file)
+    assert latencies["summary"]["handler_to_feedback"]["count"] == 1
+    assert latencies["samples"][0]["element"] == "mr_1"
@@ -15,6 +15,12 @@ class MockReceiver(Thread):
         self.server = None
         self.message_stack = []
         self.paused = False
+        self.ready = threading.Event()
+
+    def start(self):
+        """Start the thread and wait until the server is listening, so no message sent afterwards is lost."""
+        super(MockReceiver, self).start()
+        self.ready.wait(1)
 
     def run(self):
         """Start and be a server. Kill self after shutdown."""
@@ -72,4 +78,5 @@ class MockReceiver(Thread):
         except Exception as e:
             print(e)
         print(f'Serving on {self.server.server_address}')
+        self.ready.set()
         self.server.serve_forever()
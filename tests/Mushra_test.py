@@ -536,6 +536,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(200, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_mr.csv', mode='r') as file:
@@ -569,6 +570,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert THREAD.message_stack[-1] == ("/action", MUSHRA.loop_off_command)
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -620,6 +622,7 @@ def test_execute_questionnaire(run, qtbot):
 
     QTimer.singleShot(200, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_mr.csv', mode='r') as file:
@@ -658,6 +661,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                     QTest.mouseClick(child.sliders[sl], Qt.MouseButton.LeftButton, pos=QPoint(bb.center().x(), int(bb.bottom() - 0.1 * (sl + 1) * bb.bottom())))
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -530,6 +530,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_osc.csv', mode='r') as file:
@@ -559,6 +560,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -596,6 +598,7 @@ def test_execute_questionnaire(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_osc.csv', mode='r') as file:
@@ -629,6 +632,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                 QTest.qWait(3000)
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
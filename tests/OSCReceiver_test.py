@@ -0,0 +1,78 @@
+"""Testing the Qt-integrated OSC receiver in OSCReceiver.py"""
+import threading
+
+from pythonosc import udp_client
+from pythonosc.dispatcher import Dispatcher
+
+from tests.context import pytest, OSCReceiver, address_filter, BundleClient
+
+
+def test_receive(qtbot):
+    received = []
+    dispatcher = Dispatcher()
+    dispatcher.set_default_handler(lambda address, *args: received.append((address, args, threading.current_thread())))
+    receiver = OSCReceiver("127.0.0.1", 8011, dispatcher)
+    assert receiver.is_bound()
+    client = udp_client.SimpleUDPClient("127.0.0.1", 8011)
+    client.send_message("/play", 1.0)
+    client.send_message("/track/3/mute", [0.0, 1.0])
+    qtbot.waitUntil(lambda: len(received) == 2, timeout=1000)
+    assert received[0][:2] == ("/play", (1.0,))
+    assert received[1][:2] == ("/track/3/mute", (0.0, 1.0))
+    assert all(thread is threading.main_thread() for _, _, thread in received)  # handled in the GUI thread
+    receiver.close()
+    assert not receiver.is_bound()
+
+
+def test_bundle(qtbot):
+    received = []
+    dispatcher = Dispatcher()
+    dispatcher.set_default_handler(lambda address, *args: received.append(args[0]))
+    receiver = OSCReceiver("127.0.0.1", 8011, dispatcher)
+    client = BundleClient("127.0.0.1", 8011, bundles=True)
+    with client.bundle():
+        for action in [1, 2, 3]:
+            client.send_message("/action", action)
+    qtbot.waitUntil(lambda: len(received) == 3, timeout=1000)
+    assert received == [1, 2, 3]
+    receiver.close()
+
+
+def test_port_in_use(qtbot, capfd):
+    receiver = OSCReceiver("127.0.0.1", 8011, Dispatcher())
+    second = OSCReceiver("127.0.0.1", 8011, Dispatcher())
+    assert not second.is_bound()
+    out, _ = capfd.readouterr()
+    assert "Could not listen on 127.0.0.1:8011" in out
+    receiver.close()
+
+
+def test_address_filter():
+    accepts = address_filter(["/play", "/stop", "/track/*/number/str"])
+    assert accepts(b"/play")
+    assert accepts(b"/track/12/number/str")
+    assert not accepts(b"/pause")
+    assert not accepts(b"/playing")
+    assert not accepts(b"/track/1/vu")
+    assert not accepts(b"/track/1/2/number/str")
+    assert address_filter(["/play"])(b"/play")
+
+
+def test_filtered(qtbot):
+    received = []
+    dispatcher = Dispatcher()
+    dispatcher.set_default_handler(lambda address, *args: received.append(address))
+    receiver = OSCReceiver("127.0.0.1", 8011, dispatcher, addresses=["/play", "/track/*/number/str"])
+    client = BundleClient("127.0.0.1", 8011, bundles=True)
+    with qtbot.waitSignal(receiver.activity, timeout=1000):
+        client.send_message("/time", 1.5)
+    with client.bundle():
+        client.send_message("/track/1/vu", 0.5)
+        client.send_message("/track/1/number/str", "1")
+        client.send_message("/beat", "1.1.00")
+    client.send_message("/play", 1.0)
+    qtbot.waitUntil(lambda: len(received) == 2, timeout=1000)
+    assert received == ["/track/1/number/str", "/play"]
+    assert receiver.received == 5
+    assert receiver.dropped == 3
+    receiver.close()
@@ -0,0 +1,41 @@
+"""Testing the precompiled playback commands in PlaybackProgram.py"""
+from pythonosc.dispatcher import Dispatcher
+
+from tests.context import pytest, BundleClient, OSCReceiver, PlaybackProgram, encoded, goto_cue, locate, PLAY, STOP
+
+
+def test_goto_cue():
+    assert goto_cue(1) == 40161
+    assert goto_cue("9") == 40169
+    assert goto_cue(10) == 40160
+    assert goto_cue(11) == 41251
+    assert goto_cue("30") == 41270
+
+
+def test_encoded():
+    assert encoded("/stop", 1) is STOP  # encoded only once
+    assert STOP.address == "/stop"
+    assert STOP.params == [1]
+    assert encoded("/action", 40161).dgram == encoded("/action", 40161).dgram
+
+
+def test_locate():
+    assert [message.params[0] for message in locate(3)] == [40163]
+    assert [message.params[0] for message in locate(3, 12, 40223, 40222)] == [41252, 40223, 40163, 40222]
+    program = PlaybackProgram((STOP,)) + locate(3) + (PLAY,)
+    assert isinstance(program, PlaybackProgram)
+    assert [message.address for message in program] == ["/stop", "/action", "/play"]
+
+
+@pytest.mark.parametrize("bundles", [True, False])
+def test_send(qtbot, bundles):
+    received = []
+    dispatcher = Dispatcher()
+    dispatcher.set_default_handler(lambda address, *args: received.append((address, *args)))
+    receiver = OSCReceiver("127.0.0.1", 8011, dispatcher)
+    program = PlaybackProgram([("/action", 40161), STOP, PLAY])
+    program.send(BundleClient("127.0.0.1", 8011, bundles=bundles))
+    program.send(None)
+    qtbot.waitUntil(lambda: len(received) == 3, timeout=1000)
+    assert received == [("/action", 40161), ("/stop", 1), ("/play", 1)]
+    receiver.close()
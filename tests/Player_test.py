@@ -693,6 +693,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(200, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pl.csv', mode='r') as file:
@@ -722,6 +723,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -765,6 +767,7 @@ def test_execute_questionnaire(run, qtbot):
 
     QTimer.singleShot(200, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pl.csv', mode='r') as file:
@@ -796,6 +799,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                 assert thread_audio.message_stack[-2] == ("/stop", 0.0)
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -1228,7 +1232,7 @@ def test_pupil(gui_load, qtbot, capfd):
             assert child.playing
             out, err = capfd.readouterr()
             assert out.index("Trigger {'topic': 'annotation', 'label': 'Custom Annotation', 'timestamp':") != -1
-            assert out.endswith(", 'duration': 1} Message forwarded.\n")
+            assert out.endswith(", 'duration': 1} published\n")
             QTest.qWait(2000)
 
     QTest.qWait(3000)
@@ -0,0 +1,41 @@
+"""Testing the parallel startup probes in ProbeCache.py"""
+import threading
+import time
+
+from tests.context import pytest, ProbeCache
+
+
+def test_dedupe():
+    cache = ProbeCache(timeout=1)
+    calls = []
+    lock = threading.Lock()
+
+    def probe(host):
+        with lock:
+            calls.append(host)
+        return True
+
+    futures = [cache.submit(("probe", "127.0.0.1"), probe, "127.0.0.1") for _ in range(10)]
+    assert all(future is futures[0] for future in futures)
+    assert futures[0].result()
+    assert calls == ["127.0.0.1"]
+    cache.shutdown()
+
+
+def test_parallel():
+    cache = ProbeCache(timeout=1)
+    start = time.monotonic()
+    futures = [cache.submit(("probe", host), time.sleep, 0.5) for host in ["a", "b", "c", "d"]]
+    for future in futures:
+        future.result()
+    assert time.monotonic() - start < 1.5  # bounded by the slowest probe, not the sum
+    cache.shutdown()
+
+
+def test_results_kept_after_shutdown():
+    cache = ProbeCache(timeout=1)
+    future = cache.local_ip()
+    ip = future.result()
+    cache.shutdown()
+    assert cache.local_ip() is future
+    assert cache.local_ip().result() == ip
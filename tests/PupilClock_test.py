@@ -0,0 +1,61 @@
+"""Testing the clock synchronisation with Pupil Capture in PupilClock.py"""
+import json
+from time import monotonic, time
+
+import zmq
+
+from tests.context import pytest, Button, PupilClock, estimate
+from tests.PupilEmulator import PupilEmulator
+
+
+@pytest.fixture
+def pupil():
+    emulator = PupilEmulator()
+    emulator.start()
+    ctx = zmq.Context()
+    yield emulator, ctx
+    ctx.term()
+    emulator.stop()
+
+
+def test_estimate():
+    # the second request was the fastest, Pupil's clock is 100 s ahead
+    samples = [(0.0, 100.5, 0.4), (1.0, 101.05, 1.1), (2.0, 102.3, 2.2)]
+    offset, rtt, uncertainty = estimate(samples)
+    assert offset == pytest.approx(100)
+    assert rtt == pytest.approx(0.1)
+    assert uncertainty == pytest.approx(0.05)
+
+
+def test_sync(pupil, tmp_path):
+    emulator, ctx = pupil
+    emulator.offset = 1000 - monotonic()  # like after 'T 1000'
+    clock = PupilClock(ctx, "127.0.0.1", emulator.port, interval=0.1, samples=3)
+    assert clock.now() is None
+    assert Button.new_trigger("before", clock=clock)["timestamp"] == pytest.approx(time(), abs=1)
+    clock.start()
+    assert clock.synced.wait(2)
+    assert clock.now() == pytest.approx(emulator.time(), abs=0.01)
+    assert Button.new_trigger("after", clock=clock)["timestamp"] == pytest.approx(emulator.time(), abs=0.01)
+    assert emulator.wait_for(lambda e: len([text for _, text in e.requests if text == "t"]) >= 6)
+    clock.close()
+    assert not clock.thread.is_alive()
+    assert len(clock.history) >= 2
+    assert all(entry["uncertainty"] == entry["rtt"] / 2 < 0.1 for entry in clock.history)
+    clock.save(str(tmp_path / "clock.json"))
+    with open(tmp_path / "clock.json", encoding="utf_8") as file:
+        saved = json.load(file)
+    assert saved["samples"] == 3
+    assert [entry["offset"] for entry in saved["history"]] == [entry["offset"] for entry in clock.history]
+
+
+def test_unreachable(pupil, capfd):
+    emulator, ctx = pupil
+    emulator.drop("t", 1)
+    clock = PupilClock(ctx, "127.0.0.1", emulator.port, interval=0.1, samples=2)
+    clock.start()
+    assert clock.synced.wait(3)  # recovers with a new socket
+    clock.close()
+    out, _ = capfd.readouterr()
+    assert "Couldn't synchronise with Pupil Capture!" in out
+    assert emulator.dropped == 1
@@ -0,0 +1,266 @@
+"""A stand-in for Pupil Capture implementing Pupil Remote and the annotation sink used by QUEST, for tests and latency benchmarks."""
+import argparse
+import heapq
+import os
+import sys
+import threading
+from threading import Thread
+from time import monotonic, monotonic_ns, sleep
+
+import msgpack as serializer
+import zmq
+
+if os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "QUEST") not in sys.path:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "QUEST"))
+from LatencyTracker import percentile
+
+VERSION = "3.5.1"
+POLL = 50  # ms between two checks whether the emulator should stop
+
+
+class PupilEmulator(Thread):
+    """
+    Answers Pupil Remote's commands on a ROUTER socket, so requests can be answered late or not at all,
+    and collects the annotations published on the backbone with the Pupil time they were received at.\n
+    Delays and drops are injected per command, the command is the first word of the request,
+    e.g. 'R', 't', 'PUB_PORT' or 'notify' for all notifications, and 'annotation' for the published annotations.
+    """
+    def __init__(self, port=0, ip="127.0.0.1"):
+        """
+        Parameters
+        ----------
+        port : int, default=0
+            port of Pupil Remote (pupil_port of the questionnaire), a random free port if 0
+        ip : str, default='127.0.0.1'
+            IP address to listen on
+        """
+        super(PupilEmulator, self).__init__(daemon=True)
+        self.ip = ip
+        self.ctx = zmq.Context()
+        self.remote = self.ctx.socket(zmq.ROUTER)
+        self.remote.setsockopt(zmq.LINGER, 0)
+        if port == 0:
+            self.port = self.remote.bind_to_random_port(f'tcp://{ip}')
+        else:
+            self.remote.bind(f'tcp://{ip}:{port}')
+            self.port = port
+        self.backbone = self.ctx.socket(zmq.SUB)
+        self.backbone.setsockopt(zmq.LINGER, 0)
+        self.backbone.setsockopt(zmq.SUBSCRIBE, b"")
+        self.pub_port = self.backbone.bind_to_random_port(f'tcp://{ip}')
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.stop_event = threading.Event()
+        self.delays = {}  # command -> seconds until it is answered
+        self.drops = {}  # command -> number of the next requests to leave unanswered
+        self.offset = 0.0  # Pupil time - monotonic()
+        self.recording = None  # name of the running recording, "" if unnamed
+        self.requests = []  # (monotonic_ns, command string) of every request
+        self.notifications = []  # every notification
+        self.annotations = []  # (Pupil time, monotonic_ns, annotation) of every received annotation
+        self.dropped = 0  # requests and annotations which were dropped on purpose
+        self.replies = []  # heap of (due, sequence, identity, answer) of delayed answers
+        self.sequence = 0
+
+    def time(self):
+        """
+        Returns
+        -------
+        float
+            current Pupil time in seconds
+        """
+        return monotonic() + self.offset
+
+    def delay(self, command, seconds):
+        """Answer the command late from now on.
+
+        Parameters
+        ----------
+        command : str
+            first word of the request, or 'annotation' to delay the processing of received annotations
+        seconds : float
+            the delay, 0 to answer immediately again
+        """
+        with self.lock:
+            self.delays[command] = seconds
+
+    def drop(self, command, count=1):
+        """Leave the next requests of a command unanswered.
+
+        Parameters
+        ----------
+        command : str
+            first word of the request, or 'annotation' to discard received annotations
+        count : int, default=1
+            number of requests to drop
+        """
+        with self.lock:
+            self.drops[command] = self.drops.get(command, 0) + count
+
+    def run(self):
+        """Serve until stopped."""
+        poller = zmq.Poller()
+        poller.register(self.remote, zmq.POLLIN)
+        poller.register(self.backbone, zmq.POLLIN)  # must be polled all the time, otherwise no subscription is sent
+        while not self.stop_event.is_set():
+            timeout = POLL if len(self.replies) == 0 else max(0, min(POLL, int((self.replies[0][0] - monotonic()) * 1000)))
+            events = dict(poller.poll(timeout))
+            if self.remote in events:
+                self.request(self.remote.recv_multipart())
+            if self.backbone in events:
+                self.receive(self.backbone.recv_multipart())
+            while len(self.replies) > 0 and self.replies[0][0] <= monotonic():
+                _, _, identity, answer = heapq.heappop(self.replies)
+                self.remote.send_multipart([identity, b"", answer.encode()])
+        self.remote.close()
+        self.backbone.close()
+        self.ctx.term()
+
+    def stop(self, timeout=1):
+        """Stop serving and the thread."""
+        self.stop_event.set()
+        self.join(timeout)
+
+    def request(self, frames):
+        """Handle a request of Pupil Remote.
+
+        Parameters
+        ----------
+        frames : list of bytes
+            identity of the client, empty delimiter and the frames of the request
+        """
+        stamp = monotonic_ns()
+        identity, message = frames[0], frames[2:]
+        text = message[0].decode()
+        command = "notify" if text.startswith("notify.") else text.split(" ", 1)[0]
+        with self.lock:
+            self.requests.append((stamp, text))
+            if self.drops.get(command, 0) > 0:
+                self.drops[command] -= 1
+                self.dropped += 1
+                self.changed.notify_all()
+                return
+            if command == "v":
+                answer = VERSION
+            elif command == "t":
+                answer = repr(self.time())
+            elif command == "T":
+                self.offset = float(text.split(" ", 1)[1]) - monotonic()
+                answer = "Timesync successful."
+            elif command == "R":
+                self.recording = text[2:]
+                answer = "OK"
+            elif command == "r":
+                self.recording = None
+                answer = "OK"
+            elif command == "PUB_PORT":
+                answer = str(self.pub_port)
+            elif command == "notify" and len(message) > 1:
+                self.notifications.append(serializer.loads(message[1]))
+                answer = "Notification received."
+            else:
+                answer = "Unknown command."
+            delay = self.delays.get(command, 0)
+            self.changed.notify_all()
+        if delay > 0:
+            self.sequence += 1
+            heapq.heappush(self.replies, (monotonic() + delay, self.sequence, identity, answer))
+        else:
+            self.remote.send_multipart([identity, b"", answer.encode()])
+
+    def receive(self, frames):
+        """Collect an annotation published on the backbone.
+
+        Parameters
+        ----------
+        frames : list of bytes
+            topic and payload of the message
+        """
+        stamp, received = monotonic_ns(), self.time()
+        if frames[0] != b"annotation" or len(frames) < 2:
+            return
+        with self.lock:
+            if self.drops.get("annotation", 0) > 0:
+                self.drops["annotation"] -= 1
+                self.dropped += 1
+                self.changed.notify_all()
+                return
+            delay = self.delays.get("annotation", 0)
+        if delay > 0:
+            sleep(delay)  # a busy Pupil Capture, following annotations queue up
+        with self.lock:
+            self.annotations.append((received, stamp, serializer.loads(frames[1])))
+            self.changed.notify_all()
+
+    def wait_for(self, predicate, timeout=1):
+        """Wait until the state fulfills a condition.
+
+        Parameters
+        ----------
+        predicate : function
+            called with the emulator while its state is locked
+        timeout : float, default=1
+            time in seconds to wait at most
+
+        Returns
+        -------
+        bool
+            True if the condition was met in time
+        """
+        deadline = monotonic() + timeout
+        with self.lock:
+            while not predicate(self):
+                if deadline <= monotonic():
+                    return False
+                self.changed.wait(deadline - monotonic())
+            return True
+
+    def statistics(self):
+        """Latency, jitter and throughput of the received annotations.
+        The latency is only meaningful if the annotations are stamped in Pupil time, e.g. after 'T'.
+
+        Returns
+        -------
+        dict
+            count, latency percentiles in ms (Pupil time at receipt - timestamp of the annotation),
+            jitter in ms (mean deviation of the gaps between receipts from their mean) and throughput per second
+        """
+        with self.lock:
+            annotations = list(self.annotations)
+        if len(annotations) == 0:
+            return {"count": 0}
+        latencies = sorted((received - annotation["timestamp"]) * 1000 for received, _, annotation in annotations)
+        stats = {"count": len(annotations), **{f'latency_p{p}': percentile(latencies, p) for p in [50, 95, 99]},
+                 "latency_max": latencies[-1]}
+        if len(annotations) > 1:
+            gaps = [(later[1] - earlier[1]) / 1e6 for earlier, later in zip(annotations, annotations[1:])]
+            mean = sum(gaps) / len(gaps)
+            stats["jitter"] = sum(abs(gap - mean) for gap in gaps) / len(gaps)
+            stats["throughput"] = (len(annotations) - 1) / ((annotations[-1][1] - annotations[0][1]) / 1e9 or 1e-9)
+        return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Emulate Pupil Capture's network interface.")
+    parser.add_argument("port", type=int, nargs="?", default=50020, help="port of Pupil Remote")
+    parser.add_argument("--ip", default="127.0.0.1")
+    parser.add_argument("--delay", nargs=2, action="append", default=[], metavar=("COMMAND", "SECONDS"),
+                        help="answer a command late, e.g. --delay t 0.2")
+    parser.add_argument("--drop", nargs=2, action="append", default=[], metavar=("COMMAND", "COUNT"),
+                        help="leave the next requests of a command unanswered, e.g. --drop v 1")
+    arguments = parser.parse_args()
+    emulator = PupilEmulator(arguments.port, arguments.ip)
+    for command, seconds in arguments.delay:
+        emulator.delay(command, float(seconds))
+    for command, count in arguments.drop:
+        emulator.drop(command, int(count))
+    emulator.start()
+    print(f"Emulating Pupil Capture on {arguments.ip}:{emulator.port}, backbone on port {emulator.pub_port}")
+    try:
+        while True:
+            sleep(1)
+    except KeyboardInterrupt:
+        emulator.stop()
+        for received, stamp, annotation in emulator.annotations:
+            print(stamp, received, annotation)
+        print(emulator.statistics())
@@ -0,0 +1,87 @@
+"""Testing QUEST's Pupil Core connection against the Pupil Capture stand-in in PupilEmulator.py"""
+from time import monotonic, time
+
+import msgpack
+import zmq
+
+from tests.context import pytest, AnnotationSender, Button
+from tests.PupilEmulator import PupilEmulator, VERSION
+
+
+@pytest.fixture
+def pupil():
+    emulator = PupilEmulator()
+    emulator.start()
+    ctx = zmq.Context()
+    remote = ctx.socket(zmq.REQ)
+    remote.setsockopt(zmq.LINGER, 0)
+    remote.connect(f'tcp://127.0.0.1:{emulator.port}')
+    yield emulator, ctx, remote
+    remote.close()
+    ctx.term()
+    emulator.stop()
+
+
+def ask(remote, request, timeout=1000):
+    remote.send_string(request)
+    assert remote.poll(timeout) & zmq.POLLIN
+    return remote.recv_string()
+
+
+def test_remote(pupil):
+    emulator, _, remote = pupil
+    assert ask(remote, "v") == VERSION
+    assert ask(remote, "T 1000") == "Timesync successful."
+    assert 1000 <= float(ask(remote, "t")) < 1001
+    assert ask(remote, "R participant 1") == "OK"
+    assert emulator.recording == "participant 1"
+    assert ask(remote, "r") == "OK"
+    assert emulator.recording is None
+    assert ask(remote, "PUB_PORT") == str(emulator.pub_port)
+    remote.send_string("notify.start_plugin", flags=zmq.SNDMORE)
+    remote.send(msgpack.dumps({"subject": "start_plugin", "name": "Annotation_Capture", "args": {}}, use_bin_type=True))
+    assert remote.poll(1000) & zmq.POLLIN
+    assert remote.recv_string() == "Notification received."
+    assert emulator.notifications == [{"subject": "start_plugin", "name": "Annotation_Capture", "args": {}}]
+    assert [text for _, text in emulator.requests][:2] == ["v", "T 1000"]
+
+
+def test_annotations(pupil):
+    emulator, ctx, remote = pupil
+    assert ask(remote, f'T {time()}') == "Timesync successful."
+    sender = AnnotationSender(ctx, "127.0.0.1", emulator.port)
+    sender.start()
+    for number in range(20):
+        assert sender.send(Button.new_trigger(str(number)))
+    assert sender.flush(5)
+    assert emulator.wait_for(lambda e: len(e.annotations) == 20)
+    assert [annotation["label"] for _, _, annotation in emulator.annotations] == [str(number) for number in range(20)]
+    stats = emulator.statistics()
+    assert stats["count"] == 20
+    assert 0 <= stats["latency_p50"] <= stats["latency_p99"] <= stats["latency_max"] < 1000
+    assert stats["throughput"] > 0
+    sender.close()
+
+
+def test_delay_and_drop(pupil):
+    emulator, ctx, remote = pupil
+    emulator.delay("t", 0.3)
+    remote.send_string("t")
+    start = monotonic()
+    assert remote.poll(100) == 0
+    assert remote.poll(1000) & zmq.POLLIN
+    assert monotonic() - start >= 0.3
+    remote.recv_string()
+    emulator.drop("v")
+    remote.send_string("v")
+    assert remote.poll(500) == 0  # like the handshake with a hanging Pupil Capture
+    assert emulator.dropped == 1
+    emulator.drop("annotation")
+    sender = AnnotationSender(ctx, "127.0.0.1", emulator.port)
+    sender.start()
+    sender.send(Button.new_trigger("lost"))
+    sender.send(Button.new_trigger("kept"))
+    assert emulator.wait_for(lambda e: len(e.annotations) == 1)
+    assert emulator.annotations[0][2]["label"] == "kept"
+    assert emulator.dropped == 2
+    sender.close()
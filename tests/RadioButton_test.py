@@ -319,6 +319,7 @@ def test_start_id(gui_load, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(test_gui.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    test_gui.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rb.csv', mode='r') as file:
@@ -341,6 +342,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rb.csv', mode='r') as file:
@@ -367,6 +369,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -399,6 +402,7 @@ def test_execute_questionnaire(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rb.csv', mode='r') as file:
@@ -423,6 +427,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                 child.click()
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -434,6 +434,7 @@ def test_start_id(gui_load, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(test_gui.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    test_gui.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rm.csv', mode='r') as file:
@@ -594,6 +595,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rm.csv', mode='r') as file:
@@ -624,6 +626,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -663,6 +666,7 @@ def test_execute_questionnaire(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton, delay=1000)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rm.csv', mode='r') as file:
@@ -690,6 +694,7 @@ def test_execute_questionnaire_blocked(run, qtbot):
                     grp.button(bg).click()
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -726,6 +731,7 @@ def test_two_pages(run_2, qtbot):
     QTest.mouseClick(run_2.forwardbutton, Qt.MouseButton.LeftButton)
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run_2.forwardbutton, Qt.MouseButton.LeftButton)
+    run_2.results_writer.wait()
 
     results = []
     with open('./tests/results/results_rm.csv', mode='r') as file:
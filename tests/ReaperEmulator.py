@@ -0,0 +1,210 @@
+"""A stand-in for Reaper implementing the OSC surface used by QUEST, for tests and latency benchmarks."""
+import argparse
+import os
+import sys
+import threading
+from threading import Thread
+from time import monotonic, monotonic_ns, sleep
+
+from pythonosc import dispatcher, osc_server, udp_client
+
+if os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "QUEST") not in sys.path:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "QUEST"))
+from MUSHRA import MUSHRA
+from PlaybackProgram import goto_cue
+
+MARKERS = 30  # number of markers the goto actions are known for
+
+
+class ReaperEmulator(Thread):
+    """
+    Keeps the transport, cursor, loop and per-track mute/solo/select state like Reaper,
+    answers every change with Reaper's feedback and records when each message was received.
+    """
+    def __init__(self, port, tracks=4, feedback_port=None, feedback_ip="127.0.0.1", ip="127.0.0.1"):
+        """
+        Parameters
+        ----------
+        port : int
+            port Reaper listens on (audio_port of the questionnaire)
+        tracks : int, default=4
+            number of tracks in the project
+        feedback_port : int, optional
+            port the feedback is sent to (audio_recv_port of the questionnaire), no feedback if None
+        feedback_ip : str, default='127.0.0.1'
+            IP address the feedback is sent to
+        ip : str, default='127.0.0.1'
+            IP address to listen on
+        """
+        super(ReaperEmulator, self).__init__(daemon=True)
+        self.address = (ip, port)
+        self.feedback = udp_client.SimpleUDPClient(feedback_ip, feedback_port) if feedback_port is not None else None
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.ready = threading.Event()
+        self.server = None
+        self.received = []  # (monotonic_ns, address, args) of every message
+        self.transport = "STOP"
+        self.cursor = None  # marker the cursor was moved to
+        self.loop = [None, None]  # markers of the loop start and end
+        self.looped = False
+        self.tracks = {track: {"mute": False, "solo": False, "select": False} for track in range(1, tracks + 1)}
+        self.actions = {goto_cue(marker): self.goto(marker) for marker in range(1, MARKERS + 1)}
+        self.actions.update({
+            MUSHRA.set_loop_start: lambda: self.set_loop(0),
+            MUSHRA.set_loop_end: lambda: self.set_loop(1),
+            MUSHRA.loop_on_command: lambda: self.set_looped(True),
+            MUSHRA.loop_off_command: lambda: self.set_looped(False),
+            MUSHRA.mushra_play_on_stopped: self.play_on_stopped,
+            MUSHRA.unsolo_all: lambda: self.set_all("solo", False),
+            MUSHRA.solo_track: self.solo_selected,
+            40341: lambda: self.set_all("mute", True),  # mute all
+            40297: lambda: self.set_all("select", False),  # unselect all
+            40280: self.toggle_mute_selected,
+        })
+
+    def start(self):
+        """Start the thread and wait until the server is listening, so no message sent afterwards is lost."""
+        super(ReaperEmulator, self).start()
+        self.ready.wait(1)
+
+    def run(self):
+        """Serve until stopped."""
+        dispat = dispatcher.Dispatcher()
+        dispat.set_default_handler(self.message_handler)
+        self.server = osc_server.BlockingOSCUDPServer(self.address, dispat)  # one message after another, like Reaper
+        self.ready.set()
+        self.server.serve_forever()
+
+    def stop(self, timeout=1):
+        """Stop the server and the thread."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.join(timeout)
+
+    def message_handler(self, addr, *args):
+        """Apply a received OSC message to the state."""
+        stamp = monotonic_ns()
+        with self.lock:
+            self.received.append((stamp, addr, args))
+            value = args[0] if len(args) > 0 else None
+            parts = addr.split("/")
+            if addr in ["/play", "/stop", "/pause"]:
+                if value is not None and float(value) == 0:
+                    pass  # only pressing the button triggers it
+                elif addr == "/play":
+                    self.set_transport("PLAY")
+                elif addr == "/stop":
+                    self.set_transport("STOP")
+                else:  # toggles
+                    self.set_transport("PAUSE" if self.transport == "PLAY" else "PLAY")
+            elif len(parts) == 4 and parts[1] == "track" and parts[2].isdigit() and parts[3] in ["mute", "solo", "select"]:
+                self.set_track(int(parts[2]), parts[3], bool(float(value)))
+            elif addr == "/action" and value in self.actions:
+                self.actions[value]()
+            self.changed.notify_all()
+
+    def send_feedback(self, address, value):
+        if self.feedback is not None:
+            self.feedback.send_message(address, value)
+
+    def set_transport(self, state):
+        self.transport = state
+        for address in ["/play", "/pause", "/stop"]:
+            self.send_feedback(address, 1.0 if address[1:].upper() == state else 0.0)
+
+    def set_track(self, track, key, state):
+        if track in self.tracks:
+            self.tracks[track][key] = state
+            self.send_feedback(f'/track/{track}/{key}', float(state))
+
+    def set_all(self, key, state):
+        for track in self.tracks:
+            self.set_track(track, key, state)
+
+    def toggle_mute_selected(self):
+        for track, state in self.tracks.items():
+            if state["select"]:
+                self.set_track(track, "mute", not state["mute"])
+
+    def solo_selected(self):
+        for track, state in self.tracks.items():
+            if state["select"]:
+                self.set_track(track, "solo", True)
+
+    def goto(self, marker):
+        def action():
+            self.cursor = marker
+        return action
+
+    def set_loop(self, index):
+        self.loop[index] = self.cursor
+
+    def set_looped(self, looped):
+        self.looped = looped
+
+    def play_on_stopped(self):
+        if self.transport != "PLAY":
+            self.set_transport("PLAY")
+
+    def announce(self):
+        """Send the number of every track, like Reaper does when a control surface connects."""
+        with self.lock:
+            for track in self.tracks:
+                self.send_feedback(f'/track/{track}/number/str', str(track))
+
+    def audible(self):
+        """
+        Returns
+        -------
+        list of int
+            tracks which can be heard
+        """
+        with self.lock:
+            soloed = [track for track, state in self.tracks.items() if state["solo"]]
+            return soloed if len(soloed) > 0 else [track for track, state in self.tracks.items() if not state["mute"]]
+
+    def wait_for(self, predicate, timeout=1):
+        """Wait until the state fulfills a condition.
+
+        Parameters
+        ----------
+        predicate : function
+            called with the emulator while its state is locked
+        timeout : float, default=1
+            time in seconds to wait at most
+
+        Returns
+        -------
+        bool
+            True if the condition was met in time
+        """
+        deadline = monotonic() + timeout
+        with self.lock:
+            while not predicate(self):
+                if deadline <= monotonic():
+                    return False
+                self.changed.wait(deadline - monotonic())
+            return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Emulate Reaper's OSC interface.")
+    parser.add_argument("port", type=int, help="port to listen on")
+    parser.add_argument("--tracks", type=int, default=4)
+    parser.add_argument("--feedback-port", type=int, default=None)
+    parser.add_argument("--feedback-ip", default="127.0.0.1")
+    parser.add_argument("--ip", default="127.0.0.1")
+    arguments = parser.parse_args()
+    emulator = ReaperEmulator(arguments.port, arguments.tracks, arguments.feedback_port, arguments.feedback_ip, arguments.ip)
+    emulator.start()
+    emulator.announce()
+    print(f"Emulating Reaper on {arguments.ip}:{arguments.port}")
+    try:
+        while True:
+            sleep(1)
+    except KeyboardInterrupt:
+        emulator.stop()
+        for stamp, address, args in emulator.received:
+            print(stamp, address, *args)
@@ -0,0 +1,63 @@
+"""Testing QUEST's audio control against the Reaper stand-in in ReaperEmulator.py"""
+from pythonosc.dispatcher import Dispatcher
+
+from tests.context import pytest, BundleClient, MUSHRA, OSCReceiver, PAUSE, PLAY, STOP, ReaperState, locate
+from tests.ReaperEmulator import ReaperEmulator
+
+
+@pytest.fixture
+def reaper():
+    emulator = ReaperEmulator(8012, tracks=4, feedback_port=8013)
+    emulator.start()
+    yield emulator
+    emulator.stop()
+
+
+def test_state(reaper):
+    client = BundleClient("127.0.0.1", 8012)
+    (locate(12, 3, MUSHRA.set_loop_end, MUSHRA.set_loop_start) + (PLAY,)).send(client)
+    assert reaper.wait_for(lambda r: r.transport == "PLAY")
+    assert reaper.cursor == 12
+    assert reaper.loop == [12, 3]
+    client.send(PAUSE)
+    assert reaper.wait_for(lambda r: r.transport == "PAUSE")
+    client.send(PAUSE)
+    assert reaper.wait_for(lambda r: r.transport == "PLAY")
+    client.send(STOP)
+    assert reaper.wait_for(lambda r: r.transport == "STOP")
+    with client.bundle():  # the former MUSHRA sequence: mute all, select tracks 2 and 3, toggle their mute
+        client.send_message("/action", 40341)
+        client.send_message("/track/2/select", 1)
+        client.send_message("/track/3/select", 1)
+        client.send_message("/action", 40280)
+        client.send_message("/action", MUSHRA.loop_on_command)
+    assert reaper.wait_for(lambda r: r.looped)
+    assert reaper.audible() == [2, 3]
+    client.send_message("/action", MUSHRA.solo_track)
+    client.send_message("/track/3/select", 0)
+    client.send_message("/track/2/solo", 0)
+    assert reaper.wait_for(lambda r: r.tracks[3]["solo"] and not r.tracks[2]["solo"])
+    assert reaper.audible() == [3]
+    assert [address for _, address, _ in reaper.received][:3] == ["/action"] * 3
+    stamps = [stamp for stamp, _, _ in reaper.received]
+    assert stamps == sorted(stamps)
+
+
+def test_feedback(reaper, qtbot):
+    state = ReaperState(ack_timeout=500)
+    dispatcher = Dispatcher()
+    dispatcher.set_default_handler(state.feedback)
+    receiver = OSCReceiver("127.0.0.1", 8013, dispatcher)
+    reaper.announce()
+    qtbot.waitUntil(lambda: state.track_count == 4, timeout=1000)
+    client = BundleClient("127.0.0.1", 8012)
+    with qtbot.assertNotEmitted(state.diverged, wait=700):
+        state.unmute_only(client, {2}, state.track_count)
+        (locate(2) + (STOP, PLAY)).send(client)
+        assert reaper.wait_for(lambda r: r.transport == "PLAY")
+        assert reaper.audible() == [2]
+        qtbot.waitUntil(lambda: state.pending == {} and state.transport == "PLAY", timeout=1000)
+    reaper.stop()  # Reaper crashed
+    with qtbot.waitSignal(state.diverged, timeout=1000):
+        state.unmute_only(client, {3}, state.track_count)
+    receiver.close()
@@ -0,0 +1,105 @@
+"""Testing the mirrored Reaper state in ReaperState.py"""
+from tests.context import pytest, ReaperState
+
+
+class FakeClient:
+    """Client recording the sent messages."""
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append((message.address, *message.params))
+
+
+def test_full_state():
+    state = ReaperState()  # Reaper doesn't send feedback
+    client = FakeClient()
+    for _ in range(2):
+        state.unmute_only(client, {2}, 4)
+        assert client.messages == [("/track/1/mute", 1), ("/track/3/mute", 1), ("/track/4/mute", 1), ("/track/2/mute", 0)]
+        client.messages.clear()  # sent again, the state in Reaper might have been changed
+    state.unmute_only(client, {3}, 3)
+    assert client.messages == [("/track/1/mute", 1), ("/track/2/mute", 1), ("/track/3/mute", 0)]
+
+
+def test_mute_all(qtbot):
+    client = FakeClient()
+    state = ReaperState()  # Reaper doesn't send feedback, the project may have more tracks
+    for _ in range(2):
+        state.unmute_only(client, {2}, 4, mute_all=True)
+        assert client.messages == [("/action", 40341), ("/track/2/mute", 0)]
+        client.messages.clear()
+    state = ReaperState(ack_timeout=1000)
+    for track in range(1, 6):
+        state.feedback(f'/track/{track}/mute', 0.0)
+    state.feedback("/track/4/mute", 1.0)
+    state.unmute_only(client, {2}, 4, mute_all=True)
+    assert client.messages == [("/track/1/mute", 1), ("/track/3/mute", 1), ("/track/5/mute", 1)]  # every track is known
+    client.messages.clear()
+    state.forget("mute")
+    state.unmute_only(client, {3}, 4, mute_all=True)
+    assert client.messages == [("/action", 40341), ("/track/3/mute", 0)]
+
+
+def test_delta(qtbot):
+    state = ReaperState(ack_timeout=1000)
+    client = FakeClient()
+    state.unmute_only(client, {2}, 4)
+    assert client.messages == [("/track/1/mute", 1), ("/track/3/mute", 1), ("/track/4/mute", 1), ("/track/2/mute", 0)]
+    client.messages.clear()
+    state.unmute_only(client, {2}, 4)
+    assert client.messages == []  # nothing changed
+    state.unmute_only(client, {3}, 4)
+    assert client.messages == [("/track/2/mute", 1), ("/track/3/mute", 0)]  # mute before unmute
+    client.messages.clear()
+    state.unmute_only(client, {5}, 4)
+    assert client.messages == [("/track/3/mute", 1), ("/track/5/mute", 0)]
+    state.unmute_only(None, {1}, 4)  # no audio client
+    assert state.get(1, "mute")
+
+
+def test_feedback(qtbot):
+    state = ReaperState(ack_timeout=1000)
+    client = FakeClient()
+    state.feedback("/play", 1.0)
+    assert state.transport == "PLAY"
+    state.feedback("/stop", (0.0,))
+    assert state.transport == "PLAY"
+    state.feedback("/stop", (1.0,))
+    assert state.transport == "STOP"
+    state.feedback("/track/7/number/str", "7")
+    assert state.track_count == 7
+    state.feedback("/track/2/mute", 1.0)
+    state.feedback("/track/3/solo", 1.0)
+    assert state.get(2, "mute")
+    assert state.get(3, "solo")
+    assert state.get(3, "mute") is None
+    state.unmute_only(client, {3}, 3)
+    assert client.messages == [("/track/1/mute", 1), ("/track/3/mute", 0)]  # track 2 is already muted
+    client.messages.clear()
+    state.feedback("/track/3/mute", 1.0)  # changed in Reaper
+    state.unmute_only(client, {3}, 3)
+    assert client.messages == [("/track/3/mute", 0)]
+    state.feedback("/track/x/mute", 1.0)
+    state.feedback("/time", 1.0)
+    assert state.track_count == 7
+
+
+def test_divergence(qtbot):
+    state = ReaperState(ack_timeout=100)
+    client = FakeClient()
+    state.unmute_only(client, {1}, 2)
+    assert set(state.pending) == {"/track/1/mute", "/track/2/mute"}
+    state.feedback("/track/1/mute", 0.0)  # confirmed
+    assert set(state.pending) == {"/track/2/mute"}
+    with qtbot.waitSignal(state.diverged, timeout=1000) as blocker:
+        pass
+    assert blocker.args == ["/track/2/mute"]
+    assert state.pending == {}
+    assert state.get(2, "mute") is None  # unknown, so it is sent again
+    client.messages.clear()
+    state.unmute_only(client, {1}, 2)
+    assert client.messages == [("/track/2/mute", 1)]
+    state.feedback("/track/2/mute", 1.0)
+    with qtbot.assertNotEmitted(state.diverged, wait=300):
+        pass
@@ -0,0 +1,116 @@
+"""Testing the SQLite results backend in ResultsDatabase.py"""
+import multiprocessing
+import shutil
+import sqlite3
+
+from tests.context import pytest, StackedWindowGui, QTest, Qt, QTimer, handle_dialog, csv, os, DatabaseWriter, connect, database_path, \
+    export_csv, database_participant_number, database_reserve_participant
+
+FOLDER = "./tests/results_database"
+EVENTS = [{"time": "2024-01-01T12:00:00", "page": None, "element": None, "kind": "started", "value": None},
+          {"time": "2024-01-01T12:00:05", "page": 1, "element": "q", "kind": "changed", "value": 3}]
+
+
+@pytest.fixture
+def folder():
+    """Provide an empty results folder and remove it afterwards."""
+    shutil.rmtree(FOLDER, ignore_errors=True)
+    os.makedirs(FOLDER)
+    yield FOLDER
+    shutil.rmtree(FOLDER, ignore_errors=True)
+
+
+def read_rows(file):
+    with open(file, newline='', encoding='utf_8') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+def station(folder, name, count):
+    """Save some participants like a lab station sharing the database."""
+    for _ in range(count):
+        writer = DatabaseWriter({"data_row_number": -1, "station": name}, "", f'{folder}/results.sqlite', f'{folder}/log_{name}.txt', ';')
+        writer.run()
+
+
+def test_write_and_export(folder, qtbot):
+    schema = ["data_row_number", "q", "Start", "End"]
+    for number in [1, 2]:
+        writer = DatabaseWriter({"data_row_number": -1, "q": number * 3, "Start": "s", "End": "e"}, "log", f'{folder}/results.sqlite',
+                                f'{folder}/log_{number}.txt', ';', schema=schema, events=EVENTS)
+        with qtbot.waitSignal(writer.finished, timeout=1000) as blocker:
+            writer.start()
+        assert blocker.args == [f'{folder}/results.sqlite']
+        assert writer.fields["data_row_number"] == number
+    assert database_participant_number(f'{folder}/results.sqlite') == 3
+    connection = connect(f'{folder}/results.sqlite')
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("SELECT participant, value FROM answers WHERE qid = 'q' ORDER BY participant").fetchall() == [(1, "3"), (2, "6")]
+    assert connection.execute("SELECT kind, element, value FROM events WHERE participant = 2 ORDER BY position").fetchall() == \
+        [("started", None, None), ("changed", "q", "3")]
+    connection.close()
+    assert export_csv(f'{folder}/results.sqlite', f'{folder}/results.csv') == 2
+    assert read_rows(f'{folder}/results.csv') == [schema, ["1", "3", "s", "e"], ["2", "6", "s", "e"]]
+    with open(f'{folder}/log_2.txt') as log:
+        assert log.read() == "log"
+
+
+def test_concurrent_stations(folder, qtbot):
+    stations = [multiprocessing.Process(target=station, args=(folder, name, 10)) for name in range(4)]
+    for process in stations:
+        process.start()
+    for process in stations:
+        process.join(60)
+        assert process.exitcode == 0
+    assert export_csv(f'{folder}/results.sqlite', f'{folder}/results.csv') == 40
+    rows = read_rows(f'{folder}/results.csv')
+    assert [int(row[0]) for row in rows[1:]] == list(range(1, 41))  # unique and without gaps
+    assert sorted(row[1] for row in rows[1:]) == sorted(str(name) for name in range(4) for _ in range(10))
+    assert not any("_backup_" in file for file in os.listdir(folder))
+
+
+def test_reservation(folder, qtbot):
+    database = f'{folder}/results.sqlite'
+    assert [database_reserve_participant(database), database_reserve_participant(database)] == [1, 2]  # the first session is aborted
+    assert database_participant_number(database) == 1
+    writer = DatabaseWriter({"data_row_number": 2, "q": "a"}, "", database, f'{folder}/log_2.txt', ';')
+    writer.run()
+    assert writer.fields["data_row_number"] == 1  # no gaps in the results
+    assert database_reserve_participant(database) == 2  # the reservations ended with the save
+    assert database_reserve_participant(database) == 3
+    assert database_participant_number(database) == 2
+
+
+def test_locked(folder, qtbot):
+    blocker = connect(f'{folder}/results.sqlite')
+    blocker.execute("BEGIN IMMEDIATE")  # another station takes too long
+    writer = DatabaseWriter({"data_row_number": -1, "q": "a"}, "", f'{folder}/results.sqlite', f'{folder}/log.txt', ';', timeout=0.2)
+    with qtbot.waitSignal(writer.finished, timeout=2000) as finished:
+        writer.start()
+    blocker.execute("ROLLBACK")
+    blocker.close()
+    assert os.path.basename(finished.args[0]).startswith("unknown_backup_")
+    assert read_rows(finished.args[0]) == [["data_row_number", "q"], ["-1", "a"]]
+
+
+# noinspection PyArgumentList
+def test_execute_questionnaire(qtbot):
+    os.makedirs("./tests/results", exist_ok=True)
+    run = StackedWindowGui(os.path.join(os.getcwd(), "tests/sqlitetest.txt"))
+    assert run.results_backend == "SQLite"
+    assert run.get_participant_number() == 1
+    run.Stack.currentWidget().evaluationvars["tf"].setText("database")
+    QTimer.singleShot(100, handle_dialog)
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
+    database = database_path("./tests/results/results_sqlite.csv")
+    assert not os.path.exists("./tests/results/results_sqlite.csv")
+    connection = connect(database)
+    assert connection.execute("SELECT participant, value FROM answers WHERE qid = 'tf'").fetchall() == [(1, "database")]
+    assert connection.execute("SELECT COUNT(*) FROM events WHERE participant = 1 AND kind = 'finished'").fetchone()[0] == 1
+    connection.close()
+    export_csv(database, "./tests/results/results_sqlite.csv")
+    rows = read_rows("./tests/results/results_sqlite.csv")
+    assert rows[0] == ["data_row_number", "tf", "Start", "End"]
+    assert rows[1][:2] == ["1", "database"]
+    run.close()
+    [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
@@ -0,0 +1,155 @@
+"""Testing the background writing of results in ResultsWriter.py"""
+import multiprocessing
+import shutil
+import threading
+import time
+
+from tests.context import pytest, csv, os, ResultsWriter, participant_number, counter_path, results_lock, reserve_participant, \
+    participant_orders, williams_row
+
+FOLDER = "./tests/results_writer"
+
+
+@pytest.fixture
+def folder():
+    """Provide an empty results folder and remove it afterwards."""
+    shutil.rmtree(FOLDER, ignore_errors=True)
+    yield FOLDER
+    shutil.rmtree(FOLDER, ignore_errors=True)
+
+
+def read_rows(file):
+    with open(file, newline='', encoding='utf_8') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+def station(folder, name, count):
+    """Save some participants like a lab station sharing the results file."""
+    for _ in range(count):
+        writer = ResultsWriter({"data_row_number": -1, "station": name}, "", f'{folder}/results.csv', f'{folder}/log_{name}.txt', ';')
+        writer.run()
+
+
+def session(folder, started):
+    """Start a session like a lab station, its page order is derived from the reserved number."""
+    number = reserve_participant(f'{folder}/results.csv')
+    order = participant_orders("balanced latin square", [4], number)
+    started.wait()  # all sessions are running
+    time.sleep(0.3 * number)  # saved in the order they started
+    ResultsWriter({"data_row_number": number, "Order": order}, "", f'{folder}/results.csv', f'{folder}/log_{number}.txt', ';').run()
+
+
+def test_append(folder, qtbot):
+    for number in [1, 2]:
+        writer = ResultsWriter({"data_row_number": number, "q": "a", "End": "now"}, "log",
+                               f'{folder}/results.csv', f'{folder}/log_{number}.txt', ';')
+        with qtbot.waitSignal(writer.finished, timeout=1000) as blocker:
+            writer.start()
+        assert blocker.args == [f'{folder}/results.csv']
+        assert writer.wait(1)
+    assert read_rows(f'{folder}/results.csv') == [["data_row_number", "q", "End"], ["1", "a", "now"], ["2", "a", "now"]]
+    with open(f'{folder}/log_2.txt') as log:
+        assert log.read() == "log"
+
+
+def test_header_reordered(folder, qtbot):
+    os.makedirs(folder)
+    with open(f'{folder}/results.csv', "w", newline='', encoding='utf_8') as f:
+        f.write("End;data_row_number;q\r\n")
+    writer = ResultsWriter({"data_row_number": 1, "q": "a", "End": "now"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';')
+    writer.start()
+    assert writer.wait(1)
+    assert read_rows(f'{folder}/results.csv')[1] == ["now", "1", "a"]
+
+
+def test_backup(folder, qtbot):
+    os.makedirs(folder)
+    with open(f'{folder}/results.csv', "w", newline='', encoding='utf_8') as f:
+        f.write("data_row_number;other\r\n")
+    writer = ResultsWriter({"data_row_number": 2, "q": "a"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';')
+    with qtbot.waitSignal(writer.finished, timeout=1000) as blocker:
+        writer.start()
+    assert os.path.basename(blocker.args[0]).startswith("2_backup_")
+    assert read_rows(blocker.args[0]) == [["data_row_number", "q"], ["2", "a"]]
+    assert read_rows(f'{folder}/results.csv') == [["data_row_number", "other"]]
+
+
+def test_participant_number(folder, qtbot):
+    assert participant_number(f'{folder}/results.csv') == 1
+    for number in [1, 2]:
+        writer = ResultsWriter({"data_row_number": number, "q": "a"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';')
+        writer.start()
+        assert writer.wait(1)
+    assert os.path.exists(counter_path(f'{folder}/results.csv'))
+    assert participant_number(f'{folder}/results.csv') == 3
+    with open(f'{folder}/results.csv', "a", newline='', encoding='utf_8') as f:
+        f.write("3;edited by hand\r\n")
+    assert participant_number(f'{folder}/results.csv') == 4  # counter is outdated, rows are counted again
+    with open(counter_path(f'{folder}/results.csv'), "w") as f:
+        f.write("broken")
+    assert participant_number(f'{folder}/results.csv') == 4
+
+
+def test_concurrent_stations(folder, qtbot):
+    os.makedirs(folder)
+    stations = [multiprocessing.Process(target=station, args=(folder, name, 10)) for name in range(4)]
+    for process in stations:
+        process.start()
+    for process in stations:
+        process.join(60)
+        assert process.exitcode == 0
+    rows = read_rows(f'{folder}/results.csv')
+    assert rows[0] == ["data_row_number", "station"]
+    assert [int(row[0]) for row in rows[1:]] == list(range(1, 41))  # unique and without gaps
+    assert sorted(row[1] for row in rows[1:]) == sorted(str(name) for name in range(4) for _ in range(10))
+    assert not any("_backup_" in file for file in os.listdir(folder))
+    assert participant_number(f'{folder}/results.csv') == 41
+
+
+def test_concurrent_sessions(folder, qtbot):
+    os.makedirs(folder)
+    started = multiprocessing.Barrier(2)
+    sessions = [multiprocessing.Process(target=session, args=(folder, started)) for _ in range(2)]
+    for process in sessions:
+        process.start()
+    for process in sessions:
+        process.join(60)
+        assert process.exitcode == 0
+    rows = read_rows(f'{folder}/results.csv')
+    assert rows[0] == ["data_row_number", "Order"]
+    assert [int(row[0]) for row in rows[1:]] == [1, 2]
+    for number, order in rows[1:]:
+        assert order == str([williams_row(4, int(number) - 1)])
+    assert not any("_backup_" in file for file in os.listdir(folder))
+
+
+def test_reservation(folder, qtbot):
+    results = f'{folder}/results.csv'
+    assert [reserve_participant(results), reserve_participant(results)] == [1, 2]  # the first session is aborted
+    writer = ResultsWriter({"data_row_number": 2, "q": "a"}, "", results, f'{folder}/log_2.txt', ';')
+    writer.run()
+    assert writer.fields["data_row_number"] == 1  # no gaps in the results
+    assert reserve_participant(results) == 2  # the reservations ended with the save
+    assert reserve_participant(results) == 3
+    os.remove(results)
+    assert reserve_participant(results) == 1  # not continued from a former results file
+
+
+def test_lock_timeout(folder, qtbot):
+    os.makedirs(folder)
+    writer = ResultsWriter({"data_row_number": 1, "q": "a"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';', timeout=0.2)
+    with results_lock(f'{folder}/results.csv'):  # another station takes too long
+        with qtbot.waitSignal(writer.finished, timeout=2000) as blocker:
+            writer.start()
+    assert os.path.basename(blocker.args[0]).startswith("1_backup_")
+    assert not os.path.exists(f'{folder}/results.csv')
+
+
+def test_before(folder, qtbot):
+    calls = []
+    writer = ResultsWriter({"data_row_number": 1, "q": "a"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';',
+                           before=lambda: calls.append((threading.current_thread(), os.path.exists(f'{folder}/results.csv'))))
+    with qtbot.waitSignal(writer.finished, timeout=2000):
+        writer.start()
+    assert calls == [(writer.thread, False)]  # in the background, before the row is written
+    assert read_rows(f'{folder}/results.csv')[1] == ["1", "a"]
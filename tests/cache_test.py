@@ -0,0 +1,62 @@
+"""Testing the cache of compiled questionnaires in cache.py"""
+import shutil
+
+from tests.context import pytest, ConfigObj, listify, validate_questionnaire, os, load_compiled, save_compiled, cache_path
+
+CONFIG = "./tests/cache_tmp.txt"
+
+
+@pytest.fixture
+def config():
+    """Provide a fresh copy of a questionnaire and remove it and its cache afterwards."""
+    shutil.copyfile("./tests/abxtest.txt", CONFIG)
+    yield CONFIG
+    os.remove(CONFIG)
+    shutil.rmtree(os.path.dirname(cache_path(CONFIG)), ignore_errors=True)
+
+
+def compile_config(file):
+    """Parse, listify and validate a questionnaire like the GUI does."""
+    structure = ConfigObj(file)
+    error_found, warning_found, warning_det = validate_questionnaire(listify(structure), True)
+    assert not error_found
+    save_compiled(file, structure, warning_found, warning_det, "test")
+    return structure, warning_found, warning_det
+
+
+def test_round_trip(config, qtbot):
+    assert load_compiled(config, "test") is None
+    structure, warning_found, warning_det = compile_config(config)
+    cached, cached_warning_found, cached_warning_det = load_compiled(config, "test")
+    assert cached == structure
+    assert cached.sections == structure.sections
+    assert cached_warning_found == warning_found
+    assert cached_warning_det == warning_det
+    for page in structure.sections:
+        for quest in structure[page].sections:
+            for key in structure[page][quest].keys():
+                assert type(cached[page][quest][key]) is type(structure[page][quest][key])
+    assert load_compiled(config, "other version") is None
+
+
+def test_invalidation(config, qtbot):
+    compile_config(config)
+    os.utime(config)  # touched, but not changed
+    assert load_compiled(config, "test") is not None
+    with open(config, "a") as file:
+        file.write("\n# changed\n")
+    assert load_compiled(config, "test") is None
+
+
+def test_invalidation_referenced_file(config, qtbot):
+    shutil.copyfile("./stylesheets/minimal.qss", "./tests/cache_tmp.qss")
+    with open(config, "r") as file:
+        content = file.read()
+    with open(config, "w") as file:
+        file.write(content.replace("./stylesheets/minimal.qss", "./tests/cache_tmp.qss"))
+    compile_config(config)
+    assert load_compiled(config, "test") is not None
+    with open("./tests/cache_tmp.qss", "a") as file:
+        file.write("QWidget {}")
+    assert load_compiled(config, "test") is None
+    os.remove("./tests/cache_tmp.qss")
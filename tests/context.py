@@ -10,8 +10,8 @@ import keyboard
 from tests.MockReceiver import MockReceiver
 import portalocker
 from pythonosc import osc_server, dispatcher
-from PySide6.QtGui import QIntValidator, QDoubleValidator, QRegularExpressionValidator, QPalette
-from PySide6.QtCore import QTimer, QPoint
+from PySide6.QtGui import QIntValidator, QDoubleValidator, QRegularExpressionValidator, QPalette, QWheelEvent
+from PySide6.QtCore import QTimer, QPoint, QPointF
 from PySide6.QtWidgets import QCheckBox, QLabel, QRadioButton, QFormLayout, QButtonGroup, QPlainTextEdit
 import asyncio
 
@@ -54,9 +54,28 @@ from AnswerRadioButton import make_answers
 from Lines import QHLine
 from MUSHRA import MUSHRA
 from OSCButton import OSCButton
+from OSCReceiver import OSCReceiver, address_filter
+from Page import Page, PagePlaceholder
 from Player import Player
 import QUEST.LabeledSlider as LabeledSlider
 import QUEST.Slider as Slider
 from QUEST.RadioMatrix import RadioMatrix
 from Image import Image
+from cache import load_compiled, save_compiled, cache_path
+from ResultsWriter import ResultsWriter, participant_number, counter_path, results_lock, reserve_participant
+from ResultsDatabase import DatabaseWriter, connect, database_path, export_csv, participant_number as database_participant_number, \
+    reserve_participant as database_reserve_participant
+from BundleClient import BundleClient, bundle
+from ConnectionMonitor import ConnectionMonitor, icmp_probe, zmq_probe
+from AnnotationSender import AnnotationSender
+from PupilClock import PupilClock, estimate
+from highlight import compatible_stylesheet, set_required
+from ProbeCache import ProbeCache
+from EventLog import EventLog, render_event
+from Journal import Journal, load_journal, latest_journal
+from LatencyTracker import LatencyTracker, percentile, histogram
+from ReaperState import ReaperState
+from randomization import balanced_latin_squares, williams_row, order_from_file, participant_orders
+from schema import page_defaults, results_schema, migrate
+from PlaybackProgram import PlaybackProgram, encoded, goto_cue, locate, PAUSE, PLAY, STOP
 from tests.test_helpers import *
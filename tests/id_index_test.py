@@ -0,0 +1,44 @@
+"""Testing the resolution of "id:" references via the id index in GUI.py"""
+
+from tests.context import pytest, StackedWindowGui, QTest, Qt, os, reserve_participant
+
+
+@pytest.fixture
+def run():
+    """Execute the questionnaire."""
+    return StackedWindowGui(os.path.join(os.getcwd(), "tests/idreftest.txt"))
+
+
+# noinspection PyArgumentList
+def test_references(run, qtbot, capfd):
+    assert run.question_pages == {"name": "Page 1", "osc_name": "Page 2", "osc_later": "Page 2", "later": "Page 3"}
+    assert list(run.answer_index) == ["name"]  # the other pages aren't built yet
+    run.Stack.currentWidget().evaluationvars["name"].setText("participant 1")
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    page = run.Stack.currentWidget()
+    assert page.evaluationvars["osc_name"].value == "participant 1"
+    assert page.evaluationvars["osc_later"].value == "id:later"
+    out, _ = capfd.readouterr()
+    assert '"id:later" on page "Page 2" refers to a question on page "Page 3", which is shown later.' in out
+    assert page.get_key(page.evaluationvars["osc_name"]) == "osc_name"
+    assert run.Stack.widget(0).get_key(page.evaluationvars["osc_name"]) == "key doesn't exist"
+    assert run.answer_of("id:unknown", page) is None
+    out, _ = capfd.readouterr()
+    assert '"id:unknown" on page "Page 2" refers to an unknown question.' in out
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert run.answer_of("id:later", page) is None  # built now, but still shown after page 2
+    assert run.answer_of("id:name", page) is run.Stack.widget(0).evaluationvars["name"]
+    run.close()
+
+
+def test_random_group_order(qtbot, capfd):
+    os.makedirs("./tests/results", exist_ok=True)
+    assert reserve_participant("./tests/results/results_idrandom.csv") == 1  # another session is running
+    run = StackedWindowGui(os.path.join(os.getcwd(), "tests/idrandomtest.txt"))
+    assert run.page_order == [[2, 1]]
+    assert list(run.page_positions) == ["Intro", "A2", "A1", "End"]
+    assert run.Stack.widget(1).evaluationvars["osc_a1"].value == "id:a1"  # A1 is built first, but shown after A2
+    out, _ = capfd.readouterr()
+    assert '"id:a1" on page "A2" refers to a question on page "A1", which is shown later.' in out
+    run.close()
+    [os.remove('./tests/results/' + fil) for fil in os.listdir('./tests/results/')]
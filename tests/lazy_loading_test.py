@@ -0,0 +1,75 @@
+"""Testing the lazy construction of pages in GUI.py"""
+
+from tests.context import pytest, StackedWindowGui, QTimer, QTest, Qt, handle_dialog, csv, os, Page, PagePlaceholder
+
+
+@pytest.fixture
+def run():
+    """Execute the questionnaire."""
+    return StackedWindowGui(os.path.join(os.getcwd(), "tests/lazytest.txt"))
+
+
+# noinspection PyArgumentList
+def test_pages_built_on_demand(run, qtbot):
+    assert run.lazy_loading
+    assert run.Stack.count() == 4
+    assert isinstance(run.Stack.widget(0), Page)
+    for index in range(1, run.Stack.count()):
+        assert isinstance(run.Stack.widget(index), PagePlaceholder)
+    assert run.Stack.currentIndex() == 0
+
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert run.Stack.currentIndex() == 1
+    assert isinstance(run.Stack.widget(1), Page)
+    assert run.Stack.currentWidget() == run.Stack.widget(1)
+    assert isinstance(run.Stack.widget(2), PagePlaceholder)
+
+    QTest.mouseClick(run.backbutton, Qt.MouseButton.LeftButton)
+    assert run.Stack.currentIndex() == 0
+    assert isinstance(run.Stack.widget(1), Page)
+    run.close()
+
+
+# noinspection PyArgumentList
+def test_execute_questionnaire(run, qtbot):
+    if os.path.exists("./tests/results/results_lazy.csv"):
+        os.remove("./tests/results/results_lazy.csv")
+    run.Stack.currentWidget().evaluationvars["rb"].buttons()[1].click()
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.Stack.currentWidget().evaluationvars["tf"].setText("lazy")
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert isinstance(run.Stack.widget(3), PagePlaceholder)
+    QTimer.singleShot(100, handle_dialog)
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert isinstance(run.Stack.widget(3), Page)
+    assert run.Stack.currentIndex() == 3
+    run.results_writer.wait()
+
+    with open("./tests/results/results_lazy.csv", mode="r") as file:
+        csv_file = csv.reader(file, delimiter=";")
+        lines = 0
+        for line in csv_file:
+            lines += 1
+            if lines == 1:
+                assert line == ["data_row_number", "rb", "tf", "rb_after", "Start", "End"]
+            else:
+                assert line[0] == "1"
+                assert line[1] == "1"
+                assert line[2] == "lazy"
+                assert line[3] == "-1"
+        assert lines == 2
+    os.remove("./tests/results/results_lazy.csv")
+
+
+# noinspection PyArgumentList
+def test_unvisited_pages_not_built(run, qtbot):
+    if os.path.exists("./tests/results/results_lazy.csv"):
+        os.remove("./tests/results/results_lazy.csv")
+    run.close()  # saves the results
+    run.results_writer.wait()
+    for index in range(1, run.Stack.count()):
+        assert isinstance(run.Stack.widget(index), PagePlaceholder)
+    with open("./tests/results/results_lazy.csv", mode="r") as file:
+        rows = list(csv.reader(file, delimiter=";"))
+    assert rows[1][:4] == ["1", "-1", "", "-1"]
+    os.remove("./tests/results/results_lazy.csv")
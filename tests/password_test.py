@@ -306,6 +306,7 @@ def test_execute_questionnaire_no_interaction(run, qtbot):
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pw.csv', mode='r') as file:
@@ -332,6 +333,7 @@ def test_execute_questionnaire_no_interaction_blocked(run, qtbot):
         assert run.Stack.count() == 1
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -367,17 +369,18 @@ def test_execute_questionnaire_type_pw(run, qtbot):
             assert child.text() == 'wrong'
             assert not child.validate()
             assert child.toolTip() == "Invalid password."
-            assert child.objectName() == 'required'
+            assert child.property('required')
             # assert child.palette().color(QPalette.Text).name() == 'red'
             child.clear()
             QTest.keyClicks(child, "password", modifier=Qt.KeyboardModifier.NoModifier, delay=500)
             assert child.text() == 'password'
             assert child.validate()
             assert child.toolTip() == ""
-            assert child.objectName() == ''
+            assert not child.property('required')
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pw.csv', mode='r') as file:
@@ -409,16 +412,17 @@ def test_execute_questionnaire_blocked(run, qtbot):
                 assert child.text() == 'wrong'
                 assert not child.validate()
                 assert child.toolTip() == "Invalid password."
-                assert child.objectName() == 'required'
+                assert child.property('required')
                 # assert child.palette().color(QPalette.Text).name() == 'red'
                 child.clear()
                 QTest.keyClicks(child, "password", modifier=Qt.KeyboardModifier.NoModifier, delay=500)
                 assert child.text() == 'password'
                 assert child.validate()
                 assert child.toolTip() == ""
-                assert child.objectName() == ''
+                assert not child.property('required')
         QTimer.singleShot(100, handle_dialog)
         QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+        run.results_writer.wait()
         res_file = None
         for file in os.listdir("./tests/results/"):
             if file.find("_backup_"):
@@ -457,17 +461,18 @@ def test_execute_questionnaire_type_wrong_pw(run, qtbot):
         if isinstance(child, PasswordEntry):
             assert child.text() == 'wrong'
             assert child.toolTip() == "Invalid password."
-            assert child.objectName() == 'required'
+            assert child.property('required')
             assert child.palette().color(QPalette.Text).name() == '#ff0000'  # == red
             child.clear()
             QTest.keyClicks(child, "password", modifier=Qt.KeyboardModifier.NoModifier, delay=500)
             assert child.text() == 'password'
             assert child.validate()
             assert child.toolTip() == ""
-            assert child.objectName() == ''
+            assert not child.property('required')
 
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    run.results_writer.wait()
 
     results = []
     with open('./tests/results/results_pw.csv', mode='r') as file:
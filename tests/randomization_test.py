@@ -0,0 +1,52 @@
+"""Testing the randomization engine in randomization.py"""
+import time
+
+from tests.context import pytest, StackedWindowGui, os, balanced_latin_squares, williams_row, order_from_file, participant_orders
+
+
+def test_williams_row():
+    for n in range(1, 10):
+        square = balanced_latin_squares(n)
+        for row in range(2 * len(square)):  # wraps around
+            assert williams_row(n, row) == square[row % len(square)]
+
+
+def test_order_from_file(tmp_path):
+    file = str(tmp_path / "orders.txt")
+    with open(file, "w") as f:
+        f.write("1,2,3\n3,2,1")
+    orders = order_from_file(file)
+    assert orders == [[1, 2, 3], [3, 2, 1]]
+    assert order_from_file(file) is orders  # parsed once
+    time.sleep(0.01)
+    with open(file, "w") as f:
+        f.write("2,1,3")
+    assert order_from_file(file) == [[2, 1, 3]]  # parsed again after it was modified
+
+
+def test_participant_orders(capsys):
+    assert participant_orders("balanced latin square", [3, 2], 2) == [williams_row(3, 1), williams_row(2, 1)]
+    assert participant_orders("from file", [3, 3], 6, "./tests/random.txt") == [[3, 1, 2], [3, 1, 2]]
+    assert capsys.readouterr().out == ""
+    assert participant_orders("from file", [3, 3], 8, "./tests/random.txt") == [[2, 3, 1], [2, 3, 1]]  # wraps around after 6 rows
+    assert "has only 6 orders, participant 8 gets the order of participant 2" in capsys.readouterr().out
+
+
+@pytest.fixture
+def run():
+    """Execute the questionnaire as the second participant."""
+    os.makedirs("./tests/results", exist_ok=True)
+    with open("./tests/results/results_random.csv", "w") as f:
+        f.write("data_row_number;Order;Start;End\n1;[[1, 2, 3], [1, 2]];;\n")
+    yield StackedWindowGui(os.path.join(os.getcwd(), "tests/randomtest.txt"))
+    [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
+
+
+def test_page_order(run, qtbot):
+    assert run.random_groups == [3, 2]
+    assert run.page_order == [[2, 3, 1], [2, 1]]
+    assert [run.Stack.widget(index).id for index in range(run.Stack.count())] == ["Intro", "A2", "A3", "A1", "B2", "B1", "End"]
+    assert list(run.page_positions) == ["Intro", "A2", "A3", "A1", "B2", "B1", "End"]
+    run.close()  # saves the results
+    with open("./tests/results/results_random.csv") as f:
+        assert f.read().splitlines()[2].startswith("2;[[2, 3, 1], [2, 1]];")
@@ -0,0 +1,95 @@
+"""Testing the tracking of required questions in RequiredTracker.py"""
+
+from tests.context import pytest, StackedWindowGui, QTest, Qt, os, compatible_stylesheet, QPoint, QPointF, QWheelEvent, QApplication
+
+
+@pytest.fixture
+def run():
+    """Execute the questionnaire."""
+    return StackedWindowGui(os.path.join(os.getcwd(), "tests/requiredtest.txt"))
+
+
+def highlighted(page):
+    return [bool(page.required[qid][1].property("required")) for qid in ["rb", "tf", "cb_0"]]
+
+
+# noinspection PyArgumentList
+def test_live_forward_button(run, qtbot):
+    page = run.Stack.currentWidget()
+    tracker = page.required_tracker
+    assert tracker.unanswered == 4  # radio, text and both check boxes
+    assert not tracker.highlighting
+    page.evaluationvars["rb"].buttons()[0].click()
+    assert tracker.unanswered == 3
+    assert highlighted(page) == [False, False, False]  # not highlighted before the first try
+
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert run.Stack.currentIndex() == 0
+    assert highlighted(page) == [False, True, True]
+    assert not run.forwardbutton.isEnabled()
+    assert run.forwardbutton.toolTip() == run.tooltip_not_all_answered
+
+    page.evaluationvars["tf"].setText("answer")
+    assert highlighted(page) == [False, False, True]
+    page.evaluationvars["cb_0"].click()
+    assert highlighted(page) == [False, False, True]  # the label is shared, one box is still unchecked
+    page.evaluationvars["cb_1"].click()
+    assert highlighted(page) == [False, False, False]
+    assert tracker.unanswered == 0
+    assert run.forwardbutton.isEnabled()
+
+    page.evaluationvars["tf"].setText("")
+    assert highlighted(page) == [False, True, False]
+    assert not run.forwardbutton.isEnabled()
+    page.evaluationvars["tf"].setText("again")
+    assert run.forwardbutton.isEnabled()
+    assert run.forwardbutton.toolTip() == ""
+    run.close()
+
+
+# noinspection PyArgumentList
+def test_slider_wheel(run, qtbot):
+    run.Stack.setCurrentIndex(1)
+    page = run.Stack.currentWidget()
+    slider = page.evaluationvars["sl"]
+    assert page.required_tracker.unanswered == 1
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert run.Stack.currentIndex() == 1
+    assert not run.forwardbutton.isEnabled()
+    wheel = QWheelEvent(QPointF(5, 5), slider.mapToGlobal(QPointF(5, 5)), QPoint(), QPoint(0, 120), Qt.MouseButton.NoButton,
+                        Qt.KeyboardModifier.NoModifier, Qt.ScrollPhase.NoScrollPhase, False)
+    QApplication.sendEvent(slider, wheel)
+    assert slider.value() != slider.start
+    qtbot.waitUntil(lambda: page.required_tracker.unanswered == 0, timeout=1000)
+    assert run.forwardbutton.isEnabled()
+    run.close()
+
+
+# noinspection PyArgumentList
+def test_slider_set_value(run, qtbot):
+    run.Stack.setCurrentIndex(1)
+    page = run.Stack.currentWidget()
+    page.evaluationvars["sl"].setValue(3)  # without any event
+    assert page.required_tracker.unanswered == 1
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert run.Stack.currentIndex() == 2
+    run.close()
+
+
+def test_compatible_stylesheet():
+    css = 'QLabel#required, QPushButton#required {color: red;} QLabel#required_text {color: blue;}'
+    assert compatible_stylesheet(css) == \
+        'QLabel[required="true"], QPushButton[required="true"] {color: red;} QLabel#required_text {color: blue;}'
+
+
+# noinspection PyArgumentList
+def test_abx_answer_only(run, qtbot):
+    run.Stack.setCurrentIndex(2)
+    page = run.Stack.currentWidget()
+    assert page.required_tracker.unanswered == 1  # only the answer, the stimuli needn't be played
+    QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
+    assert run.Stack.currentIndex() == 2
+    page.evaluationvars["abx"].answer.buttons()[0].click()
+    assert page.required_tracker.unanswered == 0
+    assert run.forwardbutton.isEnabled()
+    run.close()
@@ -39,6 +39,7 @@ def test_execute_questionnaire_1(run, qtbot):
     QTest.mouseClick(run.forwardbutton, Qt.MouseButton.LeftButton)
     assert run.forwardbutton.text() == "Absenden"
     assert not run.forwardbutton.isEnabled()
+    run.results_writer.wait()
 
     [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
 
@@ -56,6 +57,7 @@ def test_execute_questionnaire_2(run2, qtbot):
     QTimer.singleShot(100, handle_dialog)
     QTest.mouseClick(run2.forwardbutton, Qt.MouseButton.LeftButton)
     assert not run2.forwardbutton.isEnabled()
+    run2.results_writer.wait()
     [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
 
 
@@ -73,5 +75,6 @@ def test_execute_questionnaire_3(run3, qtbot):
     QTest.mouseClick(run3.forwardbutton, Qt.MouseButton.LeftButton)
     assert run3.forwardbutton.text() == "Weiter"
     assert not run3.forwardbutton.isEnabled()
+    run3.results_writer.wait()
 
     [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
@@ -0,0 +1,87 @@
+"""Testing the columns of the results file derived from the questionnaire in schema.py"""
+import shutil
+
+from tests.context import pytest, StackedWindowGui, csv, os, ResultsWriter, participant_number, migrate, page_defaults, ConfigObj, listify
+
+FOLDER = "./tests/results_schema"
+
+
+@pytest.fixture
+def folder():
+    """Provide an empty results folder and remove it afterwards."""
+    shutil.rmtree(FOLDER, ignore_errors=True)
+    os.makedirs(FOLDER)
+    yield FOLDER
+    shutil.rmtree(FOLDER, ignore_errors=True)
+
+
+def read_rows(file):
+    with open(file, newline='', encoding='utf_8') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+@pytest.mark.parametrize("file", ["abxtest.txt", "rmtest.txt", "cbtest.txt", "mrtest.txt", "sltest.txt", "pltest.txt", "osctest.txt", "tftest.txt"])
+def test_results_schema(file, qtbot):
+    os.makedirs("./tests/results", exist_ok=True)  # no warning about a missing results folder
+    run = StackedWindowGui(os.path.join(os.getcwd(), "tests", file))
+    if os.path.exists(run.filepath_results):
+        os.remove(run.filepath_results)
+    columns = ["data_row_number"]
+    for index in range(run.Stack.count()):
+        columns += run.collect_page(index).keys()
+    assert run.schema == columns + ["Start", "End"]
+    run.close()  # saves the results
+    assert read_rows(run.filepath_results)[0] == run.schema
+    [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
+
+
+@pytest.mark.parametrize("file", ["abxtest.txt", "rmtest.txt", "cbtest.txt", "mrtest.txt", "sltest.txt", "pltest.txt", "osctest.txt", "tftest.txt"])
+def test_page_defaults(file, qtbot):
+    os.makedirs("./tests/results", exist_ok=True)
+    run = StackedWindowGui(os.path.join(os.getcwd(), "tests", file))
+    structure = listify(ConfigObj(os.path.join(os.getcwd(), "tests", file)))
+    for index in range(run.Stack.count()):
+        collected = run.collect_page(index)
+        defaults = page_defaults(structure[run.Stack.widget(index).id])
+        assert defaults.keys() == collected.keys()
+        for column, value in defaults.items():
+            if value != []:  # the order of randomized stimuli, nothing was presented yet
+                assert value == collected[column], column
+    run.close()
+    [os.remove('./tests/results/'+fil) for fil in os.listdir('./tests/results/')]
+
+
+def test_writer_schema(folder, qtbot):
+    schema = ["data_row_number", "q1", "OSCMessage_Page 1", "q2", "Start", "End"]
+    writer = ResultsWriter({"data_row_number": -1, "q2": "b", "q1": "a", "Start": "s", "End": "e"}, "",
+                           f'{folder}/results.csv', f'{folder}/log.txt', ';', schema=schema)
+    writer.run()
+    assert read_rows(f'{folder}/results.csv') == [schema, ["1", "a", "", "b", "s", "e"]]
+
+
+def test_migrate(folder, qtbot):
+    with open(f'{folder}/results.csv', "w", newline='', encoding='utf_8') as f:
+        f.write("data_row_number;q1;End\r\n1;a;e1\r\n2;b;e2\r\n")
+    assert participant_number(f'{folder}/results.csv') == 3
+    schema = ["data_row_number", "q1", "q2", "End"]
+    assert migrate(f'{folder}/results.csv', schema, ';') == ["data_row_number", "q1", "End", "q2"]
+    assert read_rows(f'{folder}/results.csv') == [["data_row_number", "q1", "End", "q2"], ["1", "a", "e1", ""], ["2", "b", "e2", ""]]
+    assert participant_number(f'{folder}/results.csv') == 3
+    assert migrate(f'{folder}/results.csv', schema, ';') == ["data_row_number", "q1", "End", "q2"]  # nothing to do
+    writer = ResultsWriter({"data_row_number": -1, "q1": "c", "q2": "d", "End": "e3"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';',
+                           schema=schema)
+    writer.run()
+    assert read_rows(f'{folder}/results.csv')[-1] == ["3", "c", "e3", "d"]
+    assert not any("_backup_" in file for file in os.listdir(folder))
+
+
+def test_save_after_migrate(folder, qtbot):
+    with open(f'{folder}/results.csv', "w", newline='', encoding='utf_8') as f:
+        f.write("data_row_number;old;Start;End\r\n1;a;s1;e1\r\n")
+    schema = ["data_row_number", "new", "Start", "End"]  # a question was replaced
+    assert migrate(f'{folder}/results.csv', schema, ';') == ["data_row_number", "old", "Start", "End", "new"]
+    writer = ResultsWriter({"data_row_number": -1, "new": "b", "Start": "s2", "End": "e2"}, "", f'{folder}/results.csv', f'{folder}/log.txt', ';',
+                           schema=schema)
+    writer.run()
+    assert read_rows(f'{folder}/results.csv')[-1] == ["2", "", "s2", "e2", "b"]
+    assert not any("_backup_" in file for file in os.listdir(folder))